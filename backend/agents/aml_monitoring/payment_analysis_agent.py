@@ -384,6 +384,7 @@ async def fetch_history_node(state: PaymentAnalysisState) -> Dict[str, Any]:
     historical_transactions: List[TransactionRecord] = []
     try:
         if params.has_filters:
+            await transaction_service.load()
             history = transaction_service.query(params)
             historical_transactions = history.transactions
         else:
@@ -714,7 +715,10 @@ async def analyze_payment(payment: Dict[str, Any]) -> Dict[str, Any]:
 
         # Get active compliance rules
         jurisdiction = payment.get('originator_country') or payment.get('booking_jurisdiction')
-        compliance_rules = await rules_service.get_active_rules(jurisdiction=jurisdiction)
+        compliance_rules = [
+            _serialize_compliance_rule(rule)
+            for rule in await rules_service.get_active_rules(jurisdiction=jurisdiction)
+        ]
 
         # Collect related transactions for context
         related_txns = collect_related_transactions(payment, limit=10)
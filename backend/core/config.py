@@ -29,11 +29,24 @@ class Settings(BaseSettings):
 
     # Optional: Make some fields optional with defaults
     langsmith_api_key: str = ""
+    # Redis shared by all workers for audit write dedup; empty disables dedup
+    redis_url: str = ""
     
     # Performance Configuration
     max_concurrent_requests: int = 100
     database_pool_size: int = 20
+    database_pool_min_size: int = 10
+    database_pool_max_inactive_seconds: float = 300.0
+    database_statement_cache_size: int = 1024
     analysis_timeout_seconds: int = 30
+    llm_max_in_flight: int = 8
+    llm_response_cache_size: int = 1024
+    llm_response_cache_ttl_seconds: int = 3600
+    audit_dedup_window_seconds: int = 300
+    audit_background_max_concurrency: int = 32
+    decision_stats_refresh_seconds: int = 60
+    # Keep a Parquet copy next to the transactions CSV and load from it while it is current
+    transactions_parquet_cache: bool = False
     
     # Pattern Detection Thresholds
     structuring_threshold: float = 10000.0
@@ -82,6 +82,13 @@ groq_api_latency_ms = Histogram(
     registry=registry
 )
 
+audit_background_write_failures_total = Counter(
+    "audit_background_write_failures_total",
+    "Audit rows lost because a background write failed",
+    ["action"],
+    registry=registry
+)
+
 database_query_latency_ms = Histogram(
     "database_query_latency_ms",
     "Database query latency in milliseconds",
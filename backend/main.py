@@ -7,6 +7,7 @@ load_dotenv()
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import Response, JSONResponse
+import asyncio
 import sys
 import os
 
@@ -56,6 +57,9 @@ app.add_middleware(
 )
 
 
+_background_tasks = set()
+
+
 @app.on_event("startup")
 async def startup_event():
     """Application startup event."""
@@ -63,6 +67,18 @@ async def startup_event():
         f"application_startup - environment={settings.environment}, log_level={settings.log_level}"
     )
 
+    # Periodically refresh pre-aggregated decision statistics
+    from backend.services.audit_service import audit_service
+    _background_tasks.add(asyncio.create_task(audit_service.run_statistics_refresher()))
+
+    # Parse the transactions dataset now so the first request doesn't pay for it
+    from backend.services.transaction_service import transaction_service
+    try:
+        await transaction_service.load()
+    except Exception as exc:
+        # Not fatal: the service retries the load on the next request
+        logger.warning(f"transactions_preload_failed - error={exc}")
+
     # Debug: Print all registered routes
     logger.info("=" * 50)
     logger.info("Registered routes:")
@@ -77,6 +93,26 @@ async def shutdown_event():
     """Application shutdown event."""
     logger.info("application_shutdown")
 
+    for task in _background_tasks:
+        task.cancel()
+    _background_tasks.clear()
+
+    from backend.services.audit_service import audit_service
+    await audit_service.drain_background_writes()
+    await audit_service.aclose()
+
+    from backend.services.llm_client import grok_client
+    await grok_client.aclose()
+
+    from backend.services.db_pool import close_pool
+    await close_pool()
+
+    from backend.services.rules_service import rules_service
+    await rules_service.aclose()
+
+    from backend.services.document_service import shutdown_ocr_pool
+    await asyncio.to_thread(shutdown_ocr_pool)
+
 
 @app.get("/health")
 async def health_check():
@@ -185,10 +221,7 @@ except Exception as e:
 
 # Audit trail endpoints
 try:
-    try:
-        from backend.routers import audit
-    except ModuleNotFoundError:
-        from routers import audit
+    from backend.routers import audit
 
     app.include_router(
         audit.router,
@@ -0,0 +1,28 @@
+-- Migration: 005 - Decision Statistics Materialized View
+-- Feature: Rules-Based Payment Analysis Integration
+-- Pre-aggregates payment analysis decisions per hour so dashboard statistics
+-- sum ~hours-in-range rows instead of scanning audit_logs
+
+-- Decision columns written by AuditService.log_analysis_decision
+ALTER TABLE audit_logs ADD COLUMN IF NOT EXISTS verdict VARCHAR(20);
+ALTER TABLE audit_logs ADD COLUMN IF NOT EXISTS risk_score DECIMAL(5, 2);
+ALTER TABLE audit_logs ADD COLUMN IF NOT EXISTS analysis_duration_ms INTEGER;
+
+CREATE INDEX IF NOT EXISTS idx_audit_logs_action_created ON audit_logs(action, created_at);
+
+-- Hourly decision statistics
+CREATE MATERIALIZED VIEW IF NOT EXISTS mv_decision_stats_hourly AS
+SELECT
+    date_trunc('hour', created_at) AS bucket,
+    COUNT(*) AS total,
+    COUNT(*) FILTER (WHERE verdict = 'pass') AS pass_count,
+    COUNT(*) FILTER (WHERE verdict = 'suspicious') AS suspicious_count,
+    COUNT(*) FILTER (WHERE verdict = 'fail') AS fail_count,
+    AVG(risk_score) AS avg_risk_score,
+    AVG(analysis_duration_ms) AS avg_duration_ms
+FROM audit_logs
+WHERE action = 'payment_analysis'
+GROUP BY 1;
+
+-- Unique index required for REFRESH MATERIALIZED VIEW CONCURRENTLY
+CREATE UNIQUE INDEX IF NOT EXISTS idx_mv_decision_stats_hourly_bucket ON mv_decision_stats_hourly(bucket);
@@ -0,0 +1,5 @@
+-- Migration: 006 - Alert Trace ID
+-- Feature: Rules-Based Payment Analysis Integration
+
+-- Trace ID written by AlertService.create_alert
+ALTER TABLE alerts ADD COLUMN IF NOT EXISTS trace_id UUID;
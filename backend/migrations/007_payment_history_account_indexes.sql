@@ -0,0 +1,16 @@
+-- Migration: 007 - Payment History Account Indexes
+-- Feature: Rules-Based Payment Analysis Integration
+-- Serves HistoryService's per-account lookups (history, velocity, counts),
+-- which filter on originator OR beneficiary account within a date window
+
+-- payment_history is created by feature 001; skip if it is not present yet
+DO $$
+BEGIN
+    IF to_regclass('payment_history') IS NOT NULL THEN
+        -- One index per side of the OR so the planner can BitmapOr the two ranges
+        CREATE INDEX IF NOT EXISTS idx_payment_history_originator_date
+            ON payment_history(originator_account, transaction_date DESC);
+        CREATE INDEX IF NOT EXISTS idx_payment_history_beneficiary_date
+            ON payment_history(beneficiary_account, transaction_date DESC);
+    END IF;
+END $$;
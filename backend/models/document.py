@@ -3,7 +3,7 @@ Document analysis models.
 """
 
 from typing import Optional, List, Dict, Any
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class BoundingBox(BaseModel):
@@ -120,6 +120,12 @@ class RiskJustification(BaseModel):
     reason: str = Field(..., description="Human-readable reason")
     evidence: Optional[dict] = None
 
+    model_config = ConfigDict(
+        # Immutable once scored; assessments share instances rather than copying them
+        frozen=True,
+        extra="forbid",
+    )
+
 
 class RiskAssessment(BaseModel):
     """Overall risk assessment."""
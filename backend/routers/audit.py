@@ -1,17 +1,15 @@
 """
 Audit trail router for compliance logging and querying.
 """
+import json
 from fastapi import APIRouter, Query
-from typing import Optional, List, Dict, Any
+from fastapi.responses import StreamingResponse
+from typing import Optional, Dict, Any, AsyncIterator
 from datetime import datetime
 from pydantic import BaseModel
 
-try:
-    from backend.core.observability import get_logger
-    from backend.services.audit_service import audit_service
-except ModuleNotFoundError:
-    from core.observability import get_logger
-    from services.audit_service import audit_service
+from backend.core.observability import get_logger
+from backend.services.audit_service import audit_service
 
 logger = get_logger(__name__)
 
@@ -37,37 +35,44 @@ class AuditEntryResponse(BaseModel):
     details: Dict[str, Any]
 
 
+def _format_entry(entry: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert an audit log row to the response entry format."""
+    return {
+        "id": str(entry.get("audit_id", "")),
+        "timestamp": entry.get("timestamp", datetime.utcnow()).isoformat(),
+        "action": entry.get("action", "unknown"),
+        "user_id": entry.get("actor", "system"),
+        "details": entry.get("metadata", {})
+    }
+
+
 @router.get("/api/v1/audit")
 async def get_audit_trail(
     limit: int = Query(default=100, ge=1, le=1000)
-) -> Dict[str, List[Dict[str, Any]]]:
+) -> StreamingResponse:
     """
     Get recent audit trail entries.
 
+    Entries are streamed as they are read from the audit log; the body is
+    the same ``{"entries": [...]}`` document as a buffered response.
+
     Args:
         limit: Maximum number of entries to return (1-1000)
 
     Returns:
-        Dict containing list of audit entries
+        Streaming JSON dict containing list of audit entries
     """
     logger.info(f"get_audit_trail - limit={limit}")
 
-    # Get recent audit logs
-    entries = await audit_service.get_recent_audits(limit=limit)
-
-    # Convert to response format
-    formatted_entries = [
-        {
-            "id": str(entry.get("audit_id", "")),
-            "timestamp": entry.get("timestamp", datetime.utcnow()).isoformat(),
-            "action": entry.get("action", "unknown"),
-            "user_id": entry.get("actor", "system"),
-            "details": entry.get("metadata", {})
-        }
-        for entry in entries
-    ]
-
-    return {"entries": formatted_entries}
+    async def entries_stream() -> AsyncIterator[str]:
+        yield '{"entries": ['
+        separator = ""
+        async for entry in audit_service.get_recent_audits(limit=limit):
+            yield separator + json.dumps(_format_entry(entry), default=str)
+            separator = ", "
+        yield "]}"
+
+    return StreamingResponse(entries_stream(), media_type="application/json")
 
 
 @router.post("/api/v1/audit")
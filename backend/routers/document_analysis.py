@@ -2,6 +2,8 @@
 Document Analysis Router - endpoints for document upload and format validation.
 """
 
+import asyncio
+
 from fastapi import APIRouter, File, Form, HTTPException, UploadFile, status
 from fastapi.responses import JSONResponse
 
@@ -32,6 +34,68 @@ SUPPORTED_EXTENSIONS = {".pdf", ".docx", ".png", ".jpg", ".jpeg"}
 MAX_FILE_SIZE = 10 * 1024 * 1024  # 10MB
 
 
+async def _run_format_pipeline(
+    content: bytes,
+    file_ext: str | None,
+    doc_type: str,
+    subtype: str | None
+) -> FormatAnalysisResult:
+    """Extract text and analyze its format in a worker thread."""
+    # Extract text from document
+    try:
+        text = await asyncio.to_thread(document_service.extract_text, content, file_ext or ".pdf")
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Text extraction failed: {str(e)}"
+        )
+
+    # Validate that we extracted some text
+    if not text.strip():
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="No text could be extracted from the document"
+        )
+
+    # Analyze format
+    try:
+        return await asyncio.to_thread(document_service.analyze_format, text, doc_type, subtype, include_text=True)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Format analysis failed: {str(e)}"
+        )
+
+
+def _check_first_image(content: bytes, file_ext: str) -> AuthenticityCheck | None:
+    images = document_service.get_images_from_content(content, file_ext)
+    if images:
+        # Check first image (or primary page)
+        return authenticity_service.check_authenticity(images[0], content)
+    return None
+
+
+async def _run_authenticity_pipeline(content: bytes, file_ext: str | None) -> AuthenticityCheck:
+    """Run authenticity checks for image-based documents in a worker thread."""
+    authenticity_check = None
+    if file_ext in [".png", ".jpg", ".jpeg", ".pdf"]:
+        try:
+            authenticity_check = await asyncio.to_thread(_check_first_image, content, file_ext)
+        except Exception as e:
+            # Authenticity check is optional, don't fail the whole request
+            pass
+
+    # If no images, mark as not applicable
+    if not authenticity_check:
+        authenticity_check = AuthenticityCheck(applicable=False)
+    return authenticity_check
+
+
 @router.post("/upload", response_model=ComprehensiveAnalysisResult, status_code=status.HTTP_200_OK)
 async def upload_and_analyze_document(
     file: UploadFile = File(..., description="Document file (PDF, DOCX, PNG, JPG)"),
@@ -84,64 +148,23 @@ async def upload_and_analyze_document(
             detail=f"File too large. Maximum size: {MAX_FILE_SIZE / 1024 / 1024}MB"
         )
 
-    # Extract text from document
+    # Format and authenticity pipelines are independent; run them side by side
+    # off the event loop so the request waits for the slower one, not both
     try:
-        text = document_service.extract_text(content, file_ext or ".pdf")
-    except ValueError as e:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=str(e)
-        )
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Text extraction failed: {str(e)}"
-        )
+        async with asyncio.TaskGroup() as tg:
+            format_task = tg.create_task(_run_format_pipeline(content, file_ext, doc_type, subtype))
+            authenticity_task = tg.create_task(_run_authenticity_pipeline(content, file_ext))
+    except* HTTPException as group:
+        raise group.exceptions[0]
 
-    # Validate that we extracted some text
-    if not text.strip():
-        raise HTTPException(
-            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
-            detail="No text could be extracted from the document"
-        )
-
-    # Analyze format
-    try:
-        format_result = document_service.analyze_format(text, doc_type, subtype, include_text=True)
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Format analysis failed: {str(e)}"
-        )
-
-    # Perform authenticity checks for image-based documents
-    authenticity_check = None
-    if file_ext in [".png", ".jpg", ".jpeg", ".pdf"]:
-        try:
-            images = document_service.get_images_from_content(content, file_ext)
-            if images:
-                # Check first image (or primary page)
-                authenticity_check = authenticity_service.check_authenticity(images[0])
-        except Exception as e:
-            # Authenticity check is optional, don't fail the whole request
-            pass
-
-    # If no images, mark as not applicable
-    if not authenticity_check:
-        authenticity_check = AuthenticityCheck(applicable=False)
+    format_result = format_task.result()
+    authenticity_check = authenticity_task.result()
 
     # Calculate risk scores
     try:
         template = document_service.load_template(doc_type, subtype)
-        format_risk, format_justifications = risk_scoring_service.calculate_format_risk(
-            format_result, template
-        )
-        auth_risk, auth_justifications = risk_scoring_service.calculate_authenticity_risk(
-            authenticity_check
-        )
-        risk_assessment = risk_scoring_service.aggregate_risk_score(
-            format_risk, format_justifications,
-            auth_risk, auth_justifications
+        risk_assessment = risk_scoring_service.score_document(
+            format_result, authenticity_check, template
         )
     except Exception as e:
         raise HTTPException(
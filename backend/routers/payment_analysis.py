@@ -72,6 +72,7 @@ def _to_iso3(code: Optional[str]) -> str:
 @router.get("/sample")
 async def get_sample_payment() -> Dict[str, Any]:
     """Return a random transaction from the dataset for demo purposes."""
+    await transaction_service.load()
     transaction = transaction_service.get_random_transaction()
     return transaction.model_dump()
 
@@ -60,6 +60,7 @@ async def query_payment_history(query: QueryParameters) -> PaymentHistory:
 
         # Execute query
         logger.info(f"Executing payment history query: {query.model_dump(exclude_none=True)}")
+        await transaction_service.load()
         payment_history = transaction_service.query(query)
 
         # Handle empty results (T017)
@@ -135,6 +136,7 @@ async def analyze_payment_history(request: AnalyzeRequest) -> AnalysisResult:
             f"Querying payment history for analysis: {query.model_dump(exclude_none=True)}"
             + (f" with rules validation" if rules_data else "")
         )
+        await transaction_service.load()
         payment_history = transaction_service.query(query)
 
         # Check if transactions found
@@ -0,0 +1,33 @@
+"""
+Convert the transactions CSV to Parquet for faster TransactionService loads.
+
+Parquet keeps column types (datetimes, booleans, numerics), so loading skips
+CSV text parsing. Point TRANSACTIONS_CSV_PATH at the output file to use it.
+Requires pyarrow.
+
+Usage:
+    python scripts/convert_transactions_to_parquet.py [source.csv] [output.parquet]
+"""
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from backend.core.config import settings
+from backend.services.transaction_service import DATETIME_COLUMNS
+
+
+def main() -> None:
+    source = Path(sys.argv[1] if len(sys.argv) > 1 else settings.transactions_csv_path)
+    output = Path(sys.argv[2]) if len(sys.argv) > 2 else source.with_suffix(".parquet")
+
+    frame = pd.read_csv(source, parse_dates=DATETIME_COLUMNS)
+    frame.to_parquet(output, compression="snappy", index=False)
+
+    print(f"Wrote {len(frame)} transactions to {output}")
+
+
+if __name__ == "__main__":
+    main()
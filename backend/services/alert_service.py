@@ -6,17 +6,53 @@ from typing import Dict, Any, Optional, List
 from uuid import UUID, uuid4
 from datetime import datetime
 
-try:
-    # Try backend-prefixed imports first (running from parent directory)
-    from backend.core.observability import get_logger
-    from backend.core.config import settings
-except ModuleNotFoundError:
-    # Fall back to relative imports (running from backend directory)
-    from core.observability import get_logger
-    from core.config import settings
+from backend.core.observability import get_logger
+from backend.core.config import settings
 
 logger = get_logger(__name__)
 
+# Investigation step added for each triggered rule type
+_RULE_STEPS: Dict[str, str] = {
+    "sanctions_screening": "Perform enhanced sanctions screening",
+    "transaction_amount_threshold": "Request source of funds documentation",
+    "high_risk_jurisdiction": "Review country risk assessment",
+}
+
+# Investigation step added for each detected pattern type
+_PATTERN_STEPS: Dict[str, str] = {
+    "structuring": "Investigate potential structuring scheme",
+    "velocity_anomaly": "Analyze transaction frequency and timing",
+    "high_risk_jurisdiction": "Verify legitimate business purpose",
+}
+
+# Known types, checked before the step lookup so unknown types skip the dict
+_RULE_TYPES = frozenset(_RULE_STEPS)
+_PATTERN_TYPES = frozenset(_PATTERN_STEPS)
+
+# Alert queries; asyncpg caches their prepared statements per pooled connection
+
+GET_ALERT_SQL = "SELECT * FROM alerts WHERE alert_id = $1"
+
+GET_ALERTS_BY_TEAM_SQL = """
+    SELECT * FROM alerts
+    WHERE assigned_team = $1
+    AND (status = $2 OR $2 IS NULL)
+    ORDER BY priority DESC, created_at DESC
+    LIMIT $3
+"""
+
+UPDATE_ALERT_STATUS_SQL = """
+    UPDATE alerts
+    SET status = $1, resolution_notes = $2, updated_at = NOW()
+    WHERE alert_id = $3
+"""
+
+GET_PENDING_ALERTS_COUNT_SQL = """
+    SELECT COUNT(*) FROM alerts
+    WHERE status = 'pending'
+    AND (assigned_team = $1 OR $1 IS NULL)
+"""
+
 
 class AlertService:
     """
@@ -64,9 +100,12 @@ class AlertService:
         Returns:
             Alert ID if created, None for pass verdicts
         """
+        log = self.logger.info
+        trace_s = str(trace_id)
+
         # Don't create alerts for pass verdicts
         if verdict == "pass":
-            self.logger.info(f"alert_skipped_for_pass - trace_id=str(trace_id)")
+            log(f"alert_skipped_for_pass - trace_id={trace_s}")
             return None
 
         # Determine alert priority based on verdict and risk score
@@ -80,7 +119,7 @@ class AlertService:
             detected_patterns=detected_patterns
         )
 
-        self.logger.info(f"creating_alert - trace_id=str(trace_id), payment_id=str(payment_id), priority=priority, assigned_team=assigned_team")
+        log(f"creating_alert - trace_id={trace_s}, payment_id={payment_id}, priority={priority}, assigned_team={assigned_team}")
 
         # TODO: Insert into alerts table
         # INSERT INTO alerts (
@@ -91,7 +130,7 @@ class AlertService:
 
         alert_id = uuid4()  # Placeholder
 
-        self.logger.info(f"alert_created - trace_id=str(trace_id), alert_id=str(alert_id), priority=priority")
+        log(f"alert_created - trace_id={trace_s}, alert_id={alert_id}, priority={priority}")
 
         return alert_id
 
@@ -105,10 +144,10 @@ class AlertService:
         Returns:
             Alert dict or None if not found
         """
-        self.logger.info("fetching_alert", alert_id=str(alert_id))
+        self.logger.info(f"fetching_alert - alert_id={alert_id}")
 
         # TODO: Query alerts table
-        # SELECT * FROM alerts WHERE alert_id = ?
+        # row = await conn.fetchrow(GET_ALERT_SQL, alert_id)
 
         return None
 
@@ -129,14 +168,10 @@ class AlertService:
         Returns:
             List of alerts
         """
-        self.logger.info(f"fetching_team_alerts - team=team, status=status, limit=limit")
+        self.logger.info(f"fetching_team_alerts - team={team}, status={status}, limit={limit}")
 
         # TODO: Query alerts table
-        # SELECT * FROM alerts
-        # WHERE assigned_team = ?
-        # AND (status = ? OR ? IS NULL)
-        # ORDER BY priority DESC, created_at DESC
-        # LIMIT ?
+        # rows = await conn.fetch(GET_ALERTS_BY_TEAM_SQL, team, status, limit)
 
         return []
 
@@ -157,12 +192,10 @@ class AlertService:
         Returns:
             True if updated successfully
         """
-        self.logger.info(f"updating_alert_status - alert_id=str(alert_id), status=status")
+        self.logger.info(f"updating_alert_status - alert_id={alert_id}, status={status}")
 
         # TODO: Update alerts table
-        # UPDATE alerts
-        # SET status = ?, investigation_notes = ?, updated_at = NOW()
-        # WHERE alert_id = ?
+        # await conn.execute(UPDATE_ALERT_STATUS_SQL, status, investigation_notes, alert_id)
 
         return True
 
@@ -177,9 +210,7 @@ class AlertService:
             Count of pending alerts
         """
         # TODO: Query alerts table
-        # SELECT COUNT(*) FROM alerts
-        # WHERE status = 'pending'
-        # AND (assigned_team = ? OR ? IS NULL)
+        # count = await conn.fetchval(GET_PENDING_ALERTS_COUNT_SQL, team)
 
         return 0
 
@@ -244,25 +275,17 @@ class AlertService:
             steps.append("Contact originator for missing information")
             steps.append("Validate account details and beneficiary information")
 
-        # Add rule-specific steps
-        for rule in triggered_rules[:3]:  # Top 3 rules
+        # Add rule-specific steps (top 3 rules)
+        for rule in triggered_rules[:3]:
             rule_type = rule.get("rule_type")
-            if rule_type == "sanctions_screening":
-                steps.append("Perform enhanced sanctions screening")
-            elif rule_type == "transaction_amount_threshold":
-                steps.append("Request source of funds documentation")
-            elif rule_type == "high_risk_jurisdiction":
-                steps.append("Review country risk assessment")
-
-        # Add pattern-specific steps
-        for pattern in detected_patterns[:3]:  # Top 3 patterns
+            if rule_type in _RULE_TYPES:
+                steps.append(_RULE_STEPS[rule_type])
+
+        # Add pattern-specific steps (top 3 patterns)
+        for pattern in detected_patterns[:3]:
             pattern_type = pattern.get("pattern_type")
-            if pattern_type == "structuring":
-                steps.append("Investigate potential structuring scheme")
-            elif pattern_type == "velocity_anomaly":
-                steps.append("Analyze transaction frequency and timing")
-            elif pattern_type == "high_risk_jurisdiction":
-                steps.append("Verify legitimate business purpose")
+            if pattern_type in _PATTERN_TYPES:
+                steps.append(_PATTERN_STEPS[pattern_type])
 
         # Final step
         if verdict == "fail":
@@ -2,21 +2,71 @@
 Audit Service - Immutable audit logging for compliance and traceability.
 All payment analysis decisions are logged with full context.
 """
-from typing import Dict, Any, Optional, List
+import asyncio
+import hashlib
+from typing import Dict, Any, Optional, List, AsyncIterator, Set
 from uuid import UUID, uuid4
 from datetime import datetime
 
-try:
-    # Try backend-prefixed imports first (running from parent directory)
-    from backend.core.observability import get_logger
-    from backend.core.config import settings
-except ModuleNotFoundError:
-    # Fall back to relative imports (running from backend directory)
-    from core.observability import get_logger
-    from core.config import settings
+from backend.core.observability import audit_background_write_failures_total, get_logger
+from backend.core.config import settings
 
 logger = get_logger(__name__)
 
+# Rows fetched per server-side cursor round-trip
+AUDIT_CURSOR_PREFETCH = 500
+
+# Audit queries; asyncpg caches their prepared statements per pooled connection
+
+LOG_ANALYSIS_DECISION_SQL = """
+    INSERT INTO audit_logs (
+        audit_id, trace_id, payment_id, action, verdict, assigned_team,
+        risk_score, decision_rationale, triggered_rules_count,
+        detected_patterns_count, analysis_duration_ms, llm_model,
+        metadata, created_at
+    ) VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12, $13, NOW())
+"""
+
+LOG_ALERT_ACTION_SQL = """
+    INSERT INTO audit_logs (
+        audit_id, trace_id, alert_id, action, decision_rationale,
+        metadata, created_at
+    ) VALUES ($1, $2, $3, $4, $5, $6, NOW())
+"""
+
+GET_AUDIT_TRAIL_SQL = """
+    SELECT * FROM audit_logs
+    WHERE (trace_id = $1 OR $1 IS NULL)
+    AND (payment_id = $2 OR $2 IS NULL)
+    ORDER BY created_at ASC
+    LIMIT $3
+"""
+
+GET_RECENT_AUDITS_SQL = """
+    SELECT * FROM audit_logs
+    WHERE (action = $1 OR $1 IS NULL)
+    AND (verdict = $2 OR $2 IS NULL)
+    ORDER BY created_at DESC
+    LIMIT $3
+"""
+
+# Reads hourly pre-aggregates from mv_decision_stats_hourly (migration 005);
+# averages are re-weighted by each bucket's decision count
+GET_DECISION_STATISTICS_SQL = """
+    SELECT
+        COALESCE(SUM(total), 0) AS total_decisions,
+        COALESCE(SUM(pass_count), 0) AS pass_count,
+        COALESCE(SUM(suspicious_count), 0) AS suspicious_count,
+        COALESCE(SUM(fail_count), 0) AS fail_count,
+        COALESCE(SUM(total * avg_risk_score) / NULLIF(SUM(total), 0), 0) AS avg_risk_score,
+        COALESCE(SUM(total * avg_duration_ms) / NULLIF(SUM(total), 0), 0) AS avg_duration_ms
+    FROM mv_decision_stats_hourly
+    WHERE (bucket >= date_trunc('hour', $1::timestamptz) OR $1 IS NULL)
+    AND (bucket <= $2 OR $2 IS NULL)
+"""
+
+REFRESH_DECISION_STATISTICS_SQL = "REFRESH MATERIALIZED VIEW CONCURRENTLY mv_decision_stats_hourly"
+
 
 class AuditService:
     """
@@ -31,6 +81,12 @@ class AuditService:
 
     def __init__(self):
         self.logger = logger
+        # Redis holding the audit IDs of recent writes, shared by every worker
+        # so duplicate submissions within the dedup window skip the INSERT.
+        # Created on first use; dedup is off when settings.redis_url is empty
+        self._redis: Optional[Any] = None
+        self._background_writes: Set[asyncio.Task] = set()
+        self._background_slots = asyncio.Semaphore(settings.audit_background_max_concurrency)
 
     async def log_analysis_decision(
         self,
@@ -65,22 +121,33 @@ class AuditService:
             metadata: Additional metadata (optional)
 
         Returns:
-            Audit log ID
+            Audit log ID (the existing ID if the same trace/action was
+            logged within the dedup window)
         """
-        self.logger.info(f"creating_audit_log - trace_id=str(trace_id), action=action, verdict=verdict")
+        log = self.logger.info
+        trace_s = str(trace_id)
+
+        dedup_key = f"audit:{trace_s}:{action}"
+        existing_id = await self._find_recent_write(dedup_key)
+        if existing_id is not None:
+            log(f"audit_log_deduplicated - trace_id={trace_s}, action={action}, audit_id={existing_id}")
+            return existing_id
+
+        log(f"creating_audit_log - trace_id={trace_s}, action={action}, verdict={verdict}")
+
+        audit_id = uuid4()
 
         # TODO: Insert into audit_logs table
-        # INSERT INTO audit_logs (
-        #     trace_id, payment_id, action, verdict, assigned_team,
+        # await conn.execute(
+        #     LOG_ANALYSIS_DECISION_SQL,
+        #     audit_id, trace_id, payment_id, action, verdict, assigned_team,
         #     risk_score, decision_rationale, triggered_rules_count,
         #     detected_patterns_count, analysis_duration_ms, llm_model,
-        #     metadata, created_at
-        # ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, NOW())
-        # RETURNING audit_id
+        #     metadata
+        # )
+        await self._remember_write(dedup_key, audit_id)
 
-        audit_id = uuid4()  # Placeholder
-
-        self.logger.info(f"audit_log_created - trace_id=str(trace_id), audit_id=str(audit_id)")
+        log(f"audit_log_created - trace_id={trace_s}, audit_id={audit_id}")
 
         return audit_id
 
@@ -96,6 +163,9 @@ class AuditService:
         """
         Log an alert status change or investigation action.
 
+        Waits for the audit row to be written; use log_alert_action_nowait
+        on paths that do not need the write to be durable before returning.
+
         Args:
             trace_id: Analysis trace ID
             alert_id: Alert ID
@@ -105,75 +175,238 @@ class AuditService:
             actor: User/system performing the action
 
         Returns:
-            Audit log ID
+            Audit log ID (the existing ID if the same alert action was
+            logged within the dedup window)
         """
-        self.logger.info(f"logging_alert_action - trace_id=str(trace_id), alert_id=str(alert_id), action=action")
+        dedup_key = self._alert_action_key(trace_id, alert_id, action, status_change, investigation_notes, actor)
+        existing_id = await self._find_recent_write(dedup_key)
+        if existing_id is not None:
+            self.logger.info(f"alert_action_deduplicated - alert_id={alert_id}, action={action}, audit_id={existing_id}")
+            return existing_id
+
+        audit_id = uuid4()
+        await self._write_alert_action(
+            audit_id, trace_id, alert_id, action, status_change, investigation_notes, actor
+        )
+        await self._remember_write(dedup_key, audit_id)
+        return audit_id
 
-        # TODO: Insert into audit_logs table
-        # INSERT INTO audit_logs (
-        #     trace_id, alert_id, action, decision_rationale,
-        #     metadata, created_at
-        # ) VALUES (?, ?, ?, ?, ?, NOW())
+    async def log_alert_action_nowait(
+        self,
+        trace_id: UUID,
+        alert_id: UUID,
+        action: str,
+        status_change: str,
+        investigation_notes: Optional[str] = None,
+        actor: Optional[str] = None
+    ) -> UUID:
+        """
+        Log an alert action in the background without waiting for the write.
+
+        The audit ID is minted and reserved in the dedup store up front; the
+        write runs as a background task bounded by
+        settings.audit_background_max_concurrency.
 
-        audit_id = uuid4()  # Placeholder
+        Args:
+            Same as log_alert_action
 
+        Returns:
+            Audit log ID the background write will use. If that write fails,
+            the row is lost: the failure is logged and counted in
+            audit_background_write_failures_total, and the dedup reservation
+            is released so a retry logs the action again.
+        """
+        dedup_key = self._alert_action_key(trace_id, alert_id, action, status_change, investigation_notes, actor)
+        audit_id = uuid4()
+        existing_id = await self._reserve_write(dedup_key, audit_id)
+        if existing_id is not None:
+            self.logger.info(f"alert_action_deduplicated - alert_id={alert_id}, action={action}, audit_id={existing_id}")
+            return existing_id
+
+        task = asyncio.get_running_loop().create_task(
+            self._write_alert_action_bounded(
+                dedup_key, audit_id, trace_id, alert_id, action, status_change, investigation_notes, actor
+            )
+        )
+        # Hold a reference so the task isn't garbage collected mid-flight
+        self._background_writes.add(task)
+        task.add_done_callback(self._background_writes.discard)
         return audit_id
 
+    async def drain_background_writes(self) -> None:
+        """Wait for all pending log_alert_action_nowait writes to finish."""
+        if self._background_writes:
+            await asyncio.gather(*self._background_writes, return_exceptions=True)
+
+    async def aclose(self) -> None:
+        """Close the dedup store connection. Call on application shutdown."""
+        if self._redis is not None:
+            await self._redis.aclose()
+            self._redis = None
+
+    def _get_redis(self) -> Optional[Any]:
+        """Return the shared dedup store, or None when no Redis URL is configured."""
+        if self._redis is None and settings.redis_url:
+            import redis.asyncio as redis
+
+            self._redis = redis.from_url(settings.redis_url, decode_responses=True)
+        return self._redis
+
+    @staticmethod
+    def _alert_action_key(
+        trace_id: UUID,
+        alert_id: UUID,
+        action: str,
+        status_change: str,
+        investigation_notes: Optional[str],
+        actor: Optional[str]
+    ) -> str:
+        """Dedup key covering every field of an alert action row."""
+        fields = repr((str(trace_id), action, status_change, investigation_notes, actor))
+        return f"audit:{alert_id}:{hashlib.sha256(fields.encode()).hexdigest()}"
+
+    async def _find_recent_write(self, dedup_key: str) -> Optional[UUID]:
+        """Return the audit ID written for ``dedup_key`` within the dedup window, if any."""
+        store = self._get_redis()
+        if store is None:
+            return None
+        try:
+            existing_id = await store.get(dedup_key)
+        except Exception as e:
+            # Dedup is best-effort: an unreachable store must not drop audit rows
+            self.logger.warning(f"audit_dedup_lookup_failed - key={dedup_key}, error={e}")
+            return None
+        return UUID(existing_id) if existing_id else None
+
+    async def _remember_write(self, dedup_key: str, audit_id: UUID) -> None:
+        """Record a written audit row so repeats within the dedup window reuse its ID."""
+        store = self._get_redis()
+        if store is None:
+            return
+        try:
+            await store.set(dedup_key, str(audit_id), ex=settings.audit_dedup_window_seconds)
+        except Exception as e:
+            self.logger.warning(f"audit_dedup_store_failed - key={dedup_key}, error={e}")
+
+    async def _reserve_write(self, dedup_key: str, audit_id: UUID) -> Optional[UUID]:
+        """
+        Claim ``dedup_key`` for a write that has not happened yet (SET NX EX).
+
+        Returns:
+            The audit ID already holding the key, or None if this call claimed it
+        """
+        store = self._get_redis()
+        if store is None:
+            return None
+        try:
+            if await store.set(dedup_key, str(audit_id), ex=settings.audit_dedup_window_seconds, nx=True):
+                return None
+        except Exception as e:
+            self.logger.warning(f"audit_dedup_store_failed - key={dedup_key}, error={e}")
+            return None
+        return await self._find_recent_write(dedup_key)
+
+    async def _forget_write(self, dedup_key: str) -> None:
+        """Release ``dedup_key`` so the next submission of that action writes a row."""
+        store = self._get_redis()
+        if store is None:
+            return
+        try:
+            await store.delete(dedup_key)
+        except Exception as e:
+            self.logger.warning(f"audit_dedup_release_failed - key={dedup_key}, error={e}")
+
+    async def _write_alert_action_bounded(self, dedup_key: str, audit_id: UUID, *args: Any) -> None:
+        """Run _write_alert_action under the background concurrency cap."""
+        async with self._background_slots:
+            try:
+                await self._write_alert_action(audit_id, *args)
+            except Exception as e:
+                # The row was never written: free the reservation so a retry is
+                # not deduplicated against it, and count the lost row
+                await self._forget_write(dedup_key)
+                action = args[2]
+                audit_background_write_failures_total.labels(action=action).inc()
+                self.logger.error(f"alert_action_write_failed - audit_id={audit_id}, action={action}, error={e}")
+
+    async def _write_alert_action(
+        self,
+        audit_id: UUID,
+        trace_id: UUID,
+        alert_id: UUID,
+        action: str,
+        status_change: str,
+        investigation_notes: Optional[str],
+        actor: Optional[str]
+    ) -> None:
+        """Insert one alert action row into the audit log."""
+        self.logger.info(f"logging_alert_action - trace_id={trace_id}, alert_id={alert_id}, action={action}")
+
+        # TODO: Insert into audit_logs table
+        # await conn.execute(
+        #     LOG_ALERT_ACTION_SQL,
+        #     audit_id, trace_id, alert_id, action, investigation_notes,
+        #     {"status_change": status_change, "actor": actor}
+        # )
+
     async def get_audit_trail(
         self,
         trace_id: Optional[UUID] = None,
         payment_id: Optional[UUID] = None,
         limit: int = 100
-    ) -> List[Dict[str, Any]]:
+    ) -> AsyncIterator[Dict[str, Any]]:
         """
-        Retrieve audit trail for a payment or trace.
+        Stream audit trail for a payment or trace.
+
+        Rows are yielded as they arrive from a server-side cursor so callers
+        can forward them without buffering the full result set.
 
         Args:
             trace_id: Filter by trace ID
             payment_id: Filter by payment ID
             limit: Maximum number of logs to return
 
-        Returns:
-            List of audit logs in chronological order
+        Yields:
+            Audit logs in chronological order
         """
-        self.logger.info(f"fetching_audit_trail - trace_id=str(trace_id) if trace_id else None, payment_id=str(payment_id) if payment_id else None")
+        self.logger.info(f"fetching_audit_trail - trace_id={trace_id}, payment_id={payment_id}, limit={limit}")
 
-        # TODO: Query audit_logs table
-        # SELECT * FROM audit_logs
-        # WHERE (trace_id = ? OR ? IS NULL)
-        # AND (payment_id = ? OR ? IS NULL)
-        # ORDER BY created_at ASC
-        # LIMIT ?
+        # TODO: Stream from audit_logs table via server-side cursor
+        # async with conn.transaction():
+        #     async for record in conn.cursor(GET_AUDIT_TRAIL_SQL, trace_id, payment_id, limit, prefetch=AUDIT_CURSOR_PREFETCH):
+        #         yield dict(record)
 
-        return []
+        rows: List[Dict[str, Any]] = []  # Placeholder
+        for row in rows:
+            yield row
 
     async def get_recent_audits(
         self,
         action_filter: Optional[str] = None,
         verdict_filter: Optional[str] = None,
         limit: int = 100
-    ) -> List[Dict[str, Any]]:
+    ) -> AsyncIterator[Dict[str, Any]]:
         """
-        Get recent audit logs with optional filtering.
+        Stream recent audit logs with optional filtering.
 
         Args:
             action_filter: Filter by action type
             verdict_filter: Filter by verdict
             limit: Maximum number of logs to return
 
-        Returns:
-            List of audit logs
+        Yields:
+            Audit logs, newest first
         """
-        self.logger.info(f"fetching_recent_audits - action_filter=action_filter, verdict_filter=verdict_filter, limit=limit")
+        self.logger.info(f"fetching_recent_audits - action_filter={action_filter}, verdict_filter={verdict_filter}, limit={limit}")
 
-        # TODO: Query audit_logs table
-        # SELECT * FROM audit_logs
-        # WHERE (action = ? OR ? IS NULL)
-        # AND (verdict = ? OR ? IS NULL)
-        # ORDER BY created_at DESC
-        # LIMIT ?
+        # TODO: Stream from audit_logs table via server-side cursor
+        # async with conn.transaction():
+        #     async for record in conn.cursor(GET_RECENT_AUDITS_SQL, action_filter, verdict_filter, limit, prefetch=AUDIT_CURSOR_PREFETCH):
+        #         yield dict(record)
 
-        return []
+        rows: List[Dict[str, Any]] = []  # Placeholder
+        for row in rows:
+            yield row
 
     async def get_decision_statistics(
         self,
@@ -183,6 +416,9 @@ class AuditService:
         """
         Get aggregated decision statistics from audit logs.
 
+        Statistics come from the hourly materialized view, so date filters
+        resolve to whole hours and results lag by up to one refresh interval.
+
         Args:
             start_date: Optional start date filter
             end_date: Optional end date filter
@@ -190,20 +426,10 @@ class AuditService:
         Returns:
             Statistics dict with verdict counts, team distribution, etc.
         """
-        self.logger.info(f"calculating_decision_statistics - start_date=start_date, end_date=end_date")
+        self.logger.info(f"calculating_decision_statistics - start_date={start_date}, end_date={end_date}")
 
         # TODO: Query audit_logs table with aggregations
-        # SELECT
-        #     COUNT(*) as total_decisions,
-        #     COUNT(CASE WHEN verdict = 'pass' THEN 1 END) as pass_count,
-        #     COUNT(CASE WHEN verdict = 'suspicious' THEN 1 END) as suspicious_count,
-        #     COUNT(CASE WHEN verdict = 'fail' THEN 1 END) as fail_count,
-        #     AVG(risk_score) as avg_risk_score,
-        #     AVG(analysis_duration_ms) as avg_duration_ms
-        # FROM audit_logs
-        # WHERE action = 'payment_analysis'
-        # AND (created_at >= ? OR ? IS NULL)
-        # AND (created_at <= ? OR ? IS NULL)
+        # row = await conn.fetchrow(GET_DECISION_STATISTICS_SQL, start_date, end_date)
 
         return {
             "total_decisions": 0,
@@ -214,6 +440,28 @@ class AuditService:
             "avg_duration_ms": 0
         }
 
+    async def refresh_decision_statistics(self) -> None:
+        """Refresh the hourly decision statistics materialized view."""
+        self.logger.info("refreshing_decision_statistics")
+
+        # TODO: Refresh materialized view
+        # await conn.execute(REFRESH_DECISION_STATISTICS_SQL)
+
+    async def run_statistics_refresher(self, interval_seconds: Optional[int] = None) -> None:
+        """
+        Refresh decision statistics periodically until cancelled.
+
+        Args:
+            interval_seconds: Seconds between refreshes (defaults to settings)
+        """
+        interval = interval_seconds or settings.decision_stats_refresh_seconds
+        while True:
+            try:
+                await self.refresh_decision_statistics()
+            except Exception as e:
+                self.logger.error(f"decision_statistics_refresh_failed - error={e}")
+            await asyncio.sleep(interval)
+
 
 # Global service instance
 audit_service = AuditService()
@@ -3,17 +3,24 @@ Authenticity and tamper detection service for images.
 """
 
 import io
+import os
+import re
 import json
 import hashlib
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import Iterator, List, Optional, Tuple
 from datetime import datetime
 
-import imagehash
 import numpy as np
+import scipy.fftpack
+from cachetools import LRUCache
 import requests
 from PIL import Image
-from PIL.ExifTags import TAGS
+from PIL.ExifTags import Base, IFD
 
 try:
     from backend.models.document import (
@@ -29,9 +36,229 @@ except ModuleNotFoundError:
     )
 
 
+try:
+    # Optional: libjpeg-turbo bindings for SIMD JPEG encode/decode in ELA
+    from turbojpeg import TurboJPEG, TJPF_RGB, TJSAMP_420
+    _turbojpeg = TurboJPEG()
+except (ImportError, OSError, RuntimeError):
+    _turbojpeg = None
+
+
+VISION_JPEG_QUALITY = 85
+# Vision downsamples internally, so larger uploads only cost encode time and bandwidth
+VISION_MAX_UPLOAD_SIDE = 1024
+
+
+# IFD0 tags read by check_exif; all live in IFD0 so the Exif/GPS
+# sub-IFDs never need to be parsed
+_EXIF_FIELDS = {
+    "Make": Base.Make,
+    "Model": Base.Model,
+    "Software": Base.Software,
+    "DateTime": Base.DateTime,
+    "GPSInfo": Base.GPSInfo,
+}
+
+
+# ELA scratch arrays, shared by all threads through a small free list so
+# memory stays bounded however many worker threads run checks. Only images up
+# to the 1024px working size reuse them; larger ones allocate per call.
+_SCRATCH_MAX_ELEMENTS = 1024 * 1024 * 3
+_SCRATCH_POOL_SIZE = 4
+_scratch_pool: List[dict] = []
+_scratch_pool_lock = threading.Lock()
+
+
+@contextmanager
+def _ela_scratch() -> Iterator[dict]:
+    """Borrow a set of scratch arrays from the pool for the duration of the block."""
+    with _scratch_pool_lock:
+        arrays = _scratch_pool.pop() if _scratch_pool else {}
+    try:
+        yield arrays
+    finally:
+        with _scratch_pool_lock:
+            if len(_scratch_pool) < _SCRATCH_POOL_SIZE:
+                _scratch_pool.append(arrays)
+
+
+def _scratch_array(arrays: dict, name: str, shape: Tuple[int, ...], dtype) -> np.ndarray:
+    """Return an uninitialized array backed by the ``name`` buffer of a borrowed scratch set."""
+    size = int(np.prod(shape))
+    if size > _SCRATCH_MAX_ELEMENTS:
+        return np.empty(shape, dtype=dtype)
+    flat = arrays.get(name)
+    if flat is None or flat.size < size or flat.dtype != dtype:
+        flat = arrays[name] = np.empty(size, dtype=dtype)
+    return flat[:size].reshape(shape)
+
+
+# Corpus entries per duplicate-scan shard
+HAMMING_SCAN_CHUNK = 1 << 20
+# Threads are only started on first use, i.e. once the corpus outgrows one shard
+_scan_executor = ThreadPoolExecutor(max_workers=min(8, os.cpu_count() or 1), thread_name_prefix="phash-scan")
+
+
+# SWAR popcount masks for NumPy builds without np.bitwise_count (< 2.0)
+_M1 = np.uint64(0x5555555555555555)
+_M2 = np.uint64(0x3333333333333333)
+_M4 = np.uint64(0x0F0F0F0F0F0F0F0F)
+_H01 = np.uint64(0x0101010101010101)
+
+
+def _to_signed64(value: int) -> int:
+    """Map an unsigned 64-bit hash onto SQLite's signed INTEGER range."""
+    return value - (1 << 64) if value >= (1 << 63) else value
+
+
+def _hamming_distances(hashes: np.ndarray, query: int) -> np.ndarray:
+    """Hamming distance between a 64-bit hash and every entry of a uint64 array."""
+    x = hashes ^ np.uint64(query)
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(x)
+    x = x - ((x >> np.uint64(1)) & _M1)
+    x = (x & _M2) + ((x >> np.uint64(2)) & _M2)
+    x = (x + (x >> np.uint64(4))) & _M4
+    return (x * _H01) >> np.uint64(56)
+
+
+def _scan_chunk(hashes: np.ndarray, query: int, threshold: int, offset: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Indices (shifted by ``offset``) and distances of hashes within ``threshold`` of ``query``."""
+    distances = _hamming_distances(hashes, query)
+    hits = np.flatnonzero(distances <= threshold)
+    return hits + offset, distances[hits]
+
+
+def _hamming_matches(hashes: np.ndarray, query: int, threshold: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Find every hash within ``threshold`` bits of ``query``.
+
+    Large corpora are split into HAMMING_SCAN_CHUNK-entry shards so the
+    popcount temporaries stay cache-sized; the shards are scanned on a
+    thread pool, since NumPy releases the GIL inside the ufunc loops.
+
+    Returns:
+        Tuple of (indices into ``hashes``, hamming distances), in index order
+    """
+    if len(hashes) <= HAMMING_SCAN_CHUNK:
+        return _scan_chunk(hashes, query, threshold, 0)
+
+    offsets = range(0, len(hashes), HAMMING_SCAN_CHUNK)
+    shards = list(_scan_executor.map(
+        lambda offset: _scan_chunk(hashes[offset:offset + HAMMING_SCAN_CHUNK], query, threshold, offset),
+        offsets,
+    ))
+    return (
+        np.concatenate([indices for indices, _ in shards]),
+        np.concatenate([distances for _, distances in shards]),
+    )
+
+
+def _jpeg_roundtrip(image: Image.Image, rgb: np.ndarray, quality: int) -> np.ndarray:
+    """Recompress an RGB image as JPEG and decode it back to a uint8 array.
+
+    ``rgb`` is the image's pixel data, already materialized by the caller.
+    """
+    if _turbojpeg is not None:
+        # 4:2:0 subsampling matches Pillow's default so ELA thresholds still apply
+        jpeg_bytes = _turbojpeg.encode(
+            rgb, quality=quality, pixel_format=TJPF_RGB, jpeg_subsample=TJSAMP_420
+        )
+        return _turbojpeg.decode(jpeg_bytes, pixel_format=TJPF_RGB)
+
+    buffer = io.BytesIO()
+    image.save(buffer, "JPEG", quality=quality)
+    buffer.seek(0)
+    with Image.open(buffer) as resaved:
+        return np.asarray(resaved)
+
+
+def _ela_stats(original: np.ndarray, resaved: np.ndarray) -> Tuple[float, float]:
+    """Mean and variance of |original - resaved| for two uint8 images.
+
+    Works in integer arithmetic on the uint8 inputs: the absolute
+    difference stays uint8, and mean/variance come from a single sum and
+    sum-of-squares instead of separate float32 mean and var passes.
+    Intermediates live in pooled scratch buffers.
+    """
+    shape = original.shape
+    with _ela_scratch() as arrays:
+        diff = np.maximum(original, resaved, out=_scratch_array(arrays, "ela_diff", shape, np.uint8))
+        diff -= np.minimum(original, resaved, out=_scratch_array(arrays, "ela_min", shape, np.uint8))
+
+        n = diff.size
+        total = int(diff.sum(dtype=np.int64))
+        squares = np.square(diff, dtype=np.uint16, out=_scratch_array(arrays, "ela_sq", shape, np.uint16))
+        total_sq = int(squares.sum(dtype=np.int64))
+
+    mean = total / n
+    return mean, total_sq / n - mean * mean
+
+
+def _phash_from_small(small: np.ndarray) -> int:
+    """64-bit perceptual hash of a 32x32 grayscale uint8 array.
+
+    Same DCT/median construction as ``imagehash.phash``, but the bits are
+    packed straight into an integer instead of going through ImageHash and
+    its hex string.
+    """
+    dct = scipy.fftpack.dct(scipy.fftpack.dct(small, axis=0), axis=1)
+    low = dct[:8, :8]
+    bits = np.packbits(low > np.median(low))
+    return int.from_bytes(bits.tobytes(), "big")
+
+
+def _phash(image: Image.Image) -> int:
+    """64-bit perceptual hash of a PIL image, bit-identical to ``imagehash.phash``."""
+    small = image.convert("L").resize((32, 32), Image.Resampling.LANCZOS)
+    return _phash_from_small(np.asarray(small))
+
+
+def _vision_upload_bytes(image: Image.Image) -> bytes:
+    """Downscale an image to at most 1024px per side and encode it as JPEG for the Vision API."""
+    width, height = image.size
+    scale = VISION_MAX_UPLOAD_SIDE / max(width, height)
+    if scale < 1:
+        size = (max(1, round(width * scale)), max(1, round(height * scale)))
+        image = image.resize(size, Image.Resampling.LANCZOS, reducing_gap=2.0)
+    if image.mode not in ("RGB", "L"):
+        image = image.convert("RGB")
+    buffer = io.BytesIO()
+    image.save(buffer, "JPEG", quality=VISION_JPEG_QUALITY)
+    return buffer.getvalue()
+
+
+def _no_reverse_matches() -> ReverseImageSearchResult:
+    """Empty reverse image search result, used when the Vision API is unavailable."""
+    return ReverseImageSearchResult(
+        exact_matches=[],
+        partial_matches=[],
+        total_matches=0,
+        authenticity_risk="Low"
+    )
+
+
+def _rgb_array(image: Image.Image) -> np.ndarray:
+    """Return the image pixels as an RGB uint8 array."""
+    if image.mode != "RGB":
+        image = image.convert("RGB")
+    return np.asarray(image)
+
+
+def _luma_std(rgb: np.ndarray) -> float:
+    """Standard deviation of the (R + 2G + B) / 4 integer luma approximation."""
+    luma = rgb[..., 1].astype(np.uint16)
+    luma <<= 1
+    luma += rgb[..., 0]
+    luma += rgb[..., 2]
+    luma >>= 2
+    return float(luma.std())
+
+
 class AuthenticityService:
     """Service for checking image authenticity and tampering."""
 
+    _AI_SOFTWARE_RE = re.compile(r"midjourney|stable diffusion|dall-?e|photoshop", re.I)
+
     def __init__(self, corpus_dir: str = "corpus"):
         """Initialize authenticity service.
 
@@ -40,21 +267,89 @@ class AuthenticityService:
         """
         self.corpus_dir = Path(corpus_dir)
         self.corpus_dir.mkdir(exist_ok=True)
-        self._hash_db_path = self.corpus_dir / "phash_db.json"
+        self._hash_db_path = self.corpus_dir / "phash.db"
+        self._hash_arr_path = self.corpus_dir / "phash.u64"
+        self._hash_arr_dirty_path = self.corpus_dir / "phash.u64.dirty"
+        self._conn = sqlite3.connect(self._hash_db_path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS phash (file TEXT PRIMARY KEY, h INTEGER NOT NULL)"
+        )
+        # pHash memo keyed by SHA-256 of the source file bytes
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS phash_memo (content_sha BLOB PRIMARY KEY, h INTEGER NOT NULL)"
+        )
+        self._phash_memo: LRUCache = LRUCache(maxsize=1024)
+        self._write_lock = threading.Lock()
+        # Reverse image search is network-bound; run it beside the CPU checks
+        self._search_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="reverse-search")
+        self._import_legacy_json_db()
         self._load_hash_db()
 
+    def _import_legacy_json_db(self):
+        """Move hashes from the old phash_db.json file into SQLite, once."""
+        legacy_path = self.corpus_dir / "phash_db.json"
+        if not legacy_path.exists():
+            return
+        with open(legacy_path, "r") as f:
+            legacy_db = json.load(f)
+        with self._conn:
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO phash (file, h) VALUES (?, ?)",
+                ((file, _to_signed64(int(h, 16))) for file, h in legacy_db.items())
+            )
+        legacy_path.rename(legacy_path.with_suffix(".json.imported"))
+
     def _load_hash_db(self):
-        """Load perceptual hash database."""
-        if self._hash_db_path.exists():
-            with open(self._hash_db_path, "r") as f:
-                self._hash_db = json.load(f)
-        else:
-            self._hash_db = {}
+        """Map the packed hash array for duplicate search, rebuilding it from SQLite if stale.
 
-    def _save_hash_db(self):
-        """Save perceptual hash database."""
-        with open(self._hash_db_path, "w") as f:
-            json.dump(self._hash_db, f, indent=2)
+        ``phash.u64`` holds one uint64 per corpus row, where slot i is the
+        hash of the row with rowid i + 1. It is derived data: SQLite stays
+        the source of truth, and a missing or mis-sized file is rebuilt, as
+        is one left behind a ``phash.u64.dirty`` marker by an interrupted add.
+        """
+        count, max_rowid = self._conn.execute("SELECT COUNT(*), MAX(rowid) FROM phash").fetchone()
+        if count != (max_rowid or 0):
+            self._compact_hash_rows()
+
+        expected_size = count * 8
+        if (
+            not self._hash_arr_path.exists()
+            or self._hash_arr_path.stat().st_size != expected_size
+            or self._hash_arr_dirty_path.exists()
+        ):
+            # SQLite integers are signed; reinterpret the bits as uint64
+            hashes = np.fromiter(
+                (h for (h,) in self._conn.execute("SELECT h FROM phash ORDER BY rowid")),
+                dtype=np.int64,
+                count=count,
+            )
+            tmp_path = self._hash_arr_path.with_suffix(".u64.tmp")
+            hashes.view(np.uint64).tofile(tmp_path)
+            os.replace(tmp_path, self._hash_arr_path)
+            self._hash_arr_dirty_path.unlink(missing_ok=True)
+
+        self._map_hash_arr(count)
+
+    def _compact_hash_rows(self):
+        """Renumber phash rows to contiguous rowids 1..N so they line up with array slots."""
+        with self._conn:
+            self._conn.execute("DROP TABLE IF EXISTS phash_compact")
+            self._conn.execute(
+                "CREATE TABLE phash_compact (file TEXT PRIMARY KEY, h INTEGER NOT NULL)"
+            )
+            self._conn.execute(
+                "INSERT INTO phash_compact (file, h) SELECT file, h FROM phash ORDER BY rowid"
+            )
+            self._conn.execute("DROP TABLE phash")
+            self._conn.execute("ALTER TABLE phash_compact RENAME TO phash")
+
+    def _map_hash_arr(self, count: int):
+        """Memory-map the first ``count`` slots of the packed hash file."""
+        if count == 0:
+            # Zero-length files can't be mapped
+            self._hash_arr = np.empty(0, dtype=np.uint64)
+        else:
+            self._hash_arr = np.memmap(self._hash_arr_path, dtype=np.uint64, mode="r", shape=(count,))
 
     def check_exif(self, image: Image.Image) -> ExifData:
         """Extract and analyze EXIF metadata from image.
@@ -66,15 +361,16 @@ class AuthenticityService:
             ExifData with metadata and anomalies
         """
         try:
-            exif_data = image._getexif()
-            if not exif_data:
+            # No raw EXIF block attached - skip parsing entirely
+            if not image.info.get("exif"):
                 return ExifData(present=False)
 
-            # Extract common EXIF fields
-            exif_dict = {}
-            for tag_id, value in exif_data.items():
-                tag = TAGS.get(tag_id, tag_id)
-                exif_dict[tag] = value
+            ifd0 = image.getexif()
+            if not ifd0 and not ifd0.get_ifd(IFD.Exif):
+                return ExifData(present=False)
+
+            # Extract only the EXIF fields we analyze
+            exif_dict = {name: ifd0[tag] for name, tag in _EXIF_FIELDS.items() if tag in ifd0}
 
             # Check for anomalies
             anomalies = []
@@ -85,7 +381,7 @@ class AuthenticityService:
 
             # Check for software watermark
             software = exif_dict.get("Software", "")
-            if any(ai_tool in software.lower() for ai_tool in ["midjourney", "stable diffusion", "dall-e", "photoshop"]):
+            if self._AI_SOFTWARE_RE.search(software):
                 anomalies.append(f"AI/editing software detected: {software}")
 
             # Check for future dates
@@ -115,16 +411,42 @@ class AuthenticityService:
         except Exception as e:
             return ExifData(present=False)
 
-    def compute_phash(self, image: Image.Image) -> str:
+    def compute_phash(self, image: Image.Image, content_sha: Optional[bytes] = None) -> str:
         """Compute perceptual hash of image.
 
         Args:
             image: PIL Image object
+            content_sha: Optional SHA-256 digest of the file the image was
+                decoded from; when given, the hash is memoized in memory and
+                in the corpus database so repeat uploads skip the DCT
 
         Returns:
             Hex string of perceptual hash
         """
-        return str(imagehash.phash(image))
+        if content_sha is None:
+            return f"{_phash(image):016x}"
+
+        phash_value = self._phash_memo.get(content_sha)
+        if phash_value is not None:
+            return phash_value
+
+        row = self._conn.execute(
+            "SELECT h FROM phash_memo WHERE content_sha = ?", (content_sha,)
+        ).fetchone()
+        if row is not None:
+            phash_int = row[0] & 0xFFFFFFFFFFFFFFFF
+        else:
+            phash_int = _phash(image)
+            with self._write_lock:
+                with self._conn:
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO phash_memo (content_sha, h) VALUES (?, ?)",
+                        (content_sha, _to_signed64(phash_int))
+                    )
+
+        phash_value = f"{phash_int:016x}"
+        self._phash_memo[content_sha] = phash_value
+        return phash_value
 
     def check_duplicates(self, phash_value: str, threshold: int = 5) -> PHashResult:
         """Check for duplicate/similar images in corpus.
@@ -139,20 +461,20 @@ class AuthenticityService:
         duplicates = []
         similarities = []
 
-        phash_obj = imagehash.hex_to_hash(phash_value)
+        hash_arr = self._hash_arr
+        indices, distances = _hamming_matches(hash_arr, int(phash_value, 16), threshold)
 
-        for stored_file, stored_hash in self._hash_db.items():
-            stored_hash_obj = imagehash.hex_to_hash(stored_hash)
-            distance = phash_obj - stored_hash_obj
+        # Resolve file names for the hits only; slot i is rowid i + 1
+        files = self._files_for_rowids([idx + 1 for idx in indices.tolist()])
 
-            if distance <= threshold:
-                similarity = 1.0 - (distance / 64.0)  # Normalize to 0-1
-                duplicates.append({
-                    "file": stored_file,
-                    "hash": stored_hash,
-                    "hamming_distance": int(distance)
-                })
-                similarities.append(similarity)
+        for idx, distance in zip(indices.tolist(), distances.tolist()):
+            stored_file = files[idx + 1]
+            duplicates.append({
+                "file": stored_file,
+                "hash": f"{int(hash_arr[idx]):016x}",
+                "hamming_distance": distance
+            })
+            similarities.append(1.0 - (distance / 64.0))  # Normalize to 0-1
 
         return PHashResult(
             hash_value=phash_value,
@@ -160,6 +482,17 @@ class AuthenticityService:
             similarity_scores=similarities
         )
 
+    def _files_for_rowids(self, rowids: List[int]) -> dict:
+        """Look up corpus file names by rowid, in chunks below SQLite's bound-parameter limit."""
+        files = {}
+        for start in range(0, len(rowids), 500):
+            chunk = rowids[start:start + 500]
+            files.update(self._conn.execute(
+                f"SELECT rowid, file FROM phash WHERE rowid IN ({','.join('?' * len(chunk))})",
+                chunk
+            ))
+        return files
+
     def add_to_corpus(self, filename: str, image: Image.Image):
         """Add image hash to corpus database.
 
@@ -167,16 +500,40 @@ class AuthenticityService:
             filename: Name of file to store
             image: PIL Image object
         """
-        phash_value = self.compute_phash(image)
-        self._hash_db[filename] = phash_value
-        self._save_hash_db()
-
-    def ela_analysis(self, image: Image.Image, quality: int = 95) -> ELAResult:
+        phash_int = _phash(image)
+
+        with self._write_lock:
+            # The marker spans the slot write and the commit; if either is
+            # interrupted, the next load finds it and rebuilds from SQLite
+            self._hash_arr_dirty_path.touch()
+            with self._conn:
+                # Upsert rather than INSERT OR REPLACE so an existing file keeps its rowid (array slot)
+                self._conn.execute(
+                    "INSERT INTO phash (file, h) VALUES (?, ?) "
+                    "ON CONFLICT (file) DO UPDATE SET h = excluded.h",
+                    (filename, _to_signed64(phash_int))
+                )
+                (rowid,) = self._conn.execute(
+                    "SELECT rowid FROM phash WHERE file = ?", (filename,)
+                ).fetchone()
+
+                with open(self._hash_arr_path, "r+b" if self._hash_arr_path.exists() else "wb") as f:
+                    f.seek((rowid - 1) * 8)
+                    f.write(np.uint64(phash_int).tobytes())
+            self._hash_arr_dirty_path.unlink()
+
+            if rowid > len(self._hash_arr):
+                self._map_hash_arr(rowid)
+
+    def ela_analysis(
+        self, image: Image.Image, quality: int = 95, rgb: Optional[np.ndarray] = None
+    ) -> ELAResult:
         """Perform Error Level Analysis to detect tampering.
 
         Args:
             image: PIL Image object
             quality: JPEG quality for recompression
+            rgb: Optional precomputed RGB uint8 array of ``image``
 
         Returns:
             ELAResult with tampering indicators
@@ -186,21 +543,10 @@ class AuthenticityService:
             if image.mode != "RGB":
                 image = image.convert("RGB")
 
-            # Save at specified quality
-            buffer = io.BytesIO()
-            image.save(buffer, "JPEG", quality=quality)
-            buffer.seek(0)
-            resaved_image = Image.open(buffer)
-
-            # Compute difference
-            original_array = np.array(image, dtype=np.float32)
-            resaved_array = np.array(resaved_image, dtype=np.float32)
-
-            diff = np.abs(original_array - resaved_array)
-
-            # Calculate statistics
-            mean_score = float(np.mean(diff))
-            variance = float(np.var(diff))
+            # Recompress at specified quality and compare uint8 pixel data
+            original_array = rgb if rgb is not None else np.asarray(image)
+            resaved_array = _jpeg_roundtrip(image, original_array, quality)
+            mean_score, variance = _ela_stats(original_array, resaved_array)
 
             # Threshold-based anomaly detection
             # Higher mean and variance suggest tampering
@@ -243,100 +589,90 @@ class AuthenticityService:
 
             logger.info("Starting reverse image search...")
 
-            # Convert PIL image to bytes
-            img_byte_arr = io.BytesIO()
-            image.save(img_byte_arr, format='PNG')
-            img_byte_arr.seek(0)
-            content = img_byte_arr.read()
-
-            logger.info(f"Image converted to bytes: {len(content)} bytes")
-
             # Create Vision API client
             client = vision.ImageAnnotatorClient()
-            vision_image = vision.Image(content=content)
+            vision_image = vision.Image(content=_vision_upload_bytes(image))
 
             logger.info("Calling Google Vision API web_detection...")
 
             # Perform web detection
             response = client.web_detection(image=vision_image)
-            web_detection = response.web_detection
-
-            logger.info(f"API response received: full_matching={len(web_detection.full_matching_images)}, partial={len(web_detection.partial_matching_images)}, pages={len(web_detection.pages_with_matching_images)}")
+            if response.error.message:
+                logger.error(f"Vision API error in reverse_image_search: {response.error.message}")
+                return _no_reverse_matches()
 
-            exact_matches = []
-            partial_matches = []
-
-            # Process full matching images
-            if web_detection.full_matching_images:
-                for match in web_detection.full_matching_images[:5]:
-                    exact_matches.append(ReverseImageMatch(
-                        url=match.url,
-                        page_title="",
-                        source="Google Vision - Full Match"
-                    ))
-
-            # Process partial matching images
-            if web_detection.partial_matching_images:
-                for match in web_detection.partial_matching_images[:5]:
-                    partial_matches.append(ReverseImageMatch(
-                        url=match.url,
-                        page_title="",
-                        source="Google Vision - Partial Match"
-                    ))
-
-            # Process pages with matching images
-            if web_detection.pages_with_matching_images:
-                for page in web_detection.pages_with_matching_images[:5]:
-                    if page.url not in [m.url for m in exact_matches + partial_matches]:
-                        partial_matches.append(ReverseImageMatch(
-                            url=page.url,
-                            page_title=page.page_title if hasattr(page, 'page_title') else "",
-                            source="Google Vision - Page Match"
-                        ))
-
-            total_matches = len(exact_matches) + len(partial_matches)
-
-            # Determine risk level
-            if total_matches == 0:
-                risk = "Low"
-            elif total_matches <= 3:
-                risk = "Med"
-            else:
-                risk = "High"
-
-            return ReverseImageSearchResult(
-                exact_matches=exact_matches,
-                partial_matches=partial_matches,
-                total_matches=total_matches,
-                authenticity_risk=risk
-            )
+            return self._web_detection_result(response.web_detection)
 
         except ImportError as e:
             # Google Cloud Vision not installed
             logger.error(f"ImportError in reverse_image_search: {e}")
-            return ReverseImageSearchResult(
-                exact_matches=[],
-                partial_matches=[],
-                total_matches=0,
-                authenticity_risk="Low"
-            )
+            return _no_reverse_matches()
         except Exception as e:
             # API error or credentials not configured
             # Fail gracefully - don't break the whole analysis
             logger.error(f"Exception in reverse_image_search: {type(e).__name__}: {e}")
-            return ReverseImageSearchResult(
-                exact_matches=[],
-                partial_matches=[],
-                total_matches=0,
-                authenticity_risk="Low"
-            )
+            return _no_reverse_matches()
+
+    @staticmethod
+    def _web_detection_result(web_detection) -> ReverseImageSearchResult:
+        """Convert a Vision API WebDetection into a ReverseImageSearchResult."""
+        exact_matches = []
+        partial_matches = []
+
+        # Process full matching images
+        if web_detection.full_matching_images:
+            for match in web_detection.full_matching_images[:5]:
+                exact_matches.append(ReverseImageMatch(
+                    url=match.url,
+                    page_title="",
+                    source="Google Vision - Full Match"
+                ))
+
+        # Process partial matching images
+        if web_detection.partial_matching_images:
+            for match in web_detection.partial_matching_images[:5]:
+                partial_matches.append(ReverseImageMatch(
+                    url=match.url,
+                    page_title="",
+                    source="Google Vision - Partial Match"
+                ))
+
+        # Process pages with matching images
+        if web_detection.pages_with_matching_images:
+            for page in web_detection.pages_with_matching_images[:5]:
+                if page.url not in [m.url for m in exact_matches + partial_matches]:
+                    partial_matches.append(ReverseImageMatch(
+                        url=page.url,
+                        page_title=page.page_title if hasattr(page, 'page_title') else "",
+                        source="Google Vision - Page Match"
+                    ))
+
+        total_matches = len(exact_matches) + len(partial_matches)
+
+        # Determine risk level
+        if total_matches == 0:
+            risk = "Low"
+        elif total_matches <= 3:
+            risk = "Med"
+        else:
+            risk = "High"
 
-    def ai_generation_heuristic(self, image: Image.Image, exif: ExifData) -> AIGenerationHeuristic:
+        return ReverseImageSearchResult(
+            exact_matches=exact_matches,
+            partial_matches=partial_matches,
+            total_matches=total_matches,
+            authenticity_risk=risk
+        )
+
+    def ai_generation_heuristic(
+        self, image: Image.Image, exif: ExifData, rgb: Optional[np.ndarray] = None
+    ) -> AIGenerationHeuristic:
         """Lightweight AI generation detection heuristic.
 
         Args:
             image: PIL Image object
             exif: EXIF data
+            rgb: Optional precomputed RGB uint8 array of ``image``
 
         Returns:
             AIGenerationHeuristic with likelihood and indicators
@@ -358,10 +694,10 @@ class AuthenticityService:
 
         # Check 3: Uniform noise pattern (simple check)
         try:
-            # Convert to grayscale and check noise
-            gray = image.convert("L")
-            img_array = np.array(gray)
-            noise = np.std(img_array)
+            # Check noise on an integer luma approximation of the RGB pixels
+            if rgb is None:
+                rgb = _rgb_array(image)
+            noise = _luma_std(rgb)
 
             if noise < 5:  # Very low noise - suspicious
                 indicators.append("Unusually low noise (< 5)")
@@ -383,30 +719,41 @@ class AuthenticityService:
             confidence=confidence
         )
 
-    def check_authenticity(self, image: Image.Image) -> AuthenticityCheck:
+    def check_authenticity(self, image: Image.Image, content: Optional[bytes] = None) -> AuthenticityCheck:
         """Perform comprehensive authenticity check.
 
         Args:
             image: PIL Image object
+            content: Optional raw bytes of the uploaded file the image was
+                taken from, used to memoize the perceptual hash
 
         Returns:
             AuthenticityCheck with all results
         """
+        # Reverse image search runs in a worker thread while the local checks run.
+        # The worker gets its own copy: Image.save keeps per-call encoder settings
+        # on the image object, so concurrent saves of one image would race.
+        image.load()
+        reverse_search_future = self._search_executor.submit(self.reverse_image_search, image.copy())
+
         # EXIF check
         exif = self.check_exif(image)
 
         # pHash and duplicate check
-        phash_value = self.compute_phash(image)
+        content_sha = hashlib.sha256(content).digest() if content is not None else None
+        phash_value = self.compute_phash(image, content_sha)
         phash_result = self.check_duplicates(phash_value)
 
-        # ELA tampering detection
-        ela = self.ela_analysis(image)
+        # Decode RGB pixels once for the pixel-level checks
+        rgb = _rgb_array(image)
 
-        # Reverse image search (placeholder)
-        reverse_search = self.reverse_image_search(image)
+        # ELA tampering detection
+        ela = self.ela_analysis(image, rgb=rgb)
 
         # AI generation heuristic
-        ai_gen = self.ai_generation_heuristic(image, exif)
+        ai_gen = self.ai_generation_heuristic(image, exif, rgb)
+
+        reverse_search = reverse_search_future.result()
 
         return AuthenticityCheck(
             exif=exif,
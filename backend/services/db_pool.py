@@ -0,0 +1,53 @@
+"""
+Shared asyncpg connection pool for services that query PostgreSQL directly.
+Connections are opened once and reused, so queries skip TCP/TLS/auth setup.
+"""
+import asyncio
+from typing import Any, Optional
+
+from backend.core.config import settings
+from backend.core.observability import get_logger
+
+logger = get_logger(__name__)
+
+_pool: Optional[Any] = None
+_pool_lock: Optional[asyncio.Lock] = None
+
+
+async def get_pool() -> Any:
+    """
+    Return the process-wide asyncpg pool, creating it on first use.
+
+    Returns:
+        asyncpg.Pool
+    """
+    global _pool, _pool_lock
+    if _pool is not None:
+        return _pool
+
+    if _pool_lock is None:
+        _pool_lock = asyncio.Lock()
+    async with _pool_lock:
+        if _pool is None:
+            import asyncpg
+
+            _pool = await asyncpg.create_pool(
+                dsn=settings.database_url,
+                min_size=settings.database_pool_min_size,
+                max_size=settings.database_pool_size,
+                max_inactive_connection_lifetime=settings.database_pool_max_inactive_seconds,
+                statement_cache_size=settings.database_statement_cache_size,
+            )
+            logger.info(
+                "database_pool_created - min_size=%s, max_size=%s",
+                settings.database_pool_min_size, settings.database_pool_size
+            )
+    return _pool
+
+
+async def close_pool() -> None:
+    """Close the shared pool, if it was ever created. Call on application shutdown."""
+    global _pool
+    if _pool is not None:
+        await _pool.close()
+        _pool = None
@@ -3,11 +3,16 @@ Document processing service for text extraction and format analysis.
 """
 
 import io
+import multiprocessing
+import os
 import re
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from typing import BinaryIO, Optional
 
-import pdfplumber
+import pypdfium2 as pdfium
 import pytesseract
 import yaml
 from docx import Document
@@ -20,6 +25,103 @@ except ModuleNotFoundError:
     from models.document import FormatAnalysisResult
 
 
+try:
+    # Optional: in-process Tesseract API, avoids one tesseract subprocess per image
+    from tesserocr import OEM, PSM, PyTessBaseAPI
+except ImportError:
+    PyTessBaseAPI = None
+
+
+# libyaml-backed loader when PyYAML was built with it
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+# Lines that can be headers: stripped length under 50, or no ASCII lowercase
+# letters (a prerequisite for str.isupper). Rules are applied per match.
+_HEADER_CANDIDATE_RE = re.compile(r"^[^\S\n]*\S(?:[^\n]{0,48}?[^\S\n]*|[^a-z\n]*)$", re.M)
+
+
+# Spell-check candidate tokens (applied to lowercased text)
+_WORD_RE = re.compile(r"\b[a-z]+\b")
+
+
+_tess_local = threading.local()
+
+
+def _ocr_image(image: Image.Image) -> str:
+    """OCR a PIL image.
+
+    Uses a persistent tesserocr API per thread when tesserocr is installed,
+    otherwise falls back to pytesseract (one tesseract process per call).
+    """
+    if PyTessBaseAPI is None:
+        return pytesseract.image_to_string(image)
+
+    api = getattr(_tess_local, "api", None)
+    if api is None:
+        api = PyTessBaseAPI(psm=PSM.AUTO, oem=OEM.LSTM_ONLY)
+        _tess_local.api = api
+    api.SetImage(image)
+    return api.GetUTF8Text()
+
+
+def _ocr_pdf_page(source: bytes | str, page_index: int) -> str:
+    """Render one PDF page at 300 DPI and OCR it.
+
+    Module-level so it can run in a worker process, where ``source`` is the
+    path of a temporary copy of the PDF. Returns an empty string if
+    rendering or OCR fails.
+    """
+    try:
+        pdf = pdfium.PdfDocument(source)
+        try:
+            image = pdf[page_index].render(scale=300 / 72).to_pil()
+        finally:
+            pdf.close()
+        return _ocr_image(image)
+    except Exception:
+        return ""
+
+
+_ocr_pool: Optional[ProcessPoolExecutor] = None
+_ocr_pool_lock = threading.Lock()
+
+
+def _get_ocr_pool() -> ProcessPoolExecutor:
+    """Return the shared OCR worker pool, creating it on first use.
+
+    Workers start from a forkserver rather than forking the (multithreaded)
+    server process, and are reused across requests.
+    """
+    global _ocr_pool
+    if _ocr_pool is None:
+        with _ocr_pool_lock:
+            if _ocr_pool is None:
+                _ocr_pool = ProcessPoolExecutor(
+                    max_workers=max(1, (os.cpu_count() or 2) // 2),
+                    mp_context=multiprocessing.get_context("forkserver"),
+                )
+    return _ocr_pool
+
+
+def shutdown_ocr_pool() -> None:
+    """Stop the OCR worker pool, if it was ever started. Call on application shutdown."""
+    global _ocr_pool
+    with _ocr_pool_lock:
+        pool, _ocr_pool = _ocr_pool, None
+    if pool is not None:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+def _pdf_page_text(page: pdfium.PdfPage) -> str:
+    """Extract the text layer of a PDF page with '\n' line endings."""
+    textpage = page.get_textpage()
+    try:
+        return textpage.get_text_range().replace("\r\n", "\n")
+    finally:
+        textpage.close()
+
+
 class DocumentService:
     """Service for extracting text from documents and analyzing format."""
 
@@ -31,7 +133,16 @@ class DocumentService:
         """
         self.templates_dir = Path(templates_dir)
         self.spell_checker = SpellChecker()
+        # Dictionary snapshot for C-level set difference in _check_spelling
+        self._known_words = frozenset(self.spell_checker.word_frequency.dictionary)
         self._template_cache: dict[str, dict] = {}
+        # Lowercased required sections per cached template, paired with the originals
+        self._required_lower_cache: dict[str, tuple[tuple[str, str], ...]] = {}
+        # Parsed YAML files keyed by doc type, with the mtime they were read at
+        self._template_files: dict[str, tuple[float, dict]] = {}
+        if self.templates_dir.exists():
+            for template_path in self.templates_dir.glob("*.yaml"):
+                self._read_template_file(template_path.stem)
 
     def extract_text(self, file_content: bytes, file_type: str) -> str:
         """Extract text from document based on file type.
@@ -58,28 +169,34 @@ class DocumentService:
             raise ValueError(f"Unsupported file type: {file_type}")
 
     def _extract_from_pdf(self, content: bytes) -> str:
-        """Extract text from PDF using pdfplumber.
+        """Extract text from PDF using PDFium.
 
-        Falls back to OCR if no text is found (scanned PDFs).
+        Falls back to OCR if no text is found (scanned PDFs). Pages that
+        need OCR are processed in parallel worker processes.
         """
-        text_parts = []
-        with pdfplumber.open(io.BytesIO(content)) as pdf:
-            for page in pdf.pages:
-                page_text = page.extract_text()
-                if page_text and page_text.strip():
-                    text_parts.append(page_text)
-                else:
-                    # No text found - try OCR on page image
-                    try:
-                        img = page.to_image(resolution=300)
-                        pil_image = img.original
-                        ocr_text = pytesseract.image_to_string(pil_image)
-                        if ocr_text and ocr_text.strip():
-                            text_parts.append(ocr_text)
-                    except Exception as e:
-                        # If OCR fails, continue with next page
-                        pass
-        return "\n\n".join(text_parts)
+        pdf = pdfium.PdfDocument(content)
+        try:
+            page_texts = [_pdf_page_text(page) for page in pdf]
+        finally:
+            pdf.close()
+
+        # No text found on these pages - OCR the page images instead
+        ocr_pages = [i for i, text in enumerate(page_texts) if not (text and text.strip())]
+        if len(ocr_pages) == 1:
+            page_texts[ocr_pages[0]] = _ocr_pdf_page(content, ocr_pages[0])
+        elif ocr_pages:
+            # Workers read the PDF from a temp file instead of each page's task
+            # pickling the full document bytes
+            with tempfile.NamedTemporaryFile(suffix=".pdf") as pdf_file:
+                pdf_file.write(content)
+                pdf_file.flush()
+                ocr_texts = _get_ocr_pool().map(
+                    _ocr_pdf_page, [pdf_file.name] * len(ocr_pages), ocr_pages
+                )
+                for page_index, ocr_text in zip(ocr_pages, ocr_texts):
+                    page_texts[page_index] = ocr_text
+
+        return "\n\n".join(text for text in page_texts if text and text.strip())
 
     def _extract_from_docx(self, content: bytes) -> str:
         """Extract text from DOCX using python-docx."""
@@ -90,7 +207,7 @@ class DocumentService:
     def _extract_from_image(self, content: bytes) -> str:
         """Extract text from image using pytesseract OCR."""
         image = Image.open(io.BytesIO(content))
-        text = pytesseract.image_to_string(image)
+        text = _ocr_image(image)
         return text.strip()
 
     def get_images_from_content(self, file_content: bytes, file_type: str) -> list[Image.Image]:
@@ -117,15 +234,16 @@ class DocumentService:
         elif file_type == "pdf":
             # Extract images from PDF pages
             try:
-                with pdfplumber.open(io.BytesIO(file_content)) as pdf:
-                    for page in pdf.pages:
+                pdf = pdfium.PdfDocument(file_content)
+                try:
+                    for page in pdf:
                         try:
-                            # Convert page to image
-                            img = page.to_image(resolution=150)
-                            pil_image = img.original
-                            images.append(pil_image)
+                            # Convert page to image at 150 DPI
+                            images.append(page.render(scale=150 / 72).to_pil())
                         except:
                             pass
+                finally:
+                    pdf.close()
             except:
                 pass
 
@@ -142,11 +260,8 @@ class DocumentService:
             Template configuration dictionary
         """
         cache_key = f"{doc_type}:{subtype}" if subtype else doc_type
-        if cache_key in self._template_cache:
-            return self._template_cache[cache_key]
-
-        template_path = self.templates_dir / f"{doc_type}.yaml"
-        if not template_path.exists():
+        template_data = self._read_template_file(doc_type)
+        if template_data is None:
             # Return default template if specific one doesn't exist
             return {
                 "required_headers": [],
@@ -158,18 +273,61 @@ class DocumentService:
                 }
             }
 
-        with open(template_path, "r") as f:
-            template_data = yaml.safe_load(f)
+        if cache_key in self._template_cache:
+            return self._template_cache[cache_key]
+
+        # If subtype specified, extract that specific config
+        if subtype and subtype in template_data:
+            template = template_data[subtype]
+        else:
+            # Use the whole template for backwards compatibility
+            template = template_data
+
+        self._template_cache[cache_key] = template
+        self._required_lower_cache[cache_key] = self._lower_required_sections(template)
+        return template
 
-            # If subtype specified, extract that specific config
-            if subtype and subtype in template_data:
-                template = template_data[subtype]
-            else:
-                # Use the whole template for backwards compatibility
-                template = template_data
+    def _read_template_file(self, doc_type: str) -> Optional[dict]:
+        """Return the parsed YAML file for a document type, re-reading it only when its mtime changes.
+
+        Args:
+            doc_type: Document type (YAML file stem)
 
-            self._template_cache[cache_key] = template
-            return template
+        Returns:
+            Parsed template file, or None if it doesn't exist
+        """
+        template_path = self.templates_dir / f"{doc_type}.yaml"
+        try:
+            mtime = template_path.stat().st_mtime
+        except FileNotFoundError:
+            if self._template_files.pop(doc_type, None) is not None:
+                self._evict_templates(doc_type)
+            return None
+
+        cached = self._template_files.get(doc_type)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+
+        with open(template_path, "r") as f:
+            template_data = yaml.load(f, Loader=_YAML_LOADER)
+
+        if cached is not None:
+            self._evict_templates(doc_type)
+        self._template_files[doc_type] = (mtime, template_data)
+        return template_data
+
+    def _evict_templates(self, doc_type: str) -> None:
+        """Drop cached templates derived from a document type's YAML file."""
+        prefix = f"{doc_type}:"
+        for cache_key in [key for key in self._template_cache if key == doc_type or key.startswith(prefix)]:
+            del self._template_cache[cache_key]
+            self._required_lower_cache.pop(cache_key, None)
+
+    @staticmethod
+    def _lower_required_sections(template: dict) -> tuple[tuple[str, str], ...]:
+        """Pair each required section of a template with its lowercased form."""
+        required_sections = template.get("required_headers", template.get("required_sections", []))
+        return tuple((required, required.lower()) for required in required_sections)
 
     def analyze_format(self, text: str, doc_type: str, subtype: Optional[str] = None, include_text: bool = False) -> FormatAnalysisResult:
         """Analyze document format against template.
@@ -198,8 +356,12 @@ class DocumentService:
 
         # Header/section analysis - support both old and new format
         headers_found = self._find_headers(text)
-        required_sections = template.get("required_headers", template.get("required_sections", []))
-        missing_sections = self._find_missing_sections(headers_found, required_sections)
+        cache_key = f"{doc_type}:{subtype}" if subtype else doc_type
+        required_lower = self._required_lower_cache.get(cache_key)
+        if required_lower is None:
+            required_lower = self._lower_required_sections(template)
+        required_sections = [required for required, _ in required_lower]
+        missing_sections = self._find_missing_sections(headers_found, required_lower)
 
         # Section coverage
         if required_sections:
@@ -225,12 +387,13 @@ class DocumentService:
             Tuple of (error_rate, list of misspelled words)
         """
         # Extract words and filter out non-alphabetic
-        words = re.findall(r'\b[a-zA-Z]+\b', text.lower())
+        words = _WORD_RE.findall(text.lower())
         if not words:
             return 0.0, []
 
-        # Check spelling
-        misspelled = list(self.spell_checker.unknown(words))
+        # Check spelling; only words outside the dictionary go through SpellChecker's
+        # own filtering (numbers like "inf", over-long tokens)
+        misspelled = list(self.spell_checker.unknown(set(words) - self._known_words))
         error_rate = len(misspelled) / len(words) if words else 0.0
 
         return error_rate, misspelled
@@ -255,12 +418,10 @@ class DocumentService:
         - Short lines (< 50 chars) that are title-cased
         """
         headers = []
-        lines = text.split("\n")
 
-        for line in lines:
-            line = line.strip()
-            if not line:
-                continue
+        # Long lines with lowercase letters can't match any rule; skip them in the regex scan
+        for match in _HEADER_CANDIDATE_RE.finditer(text):
+            line = match.group().strip()
 
             # All caps lines (at least 3 chars)
             if len(line) >= 3 and line.isupper() and not line.isdigit():
@@ -280,19 +441,30 @@ class DocumentService:
 
         return headers
 
-    def _find_missing_sections(self, headers_found: list[str], required_sections: list[str]) -> list[str]:
+    def _find_missing_sections(
+        self,
+        headers_found: list[str],
+        required_sections: tuple[tuple[str, str], ...]
+    ) -> list[str]:
         """Find which required sections are missing.
 
         Uses fuzzy matching (case-insensitive, partial match).
+
+        Args:
+            headers_found: Headers detected in the document
+            required_sections: (section, lowercased section) pairs from the template
         """
         headers_lower = [h.lower() for h in headers_found]
+        # One newline-joined haystack answers "does any header contain the
+        # section name" with a single substring scan per section
+        headers_text = "\n".join(headers_lower)
         missing = []
 
-        for required in required_sections:
-            required_lower = required.lower()
-            # Check if any found header contains the required section name
-            found = any(required_lower in header or header in required_lower
-                       for header in headers_lower)
+        for required, required_lower in required_sections:
+            found = bool(headers_lower) and (
+                required_lower in headers_text
+                or any(header in required_lower for header in headers_lower)
+            )
             if not found:
                 missing.append(required)
 
@@ -321,13 +493,10 @@ class DocumentService:
         Returns:
             List of subtype names (e.g., ['msa', 'sow', 'nda'])
         """
-        template_path = self.templates_dir / f"{doc_type}.yaml"
-        if not template_path.exists():
+        template_data = self._read_template_file(doc_type)
+        if template_data is None:
             return []
 
-        with open(template_path, "r") as f:
-            template_data = yaml.safe_load(f)
-
         # Find keys that don't start with underscore (those are subtypes)
         subtypes = [key for key in template_data.keys() if not key.startswith("_")]
         return sorted(subtypes)
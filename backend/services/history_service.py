@@ -2,8 +2,11 @@
 Service for interfacing with feature 001 (payment history analysis).
 Provides access to historical transaction data for pattern detection.
 """
-from typing import List, Optional
-from datetime import datetime
+from dataclasses import dataclass
+from typing import Mapping, Optional, Sequence
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
 
 try:
     # Try backend-prefixed imports first (running from parent directory)
@@ -16,34 +19,105 @@ except ModuleNotFoundError:
 
 logger = get_logger(__name__)
 
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+# Oldest first, so PaymentHistoryBatch.dates is already sorted
+GET_PAYMENT_HISTORY_SQL = """
+    SELECT transaction_id, originator_account, beneficiary_account,
+           amount, currency, transaction_date
+    FROM payment_history
+    WHERE (originator_account = $1 OR beneficiary_account = $2)
+    AND transaction_date >= NOW() - make_interval(days => $3)
+    ORDER BY transaction_date ASC
+"""
+
+# Velocity statistics aggregated in the database: days between consecutive
+# transactions (mean / sample std) and the count over the last 7 days
+GET_VELOCITY_METRICS_SQL = """
+    SELECT
+        COALESCE(AVG(gap_days), 0)::float8 AS mean_frequency,
+        COALESCE(STDDEV_SAMP(gap_days), 0)::float8 AS std_frequency,
+        COUNT(*) FILTER (WHERE transaction_date >= NOW() - INTERVAL '7 days') AS recent_frequency
+    FROM (
+        SELECT
+            transaction_date,
+            EXTRACT(EPOCH FROM transaction_date - LAG(transaction_date) OVER (ORDER BY transaction_date)) / 86400
+                AS gap_days
+        FROM payment_history
+        WHERE (originator_account = $1 OR beneficiary_account = $1)
+        AND transaction_date >= NOW() - make_interval(days => $2)
+    ) gaps
+"""
+
+
+def _epoch_ns(value: datetime) -> int:
+    """Nanoseconds since the Unix epoch; naive datetimes are taken as UTC."""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return (value - _EPOCH) // timedelta(microseconds=1) * 1000
+
 
-class HistoricalTransaction:
+@dataclass(frozen=True)
+class PaymentHistoryBatch:
     """
-    Represents a historical transaction from feature 001.
-    
-    This is a simplified representation for Phase 2.
-    Full implementation will query the payment_history table.
+    Payment history as parallel NumPy columns (one entry per transaction).
+
+    Accounts and currencies are stored as integer codes into the
+    ``accounts`` / ``currencies`` lookup arrays, and dates as int64
+    nanoseconds since the epoch in ascending order, so callers work on
+    whole columns without a Python object per row.
     """
-    
-    def __init__(
-        self,
-        transaction_id: str,
-        originator_account: str,
-        beneficiary_account: str,
-        amount: float,
-        currency: str,
-        transaction_date: datetime,
-        originator_country: str,
-        beneficiary_country: str
-    ):
-        self.transaction_id = transaction_id
-        self.originator_account = originator_account
-        self.beneficiary_account = beneficiary_account
-        self.amount = amount
-        self.currency = currency
-        self.transaction_date = transaction_date
-        self.originator_country = originator_country
-        self.beneficiary_country = beneficiary_country
+
+    transaction_ids: np.ndarray
+    amounts: np.ndarray
+    dates: np.ndarray
+    originator_codes: np.ndarray
+    beneficiary_codes: np.ndarray
+    currency_codes: np.ndarray
+    accounts: np.ndarray
+    currencies: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.dates)
+
+    @classmethod
+    def empty(cls) -> "PaymentHistoryBatch":
+        return cls.from_records([])
+
+    @classmethod
+    def from_records(cls, records: Sequence[Mapping]) -> "PaymentHistoryBatch":
+        """
+        Build a batch from payment_history rows (asyncpg Records or dicts).
+
+        Args:
+            records: Rows with the GET_PAYMENT_HISTORY_SQL columns
+
+        Returns:
+            PaymentHistoryBatch sorted by transaction date
+        """
+        n = len(records)
+        dates = np.fromiter((_epoch_ns(r["transaction_date"]) for r in records), dtype=np.int64, count=n)
+        order = np.argsort(dates, kind="stable")
+
+        parties = np.array(
+            [r["originator_account"] for r in records] + [r["beneficiary_account"] for r in records],
+            dtype=object,
+        )
+        accounts, party_codes = np.unique(parties, return_inverse=True)
+        currencies, currency_codes = np.unique(
+            np.array([r["currency"] for r in records], dtype=object), return_inverse=True
+        )
+
+        return cls(
+            transaction_ids=np.array([str(r["transaction_id"]) for r in records], dtype=object)[order],
+            amounts=np.fromiter((float(r["amount"]) for r in records), dtype=np.float64, count=n)[order],
+            dates=dates[order],
+            originator_codes=party_codes[:n].astype(np.int32)[order],
+            beneficiary_codes=party_codes[n:].astype(np.int32)[order],
+            currency_codes=currency_codes.astype(np.int32)[order],
+            accounts=accounts,
+            currencies=currencies,
+        )
 
 
 class HistoryService:
@@ -56,13 +130,17 @@ class HistoryService:
     
     def __init__(self):
         self.logger = logger
+        # Once wired up, queries run on the shared asyncpg pool
+        # (services.db_pool.get_pool). Each pooled connection keeps an LRU of
+        # prepared statements keyed by SQL text, so the module-level queries
+        # are parsed and planned once per connection.
     
     async def get_payment_history(
         self,
         payer_id: Optional[str] = None,
         beneficiary_id: Optional[str] = None,
         lookback_days: int = 90
-    ) -> List[HistoricalTransaction]:
+    ) -> PaymentHistoryBatch:
         """
         Retrieve payment history for pattern analysis.
         
@@ -72,21 +150,22 @@ class HistoryService:
             lookback_days: Number of days to look back (default 90)
         
         Returns:
-            List of historical transactions
+            Columnar batch of historical transactions, oldest first
         """
         # TODO: Query payment_history table from feature 001
-        # SELECT * FROM payment_history
-        # WHERE (originator_account = ? OR beneficiary_account = ?)
-        # AND transaction_date >= NOW() - INTERVAL '? days'
-        # ORDER BY transaction_date DESC
+        # pool = await get_pool()
+        # async with pool.acquire() as conn:
+        #     rows = await conn.fetch(GET_PAYMENT_HISTORY_SQL, payer_id, beneficiary_id, lookback_days)
+        # return PaymentHistoryBatch.from_records(rows)
         
         self.logger.info(
-            f"fetching_payment_history - payer_id={payer_id}, beneficiary_id={beneficiary_id}, lookback_days={lookback_days}"
+            "fetching_payment_history - payer_id=%s, beneficiary_id=%s, lookback_days=%s",
+            payer_id, beneficiary_id, lookback_days
         )
         
-        # Placeholder: Return empty list for now
+        # Placeholder: Return empty batch for now
         # Will be implemented in Phase 3 when database connection is active
-        return []
+        return PaymentHistoryBatch.empty()
     
     async def get_transaction_count(
         self,
@@ -108,7 +187,7 @@ class HistoryService:
         # WHERE (originator_account = ? OR beneficiary_account = ?)
         # AND transaction_date >= NOW() - INTERVAL '? days'
         
-        self.logger.info(f"counting_transactions - account_number={account_number}, days={days}")
+        self.logger.info("counting_transactions - account_number=%s, days=%s", account_number, days)
         
         return 0
     
@@ -127,16 +206,16 @@ class HistoryService:
         Returns:
             Dict with mean_frequency, std_frequency, recent_frequency
         """
-        history = await self.get_payment_history(
-            payer_id=account_number,
-            beneficiary_id=account_number,
-            lookback_days=lookback_days
-        )
+        # TODO: Aggregate in payment_history instead of fetching the rows
+        # pool = await get_pool()
+        # async with pool.acquire() as conn:
+        #     row = await conn.fetchrow(GET_VELOCITY_METRICS_SQL, account_number, lookback_days)
+        # return dict(row)
         
-        # TODO: Calculate velocity statistics
-        # - Mean transaction frequency
-        # - Standard deviation
-        # - Recent frequency (last 7 days)
+        self.logger.info(
+            "calculating_velocity_metrics - account_number=%s, lookback_days=%s",
+            account_number, lookback_days
+        )
         
         return {
             "mean_frequency": 0,
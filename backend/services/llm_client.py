@@ -5,10 +5,16 @@ Provides async client for transaction analysis with retry logic.
 """
 
 import os
+import hashlib
 import logging
 import asyncio
+import random
 from typing import Any
-from groq import Groq
+
+import httpx
+import orjson
+from cachetools import TTLCache
+from groq import APIStatusError, AsyncGroq
 from groq.types.chat import ChatCompletion
 
 try:
@@ -19,11 +25,52 @@ except ModuleNotFoundError:
     from core.config import settings
 from dotenv import load_dotenv
 
+try:
+    import h2  # noqa: F401  (enables HTTP/2 in httpx)
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
 load_dotenv()
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Shared connection pool for Groq API calls
+LLM_TIMEOUT = httpx.Timeout(60.0, connect=5.0)
+LLM_POOL_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=20)
+
+# 4xx statuses that can succeed on retry; any other 4xx fails immediately
+RETRYABLE_CLIENT_STATUSES = frozenset({408, 425, 429})
+
+
+def _response_cache_key(model: str, transactions: list[dict], prompt: str) -> bytes:
+    """Digest identifying an analysis request: model, canonical transactions and prompt."""
+    digest = hashlib.blake2b(model.encode(), digest_size=16)
+    digest.update(orjson.dumps(transactions, option=orjson.OPT_SORT_KEYS, default=str))
+    digest.update(prompt.encode())
+    return digest.digest()
+
+
+def _is_retryable(error: Exception) -> bool:
+    """Whether a failed LLM call is worth retrying.
+
+    4xx responses other than timeouts and rate limits (bad request, auth,
+    schema errors) fail the same way every time.
+    """
+    if isinstance(error, APIStatusError):
+        status = error.status_code
+        return not (400 <= status < 500) or status in RETRYABLE_CLIENT_STATUSES
+    return True
+
+
+async def _close_quietly(client: AsyncGroq) -> None:
+    """Close a replaced client, logging rather than raising if its pool is already unusable."""
+    try:
+        await client.close()
+    except Exception:
+        logger.debug("Failed to close replaced Groq client", exc_info=True)
+
 
 class GroqClient:
     """
@@ -45,13 +92,69 @@ class GroqClient:
         self.api_key = api_key or os.getenv("GROQ_API_KEY")
         if not self.api_key:
             raise RuntimeError("Missing GROQ_API_KEY" )
-        self.client = Groq(api_key=self.api_key)
+        # Async SDK client over one pooled HTTP client, created lazily on the
+        # event loop that first uses it (httpx pools are loop-bound)
+        self.client: AsyncGroq | None = None
+        self._client_loop: asyncio.AbstractEventLoop | None = None
+        # Closes of clients replaced after an event-loop change, kept referenced until done
+        self._closing: set[asyncio.Task] = set()
+        # Caps concurrent requests from analyze_transactions_batch
+        self.max_in_flight = settings.llm_max_in_flight
+        self._in_flight: asyncio.Semaphore | None = None
+        # Raw JSON responses keyed by _response_cache_key; re-analysing the same
+        # request (retries, re-submissions) skips the LLM round-trip
+        self._responses: TTLCache = TTLCache(
+            maxsize=settings.llm_response_cache_size,
+            ttl=settings.llm_response_cache_ttl_seconds
+        )
+        # Requests currently in flight, so concurrent duplicates share one call
+        self._pending: dict[bytes, asyncio.Future] = {}
         self.model = os.getenv("GROQ_MODEL", "moonshotai/kimi-k2-instruct-0905")
         self.max_retries = 3
         self.initial_retry_delay = 1.0  # seconds
 
+    def _get_client(self) -> AsyncGroq:
+        """Return the async Groq client for the running event loop."""
+        loop = asyncio.get_running_loop()
+        if self.client is None or self._client_loop is not loop:
+            if self.client is not None:
+                self._close_stale_client(self.client, self._client_loop)
+            # Keep-alive connections (and their TLS sessions) are reused across analyses;
+            # with h2 installed, concurrent requests multiplex over one connection
+            http_client = httpx.AsyncClient(
+                timeout=LLM_TIMEOUT, limits=LLM_POOL_LIMITS, http2=HTTP2_AVAILABLE
+            )
+            # Retries are handled in analyze_transactions, not stacked inside the SDK
+            self.client = AsyncGroq(api_key=self.api_key, http_client=http_client, max_retries=0)
+            self._client_loop = loop
+            self._in_flight = asyncio.Semaphore(self.max_in_flight)
+            self._pending = {}
+        return self.client
+
+    def _close_stale_client(self, client: AsyncGroq, loop: asyncio.AbstractEventLoop | None) -> None:
+        """Schedule a close of a client left behind by an event-loop change.
+
+        The close runs on the client's own loop while that loop is still
+        running; otherwise it runs on the current one.
+        """
+        if loop is not None and loop.is_running() and not loop.is_closed():
+            asyncio.run_coroutine_threadsafe(_close_quietly(client), loop)
+            return
+        task = asyncio.get_running_loop().create_task(_close_quietly(client))
+        self._closing.add(task)
+        task.add_done_callback(self._closing.discard)
+
+    async def aclose(self) -> None:
+        """Close pooled connections to the Groq API. Call on application shutdown."""
+        if self._closing:
+            await asyncio.gather(*self._closing, return_exceptions=True)
+        if self.client is not None:
+            await self.client.close()
+            self.client = None
+            self._client_loop = None
+
     async def analyze_transactions(
-        self, transactions: list[dict], prompt: str
+        self, transactions: list[dict], prompt: str, use_cache: bool = True
     ) -> dict[str, Any]:
         """
         Analyze transactions using Groq LLM.
@@ -59,6 +162,7 @@ class GroqClient:
         Args:
             transactions: List of transaction records as dicts
             prompt: Formatted analysis prompt with instructions
+            use_cache: Reuse the response of an identical earlier or in-flight request
 
         Returns:
             Dict with LLM response (should conform to AnalysisResult schema)
@@ -67,7 +171,7 @@ class GroqClient:
             Exception: If API call fails after retries
             ValueError: If response is malformed
         """
-        logger.info(f"Analyzing {len(transactions)} transactions with Groq")
+        logger.info("Analyzing %d transactions with Groq", len(transactions))
 
         # Build messages array
         messages = [
@@ -79,11 +183,48 @@ class GroqClient:
             {"role": "user", "content": prompt},
         ]
 
+        self._get_client()
+        if not use_cache:
+            return orjson.loads(await self._complete(messages))
+
+        key = _response_cache_key(self.model, transactions, prompt)
+        content = self._responses.get(key)
+        if content is not None:
+            logger.info("LLM response served from cache")
+            return orjson.loads(content)
+
+        task = self._pending.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._complete(messages))
+            self._pending[key] = task
+            task.add_done_callback(lambda done: self._store_response(key, done))
+        # Each caller parses its own copy; shield so one cancelled caller
+        # doesn't cancel the request for the others
+        return orjson.loads(await asyncio.shield(task))
+
+    def _store_response(self, key: bytes, task: asyncio.Future) -> None:
+        """Done-callback for an in-flight request: cache its content if it succeeded."""
+        if self._pending.get(key) is task:
+            del self._pending[key]
+        if not task.cancelled() and task.exception() is None:
+            self._responses[key] = task.result()
+
+    async def _complete(self, messages: list[dict]) -> str:
+        """
+        Run a chat completion with retry logic.
+
+        Returns:
+            Response content, checked to be valid JSON
+
+        Raises:
+            Exception: If API call fails after retries
+        """
+        client = self._get_client()
+
         # Execute with retry logic
         for attempt in range(self.max_retries):
             try:
-                completion: ChatCompletion = await asyncio.to_thread(
-                    self.client.chat.completions.create,
+                completion: ChatCompletion = await client.chat.completions.create(
                     model=self.model,
                     messages=messages,
                     temperature=0.3,  # Lower temperature for more consistent output
@@ -93,30 +234,59 @@ class GroqClient:
                 content = completion.choices[0].message.content
                 logger.info("LLM analysis completed successfully")
 
-                # Parse JSON content
-                import json
+                # Check the content parses; non-JSON responses are retried
                 try:
-                    analysis_result = json.loads(content)
-                except json.JSONDecodeError:
+                    orjson.loads(content)
+                except orjson.JSONDecodeError:
                     logger.warning(
                         "LLM returned non-JSON response",
                         extra={"content_preview": content[:200]}
                     )
                     raise
-                return analysis_result
+                return content
 
             except Exception as e:
                 logger.warning(
-                    f"LLM API request failed (attempt {attempt + 1}/{self.max_retries}): {e}"
+                    "LLM API request failed (attempt %d/%d): %s", attempt + 1, self.max_retries, e
                 )
+                if not _is_retryable(e):
+                    logger.error("LLM API request failed with a non-retryable error")
+                    raise
                 if attempt < self.max_retries - 1:
-                    delay = self.initial_retry_delay * (2**attempt)
-                    logger.info(f"Retrying in {delay} seconds...")
+                    # Jittered exponential backoff so concurrent callers don't retry in lockstep
+                    delay = self.initial_retry_delay * (2**attempt) * (0.5 + random.random())
+                    logger.info("Retrying in %.2f seconds...", delay)
                     await asyncio.sleep(delay)
                 else:
                     logger.error("LLM API request failed after all retries")
                     raise
 
+    async def analyze_transactions_batch(
+        self, jobs: list[tuple[list[dict], str]]
+    ) -> list[dict[str, Any]]:
+        """
+        Analyze several independent transaction sets concurrently.
+
+        Requests share the pooled client (multiplexed over one connection when
+        HTTP/2 is available) and at most max_in_flight run at once.
+
+        Args:
+            jobs: (transactions, prompt) pairs, as passed to analyze_transactions
+
+        Returns:
+            One LLM response dict per job, in input order
+
+        Raises:
+            Exception: The first job failure after its retries
+        """
+        self._get_client()
+
+        async def run(transactions: list[dict], prompt: str) -> dict[str, Any]:
+            async with self._in_flight:
+                return await self.analyze_transactions(transactions, prompt)
+
+        return await asyncio.gather(*(run(transactions, prompt) for transactions, prompt in jobs))
+
 
 # Global client instance
 grok_client = GroqClient()
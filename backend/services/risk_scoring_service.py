@@ -2,7 +2,14 @@
 Risk scoring service for document validation.
 """
 
-from typing import Dict, List, Optional
+import heapq
+from dataclasses import dataclass
+from itertools import chain
+from operator import attrgetter
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+from cachetools import LRUCache
 
 try:
     from backend.models.document import (
@@ -15,104 +22,153 @@ except ModuleNotFoundError:
         RiskJustification, RiskAssessment
     )
 
+# Justifications kept on an aggregated assessment, highest severity first
+MAX_JUSTIFICATIONS = 20
+
+_severity = attrgetter("severity")
+
+# Returned for documents without an applicable authenticity check (most text documents)
+_NOT_APPLICABLE_AUTHENTICITY_RISK: tuple = (0.0, ())
+
+
+@dataclass(frozen=True, slots=True)
+class _TemplateConfig:
+    """Scoring thresholds read from a document template; field defaults apply when it omits them."""
+
+    max_spell_error: float = 0.05
+    max_tabs: int = 20
+    min_section_coverage: float = 0.7
+    # Per-missing-section severity from risk_overrides, None when the template has none
+    missing_section_severity: Optional[int] = None
+
+    @classmethod
+    def from_template(cls, template: Dict) -> "_TemplateConfig":
+        risk_overrides = template.get("risk_overrides")
+        return cls(
+            max_spell_error=template.get("spelling_error_rate_max", _DEFAULT_TEMPLATE_CONFIG.max_spell_error),
+            max_tabs=(template.get("spacing_rules") or {}).get("max_tabs", _DEFAULT_TEMPLATE_CONFIG.max_tabs),
+            missing_section_severity=risk_overrides.get("missing_section", 3) if risk_overrides else None,
+        )
+
+
+# Thresholds for an empty or missing template
+_DEFAULT_TEMPLATE_CONFIG = _TemplateConfig()
+
+
+def _spelling_justification(format_result: FormatAnalysisResult, severity: int, max_spell_error: float) -> RiskJustification:
+    return RiskJustification(
+        category="format",
+        severity=severity,
+        reason=f"Spelling error rate {format_result.spell_error_rate:.2%} exceeds threshold {max_spell_error:.2%}",
+        evidence={"spell_error_rate": format_result.spell_error_rate}
+    )
+
+
+def _double_space_justification(format_result: FormatAnalysisResult, severity: int) -> RiskJustification:
+    return RiskJustification(
+        category="format",
+        severity=severity,
+        reason=f"Found {format_result.double_space_count} double space occurrences",
+        evidence={"double_space_count": format_result.double_space_count}
+    )
+
+
+def _tab_justification(format_result: FormatAnalysisResult, severity: int, max_tabs: int) -> RiskJustification:
+    return RiskJustification(
+        category="format",
+        severity=severity,
+        reason=f"Excessive tabs ({format_result.tab_count} > {max_tabs})",
+        evidence={"tab_count": format_result.tab_count}
+    )
+
+
+def _coverage_justification(format_result: FormatAnalysisResult, severity: int) -> RiskJustification:
+    return RiskJustification(
+        category="format",
+        severity=severity,
+        reason=f"Low section coverage: {format_result.section_coverage:.0%} (missing: {', '.join(format_result.missing_sections)})",
+        evidence={
+            "section_coverage": format_result.section_coverage,
+            "missing_sections": format_result.missing_sections
+        }
+    )
+
 
 class RiskScoringService:
     """Service for calculating deterministic risk scores."""
 
-    def calculate_format_risk(
+    def __init__(self):
+        # Compiled template configs keyed by id(template). Each entry also holds
+        # the template itself, so the id can't be reused while it is cached.
+        self._template_configs: LRUCache = LRUCache(maxsize=128)
+
+    def _template_config(self, template: Dict) -> _TemplateConfig:
+        """Return the compiled scoring config for a (cached, unmodified) template dict."""
+        if not template:
+            return _DEFAULT_TEMPLATE_CONFIG
+        entry = self._template_configs.get(id(template))
+        if entry is not None and entry[0] is template:
+            return entry[1]
+        config = _TemplateConfig.from_template(template)
+        self._template_configs[id(template)] = (template, config)
+        return config
+
+    def _score_format(
         self,
         format_result: FormatAnalysisResult,
-        template: Dict
-    ) -> tuple[float, List[RiskJustification]]:
-        """Calculate risk score from format analysis.
-
-        Args:
-            format_result: Format analysis results
-            template: Document template with rules
-
-        Returns:
-            Tuple of (risk_score, justifications)
-        """
-        justifications = []
+        config: _TemplateConfig,
+        justifications: List[RiskJustification]
+    ) -> float:
+        """Score format analysis, appending justifications to ``justifications``."""
         score = 0.0
-
-        # Get formatting rules from template
-        formatting_rules = template.get("spacing_rules", {})
-        max_spell_error = template.get("spelling_error_rate_max", 0.05)
+        max_spell_error = config.max_spell_error
 
         # Check spelling error rate
         if format_result.spell_error_rate > max_spell_error:
-            severity = min(int((format_result.spell_error_rate / max_spell_error) * 10), 10)
+            severity = int((format_result.spell_error_rate / max_spell_error) * 10)
+            if severity > 10:
+                severity = 10
             score += severity * 3
-            justifications.append(RiskJustification(
-                category="format",
-                severity=severity,
-                reason=f"Spelling error rate {format_result.spell_error_rate:.2%} exceeds threshold {max_spell_error:.2%}",
-                evidence={"spell_error_rate": format_result.spell_error_rate}
-            ))
+            justifications.append(_spelling_justification(format_result, severity, max_spell_error))
 
         # Check double spaces
-        max_double_spaces = formatting_rules.get("max_double_space_ratio", 0.05)
         if format_result.double_space_count > 0:
-            severity = min(format_result.double_space_count // 5, 5)
+            severity = format_result.double_space_count // 5
+            if severity > 5:
+                severity = 5
             score += severity * 2
-            justifications.append(RiskJustification(
-                category="format",
-                severity=severity,
-                reason=f"Found {format_result.double_space_count} double space occurrences",
-                evidence={"double_space_count": format_result.double_space_count}
-            ))
+            justifications.append(_double_space_justification(format_result, severity))
 
         # Check tabs
-        max_tabs = formatting_rules.get("max_tabs", 20)
+        max_tabs = config.max_tabs
         if format_result.tab_count > max_tabs:
-            severity = min((format_result.tab_count - max_tabs) // 5, 5)
+            severity = (format_result.tab_count - max_tabs) // 5
+            if severity > 5:
+                severity = 5
             score += severity * 2
-            justifications.append(RiskJustification(
-                category="format",
-                severity=severity,
-                reason=f"Excessive tabs ({format_result.tab_count} > {max_tabs})",
-                evidence={"tab_count": format_result.tab_count}
-            ))
+            justifications.append(_tab_justification(format_result, severity, max_tabs))
 
         # Check section coverage
-        if format_result.section_coverage < 0.7:
+        if format_result.section_coverage < config.min_section_coverage:
             severity = int((1.0 - format_result.section_coverage) * 10)
             score += severity * 4
-            justifications.append(RiskJustification(
-                category="format",
-                severity=severity,
-                reason=f"Low section coverage: {format_result.section_coverage:.0%} (missing: {', '.join(format_result.missing_sections)})",
-                evidence={
-                    "section_coverage": format_result.section_coverage,
-                    "missing_sections": format_result.missing_sections
-                }
-            ))
+            justifications.append(_coverage_justification(format_result, severity))
 
         # Apply risk overrides from template
-        risk_overrides = template.get("risk_overrides", {})
-        if risk_overrides and format_result.missing_sections:
-            severity = risk_overrides.get("missing_section", 3)
-            score += severity * len(format_result.missing_sections)
+        if config.missing_section_severity is not None and format_result.missing_sections:
+            score += config.missing_section_severity * len(format_result.missing_sections)
 
-        return min(score, 100.0), justifications
+        return score if score < 100.0 else 100.0
 
-    def calculate_authenticity_risk(
+    def _score_authenticity(
         self,
-        auth_check: Optional[AuthenticityCheck]
-    ) -> tuple[float, List[RiskJustification]]:
-        """Calculate risk score from authenticity check.
-
-        Args:
-            auth_check: Authenticity check results
-
-        Returns:
-            Tuple of (risk_score, justifications)
-        """
+        auth_check: Optional[AuthenticityCheck],
+        justifications: List[RiskJustification]
+    ) -> float:
+        """Score an authenticity check, appending justifications to ``justifications``."""
         if not auth_check or not auth_check.applicable:
-            return 0.0, []
+            return 0.0
 
-        justifications = []
         score = 0.0
 
         # Check EXIF
@@ -126,7 +182,9 @@ class RiskScoringService:
                     evidence={"exif_present": False}
                 ))
             elif auth_check.exif.anomalies:
-                severity = min(len(auth_check.exif.anomalies) * 2, 8)
+                severity = len(auth_check.exif.anomalies) * 2
+                if severity > 8:
+                    severity = 8
                 score += severity * 3
                 justifications.append(RiskJustification(
                     category="authenticity",
@@ -137,7 +195,9 @@ class RiskScoringService:
 
         # Check pHash duplicates
         if auth_check.phash and auth_check.phash.duplicates_found:
-            severity = min(len(auth_check.phash.duplicates_found) * 3, 10)
+            severity = len(auth_check.phash.duplicates_found) * 3
+            if severity > 10:
+                severity = 10
             score += severity * 4
             justifications.append(RiskJustification(
                 category="duplication",
@@ -165,7 +225,9 @@ class RiskScoringService:
 
         # Check reverse image search
         if auth_check.reverse_search and auth_check.reverse_search.total_matches > 0:
-            severity = min(auth_check.reverse_search.total_matches, 10)
+            severity = auth_check.reverse_search.total_matches
+            if severity > 10:
+                severity = 10
             score += severity * 3
             justifications.append(RiskJustification(
                 category="duplication",
@@ -191,14 +253,118 @@ class RiskScoringService:
                 }
             ))
 
-        return min(score, 100.0), justifications
+        return score if score < 100.0 else 100.0
+
+    def calculate_format_risk(
+        self,
+        format_result: FormatAnalysisResult,
+        template: Dict
+    ) -> tuple[float, List[RiskJustification]]:
+        """Calculate risk score from format analysis.
+
+        Args:
+            format_result: Format analysis results
+            template: Document template with rules
+
+        Returns:
+            Tuple of (risk_score, justifications)
+        """
+        justifications: List[RiskJustification] = []
+        score = self._score_format(format_result, self._template_config(template), justifications)
+        return score, justifications
+
+    def calculate_format_risk_batch(
+        self,
+        format_results: List[FormatAnalysisResult],
+        template: Dict
+    ) -> List[tuple[float, List[RiskJustification]]]:
+        """Calculate format risk for many documents sharing one template.
+
+        Gives the same result as calculate_format_risk for every document,
+        but computes severities and scores as NumPy array operations and only
+        builds RiskJustification objects for documents that tripped a check.
+
+        Args:
+            format_results: Format analysis results
+            template: Document template with rules
+
+        Returns:
+            One (risk_score, justifications) tuple per document, in input order
+        """
+        n = len(format_results)
+        if n == 0:
+            return []
+
+        config = self._template_config(template)
+        max_spell_error = config.max_spell_error
+        max_tabs = config.max_tabs
+
+        spell_error_rate = np.fromiter((r.spell_error_rate for r in format_results), dtype=np.float64, count=n)
+        double_spaces = np.fromiter((r.double_space_count for r in format_results), dtype=np.int64, count=n)
+        tabs = np.fromiter((r.tab_count for r in format_results), dtype=np.int64, count=n)
+        coverage = np.fromiter((r.section_coverage for r in format_results), dtype=np.float64, count=n)
+        missing = np.fromiter((len(r.missing_sections) for r in format_results), dtype=np.int64, count=n)
+
+        spelling_hit = spell_error_rate > max_spell_error
+        spelling_severity = np.minimum(((spell_error_rate / max_spell_error) * 10).astype(np.int64), 10)
+        double_space_hit = double_spaces > 0
+        double_space_severity = np.minimum(double_spaces // 5, 5)
+        tab_hit = tabs > max_tabs
+        tab_severity = np.minimum((tabs - max_tabs) // 5, 5)
+        coverage_hit = coverage < config.min_section_coverage
+        coverage_severity = ((1.0 - coverage) * 10).astype(np.int64)
+
+        scores = (
+            np.where(spelling_hit, spelling_severity * 3, 0)
+            + np.where(double_space_hit, double_space_severity * 2, 0)
+            + np.where(tab_hit, tab_severity * 2, 0)
+            + np.where(coverage_hit, coverage_severity * 4, 0)
+        ).astype(np.float64)
+        if config.missing_section_severity is not None:
+            scores += config.missing_section_severity * missing
+        np.minimum(scores, 100.0, out=scores)
+
+        results = [(score, []) for score in scores.tolist()]
+        for idx in np.flatnonzero(spelling_hit | double_space_hit | tab_hit | coverage_hit).tolist():
+            format_result = format_results[idx]
+            justifications = results[idx][1]
+            if spelling_hit[idx]:
+                justifications.append(_spelling_justification(format_result, int(spelling_severity[idx]), max_spell_error))
+            if double_space_hit[idx]:
+                justifications.append(_double_space_justification(format_result, int(double_space_severity[idx])))
+            if tab_hit[idx]:
+                justifications.append(_tab_justification(format_result, int(tab_severity[idx]), max_tabs))
+            if coverage_hit[idx]:
+                justifications.append(_coverage_justification(format_result, int(coverage_severity[idx])))
+
+        return results
+
+    def calculate_authenticity_risk(
+        self,
+        auth_check: Optional[AuthenticityCheck]
+    ) -> tuple[float, Sequence[RiskJustification]]:
+        """Calculate risk score from authenticity check.
+
+        Args:
+            auth_check: Authenticity check results
+
+        Returns:
+            Tuple of (risk_score, justifications); a shared empty tuple when not applicable
+        """
+        if not auth_check or not auth_check.applicable:
+            return _NOT_APPLICABLE_AUTHENTICITY_RISK
+
+        justifications: List[RiskJustification] = []
+        score = self._score_authenticity(auth_check, justifications)
+        return score, justifications
 
     def aggregate_risk_score(
         self,
         format_risk: float,
-        format_justifications: List[RiskJustification],
+        format_justifications: Sequence[RiskJustification],
         authenticity_risk: float,
-        authenticity_justifications: List[RiskJustification]
+        authenticity_justifications: Sequence[RiskJustification],
+        top_k: Optional[int] = MAX_JUSTIFICATIONS
     ) -> RiskAssessment:
         """Aggregate format and authenticity risks into overall score.
 
@@ -207,10 +373,53 @@ class RiskScoringService:
             format_justifications: Format risk justifications
             authenticity_risk: Authenticity risk score (0-100)
             authenticity_justifications: Authenticity justifications
+            top_k: Number of most severe justifications to keep (None keeps all)
+
+        Returns:
+            RiskAssessment with overall score and level
+        """
+        return self._assessment(
+            format_risk,
+            authenticity_risk,
+            chain(format_justifications, authenticity_justifications),
+            top_k
+        )
+
+    def score_document(
+        self,
+        format_result: FormatAnalysisResult,
+        auth_check: Optional[AuthenticityCheck],
+        template: Dict,
+        top_k: Optional[int] = MAX_JUSTIFICATIONS
+    ) -> RiskAssessment:
+        """Score format and authenticity and aggregate them in one pass.
+
+        Same result as calculate_format_risk + calculate_authenticity_risk +
+        aggregate_risk_score, but both scorers append to a single
+        justification list instead of building and re-combining two.
+
+        Args:
+            format_result: Format analysis results
+            auth_check: Authenticity check results
+            template: Document template with rules
+            top_k: Number of most severe justifications to keep (None keeps all)
 
         Returns:
             RiskAssessment with overall score and level
         """
+        justifications: List[RiskJustification] = []
+        format_risk = self._score_format(format_result, self._template_config(template), justifications)
+        authenticity_risk = self._score_authenticity(auth_check, justifications)
+        return self._assessment(format_risk, authenticity_risk, justifications, top_k)
+
+    def _assessment(
+        self,
+        format_risk: float,
+        authenticity_risk: float,
+        justifications: Iterable[RiskJustification],
+        top_k: Optional[int]
+    ) -> RiskAssessment:
+        """Build the RiskAssessment from sub-scores and format-then-authenticity justifications."""
         # Weighted average (60% format, 40% authenticity)
         overall_score = (format_risk * 0.6) + (authenticity_risk * 0.4)
 
@@ -222,11 +431,11 @@ class RiskScoringService:
         else:
             risk_level = "High"
 
-        # Combine justifications
-        all_justifications = format_justifications + authenticity_justifications
-
-        # Sort by severity (highest first)
-        all_justifications.sort(key=lambda j: j.severity, reverse=True)
+        # Highest severity first (ties keep input order)
+        if top_k is None:
+            all_justifications = sorted(justifications, key=_severity, reverse=True)
+        else:
+            all_justifications = heapq.nlargest(top_k, justifications, key=_severity)
 
         return RiskAssessment(
             overall_score=overall_score,
@@ -4,14 +4,28 @@ Provides access to active AML compliance rules.
 """
 from __future__ import annotations
 
-import json
+import asyncio
+import logging
 import time
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Iterable, List, Optional
+from typing import Any, Iterable, List, Optional, Sized
 from uuid import UUID
 
 import httpx
+import orjson
+
+try:
+    import h2  # noqa: F401  (enables HTTP/2 in httpx)
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
 
 try:
     # Try backend-prefixed imports first (running from parent directory)
@@ -24,6 +38,18 @@ except ModuleNotFoundError:
 
 logger = get_logger(__name__)
 
+# Shared connection pool for Supabase REST calls
+SUPABASE_TIMEOUT = httpx.Timeout(10.0)
+SUPABASE_POOL_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=20)
+
+# compliance_rules columns read by _parse_rule_record (feature 003 schema).
+# PostgREST rejects unknown columns, so only list ones the table defines.
+SUPABASE_RULE_COLUMNS = "id,rule_type,jurisdiction,regulator,description,rule_data"
+
+# Rules files larger than this are stream-parsed with ijson (when installed),
+# so inactive and expired rules are dropped without materializing the whole list
+RULES_STREAM_THRESHOLD_BYTES = 4 * 1024 * 1024
+
 
 class ComplianceRule:
     """
@@ -34,6 +60,16 @@ class ComplianceRule:
     what the Supabase table would return.
     """
 
+    __slots__ = (
+        "rule_id",
+        "rule_type",
+        "jurisdiction",
+        "regulator",
+        "severity",
+        "description",
+        "rule_data",
+    )
+
     def __init__(
         self,
         rule_id: UUID,
@@ -46,8 +82,9 @@ class ComplianceRule:
     ):
         self.rule_id = rule_id
         self.rule_type = rule_type
+        # Normalized once here so matching is a plain comparison
         self.jurisdiction = (jurisdiction or "").upper() or None
-        self.regulator = regulator or None
+        self.regulator = (regulator or "").upper() or None
         self.severity = severity
         self.description = description
         self.rule_data = rule_data or {}
@@ -73,6 +110,69 @@ class RulesService:
         self._rules_cache: list[ComplianceRule] = []
         self._cache_expiry: float = 0.0
         self._cache_ttl_seconds: int = getattr(settings, "rules_cache_ttl_seconds", 60)
+        # mtime of the rules file behind _rules_cache (None when it came from
+        # Supabase) and the earliest future expiry_date among its rules; an
+        # unchanged file is only reparsed once one of those rules expires
+        self._file_mtime_ns: int | None = None
+        self._file_next_expiry: datetime | None = None
+        # Built from _rules_cache on every reload, in cache order: global rules
+        # alone, and per jurisdiction its own rules interleaved with the global ones
+        self._global_rules: list[ComplianceRule] = []
+        self._by_jurisdiction: dict[str, list[ComplianceRule]] = {}
+        # Pooled HTTP client, created lazily on the event loop that first uses it
+        # (httpx pools are loop-bound); keeps connections and TLS sessions warm
+        # across cache refreshes
+        self._http: httpx.AsyncClient | None = None
+        self._http_loop: Any = None
+        # Closes of clients replaced after an event-loop change, kept referenced until done
+        self._closing: set[asyncio.Task] = set()
+        # Resolved once; settings.rules_data_path doesn't change at runtime
+        self._rules_path: Path | None = None
+        # Raw rule id -> parsed UUID, reused across reloads (rule ids are stable)
+        self._rule_ids: dict[str, UUID] = {}
+
+    def _get_http(self) -> httpx.AsyncClient:
+        """Return the pooled HTTP client for the running event loop."""
+        loop = asyncio.get_running_loop()
+        if self._http is None or self._http_loop is not loop:
+            if self._http is not None:
+                self._close_stale_http(self._http, self._http_loop)
+            self._http = httpx.AsyncClient(
+                timeout=SUPABASE_TIMEOUT,
+                limits=SUPABASE_POOL_LIMITS,
+                http2=HTTP2_AVAILABLE,
+            )
+            self._http_loop = loop
+        return self._http
+
+    def _close_stale_http(self, http: httpx.AsyncClient, loop: Any) -> None:
+        """Schedule a close of a client left behind by an event-loop change.
+
+        The close runs on the client's own loop while that loop is still
+        running; otherwise it runs on the current one.
+        """
+        if loop is not None and loop.is_running() and not loop.is_closed():
+            asyncio.run_coroutine_threadsafe(self._close_quietly(http), loop)
+            return
+        task = asyncio.get_running_loop().create_task(self._close_quietly(http))
+        self._closing.add(task)
+        task.add_done_callback(self._closing.discard)
+
+    async def _close_quietly(self, http: httpx.AsyncClient) -> None:
+        """Close a replaced client, logging rather than raising if its pool is already unusable."""
+        try:
+            await http.aclose()
+        except Exception:
+            self.logger.debug("replaced_http_client_close_failed", exc_info=True)
+
+    async def aclose(self) -> None:
+        """Close pooled Supabase connections. Call on application shutdown."""
+        if self._closing:
+            await asyncio.gather(*self._closing, return_exceptions=True)
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+            self._http_loop = None
 
     async def get_active_rules(
         self,
@@ -93,12 +193,11 @@ class RulesService:
         regulator_upper = regulator.upper() if regulator else None
 
         rules = await self._load_rules_from_source()
-        return [
-            rule
-            for rule in rules
-            if self._matches_jurisdiction(rule, jurisdiction_upper)
-            and self._matches_regulator(rule, regulator_upper)
-        ]
+        if jurisdiction_upper is not None:
+            rules = self._by_jurisdiction.get(jurisdiction_upper, self._global_rules)
+        if regulator_upper is None:
+            return list(rules)
+        return [rule for rule in rules if self._matches_regulator(rule, regulator_upper)]
 
     async def get_rule_by_id(self, rule_id: UUID) -> Optional[ComplianceRule]:
         """
@@ -135,34 +234,24 @@ class RulesService:
         """
         # The LangGraph node performs evaluation; this method is kept for API parity.
         # It simply returns an empty list until feature 003 needs it directly.
-        rule_count = len(list(rules))
-        self.logger.debug(
-            "evaluate_payment_against_rules_called - rule_count=%s",
-            rule_count,
-        )
+        # Don't consume (or copy) ``rules`` just to log its size
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug(
+                "evaluate_payment_against_rules_called - rule_count=%s",
+                len(rules) if isinstance(rules, Sized) else "unknown",
+            )
         return []
 
     # ------------------------------------------------------------------
     # Internal helpers
     # ------------------------------------------------------------------
 
-    def _matches_jurisdiction(
-        self,
-        rule: ComplianceRule,
-        jurisdiction: Optional[str],
-    ) -> bool:
-        if jurisdiction is None or rule.applies_globally:
-            return True
-        return rule.jurisdiction == jurisdiction
-
     def _matches_regulator(
         self,
         rule: ComplianceRule,
         regulator: Optional[str],
     ) -> bool:
-        if regulator is None or not rule.regulator:
-            return True
-        return rule.regulator.upper() == regulator
+        return regulator is None or rule.regulator is None or rule.regulator == regulator
 
     async def _load_rules_from_source(self) -> list[ComplianceRule]:
         """
@@ -172,19 +261,61 @@ class RulesService:
         if self._rules_cache and now < self._cache_expiry:
             return self._rules_cache
 
+        # Stat before reading, so a write that lands mid-parse changes the
+        # mtime seen on the next refresh
+        try:
+            file_mtime_ns = self._resolve_rules_path().stat().st_mtime_ns
+        except OSError:
+            file_mtime_ns = None
+
+        if (
+            self._rules_cache
+            and file_mtime_ns is not None
+            and file_mtime_ns == self._file_mtime_ns
+            and not self._file_rule_expired()
+        ):
+            self._cache_expiry = now + self._cache_ttl_seconds
+            return self._rules_cache
+
         rules: list[ComplianceRule] = []
 
         file_rules = self._load_rules_from_file()
         if file_rules:
             rules = file_rules
+            self._file_mtime_ns = file_mtime_ns
         else:
             supabase_rules = await self._fetch_rules_from_supabase()
             rules = supabase_rules
+            self._file_mtime_ns = None
 
         self._rules_cache = rules
+        self._index_rules(rules)
         self._cache_expiry = now + self._cache_ttl_seconds
         return rules
 
+    def _index_rules(self, rules: list[ComplianceRule]) -> None:
+        """Rebuild the jurisdiction index used by get_active_rules."""
+        global_rules: list[ComplianceRule] = []
+        by_jurisdiction: dict[str, list[ComplianceRule]] = {
+            rule.jurisdiction: [] for rule in rules if not rule.applies_globally
+        }
+        for rule in rules:
+            if rule.applies_globally:
+                global_rules.append(rule)
+                for jurisdiction_rules in by_jurisdiction.values():
+                    jurisdiction_rules.append(rule)
+            else:
+                by_jurisdiction[rule.jurisdiction].append(rule)
+        self._global_rules = global_rules
+        self._by_jurisdiction = by_jurisdiction
+
+    def _file_rule_expired(self) -> bool:
+        """Whether a rule loaded from the file has passed its expiry_date since parsing."""
+        return (
+            self._file_next_expiry is not None
+            and self._file_next_expiry <= datetime.now(tz=timezone.utc)
+        )
+
     async def _fetch_rules_from_supabase(self) -> list[ComplianceRule]:
         """
         Attempt to fetch rules from Supabase REST endpoint.
@@ -197,7 +328,7 @@ class RulesService:
 
         rest_endpoint = supabase_url.rstrip("/") + "/rest/v1/compliance_rules"
         params = {
-            "select": "*",
+            "select": SUPABASE_RULE_COLUMNS,
             "validation_status": "eq.validated",
             "is_active": "eq.true",
             "order": "effective_date.desc.nullslast",
@@ -209,14 +340,13 @@ class RulesService:
         }
 
         try:
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                response = await client.get(
-                    rest_endpoint,
-                    params=params,
-                    headers=headers,
-                )
-                response.raise_for_status()
-                data = response.json()
+            response = await self._get_http().get(
+                rest_endpoint,
+                params=params,
+                headers=headers,
+            )
+            response.raise_for_status()
+            data = orjson.loads(response.content)
         except Exception as exc:  # pragma: no cover - external dependency
             self.logger.warning(
                 "supabase_rules_fetch_failed - error=%s",
@@ -254,8 +384,12 @@ class RulesService:
             return []
 
         try:
-            with rules_path.open("r", encoding="utf-8") as handle:
-                raw_rules = json.load(handle)
+            if IJSON_AVAILABLE and rules_path.stat().st_size > RULES_STREAM_THRESHOLD_BYTES:
+                raw_rules = self._stream_rules_file(rules_path)
+            else:
+                raw_rules = orjson.loads(rules_path.read_bytes())
+            # Iterating a stream can hit malformed JSON too, so parse inside the try
+            parsed_rules, next_expiry = self._parse_raw_rules(raw_rules)
         except Exception as exc:  # pragma: no cover - defensive logging
             self.logger.error(
                 "failed_to_load_rules_file - path=%s, error=%s",
@@ -265,8 +399,35 @@ class RulesService:
             self._rules_cache = []
             return self._rules_cache
 
+        self.logger.info(
+            "compliance_rules_loaded - path=%s, count=%s",
+            str(rules_path),
+            len(parsed_rules),
+        )
+
+        self._file_next_expiry = next_expiry
+        return parsed_rules
+
+    @staticmethod
+    def _stream_rules_file(rules_path: Path) -> Iterable[dict[str, Any]]:
+        """Yield rule records one at a time from the top-level JSON array."""
+        with rules_path.open("rb") as handle:
+            yield from ijson.items(handle, "item", use_float=True)
+
+    def _parse_raw_rules(
+        self,
+        raw_rules: Iterable[dict[str, Any]],
+    ) -> tuple[list[ComplianceRule], datetime | None]:
+        """
+        Build ComplianceRules from raw file records, skipping inactive,
+        unvalidated and expired ones.
+
+        Returns:
+            The parsed rules and the earliest future expiry_date among them
+        """
         now = datetime.now(tz=timezone.utc)
         parsed_rules: list[ComplianceRule] = []
+        next_expiry: datetime | None = None
 
         for raw_rule in raw_rules:
             try:
@@ -281,7 +442,7 @@ class RulesService:
                 if expiry_date and expiry_date <= now:
                     continue
 
-                rule_id = UUID(str(raw_rule["rule_id"]))
+                rule_id = self._rule_uuid(raw_rule["rule_id"])
                 description = raw_rule.get("description") or raw_rule.get("rule_type", "rule")
                 rule_data = raw_rule.get("rule_data") or {}
 
@@ -296,6 +457,8 @@ class RulesService:
                         rule_data=rule_data,
                     )
                 )
+                if expiry_date and (next_expiry is None or expiry_date < next_expiry):
+                    next_expiry = expiry_date
             except Exception as exc:  # pragma: no cover - defensive logging
                 self.logger.error(
                     "invalid_rule_record_skipped - error=%s, record=%s",
@@ -303,18 +466,19 @@ class RulesService:
                     raw_rule,
                 )
 
-        self.logger.info(
-            "compliance_rules_loaded - path=%s, count=%s",
-            str(rules_path),
-            len(parsed_rules),
-        )
-
-        return parsed_rules
+        return parsed_rules, next_expiry
 
     def _resolve_rules_path(self) -> Path:
         """
         Resolve the filesystem path to the compliance rules JSON file.
         """
+        if self._rules_path is None:
+            self._rules_path = self._compute_rules_path()
+        return self._rules_path
+
+    @staticmethod
+    def _compute_rules_path() -> Path:
+        """Build the rules path from settings; see _resolve_rules_path."""
         configured_path = getattr(settings, "rules_data_path", None)
 
         if configured_path:
@@ -351,8 +515,15 @@ class RulesService:
         except ValueError:
             return None
 
-    @staticmethod
-    def _parse_rule_record(record: dict[str, Any]) -> ComplianceRule:
+    def _rule_uuid(self, value: Any) -> UUID:
+        """Parse a rule id, reusing the UUID from earlier reloads."""
+        key = str(value)
+        rule_id = self._rule_ids.get(key)
+        if rule_id is None:
+            rule_id = self._rule_ids[key] = UUID(key)
+        return rule_id
+
+    def _parse_rule_record(self, record: dict[str, Any]) -> ComplianceRule:
         """
         Convert a raw record (from Supabase or JSON) into ComplianceRule.
         """
@@ -370,7 +541,7 @@ class RulesService:
         )
 
         return ComplianceRule(
-            rule_id=UUID(str(record.get("rule_id") or record["id"])),
+            rule_id=self._rule_uuid(record.get("rule_id") or record["id"]),
             rule_type=str(record.get("rule_type")),
             jurisdiction=record.get("jurisdiction"),
             regulator=record.get("regulator"),
@@ -380,115 +551,5 @@ class RulesService:
         )
 
 
-# Global service instance
-rules_service = RulesService()
-"""
-Rules service for AML compliance rules management.
-"""
-
-import logging
-from typing import Optional, List, Dict, Any
-
-logger = logging.getLogger(__name__)
-
-
-class RulesService:
-    """Service for managing and retrieving AML compliance rules."""
-
-    def __init__(self):
-        """Initialize rules service."""
-        self.rules_cache: Dict[str, List[Dict[str, Any]]] = {}
-
-    async def get_active_rules(
-        self, jurisdiction: Optional[str] = None
-    ) -> List[Dict[str, Any]]:
-        """
-        Get active AML rules for a jurisdiction.
-
-        Args:
-            jurisdiction: Optional jurisdiction code (e.g., 'HK', 'SG', 'CH')
-
-        Returns:
-            List of active rule dictionaries
-        """
-        logger.info(f"Fetching active rules for jurisdiction: {jurisdiction}")
-
-        # Default rules for all jurisdictions
-        default_rules = [
-            {
-                "rule_id": "STRUCT_001",
-                "rule_type": "structuring",
-                "description": "Detect structuring patterns below reporting threshold",
-                "threshold": 10000,
-                "enabled": True,
-            },
-            {
-                "rule_id": "VELOCITY_001",
-                "rule_type": "velocity",
-                "description": "Detect unusual transaction velocity",
-                "threshold": 5,
-                "enabled": True,
-            },
-            {
-                "rule_id": "HIGHRISK_001",
-                "rule_type": "high_risk_jurisdiction",
-                "description": "Flag transactions to/from high-risk jurisdictions",
-                "enabled": True,
-            },
-            {
-                "rule_id": "PEP_001",
-                "rule_type": "pep",
-                "description": "Enhanced monitoring for PEP transactions",
-                "enabled": True,
-            },
-        ]
-
-        # Add jurisdiction-specific rules if needed
-        if jurisdiction:
-            jurisdiction_rules = self._get_jurisdiction_rules(jurisdiction)
-            return default_rules + jurisdiction_rules
-
-        return default_rules
-
-    def _get_jurisdiction_rules(self, jurisdiction: str) -> List[Dict[str, Any]]:
-        """
-        Get jurisdiction-specific rules.
-
-        Args:
-            jurisdiction: Jurisdiction code
-
-        Returns:
-            List of jurisdiction-specific rules
-        """
-        jurisdiction_map = {
-            "HK": [
-                {
-                    "rule_id": "HK_001",
-                    "rule_type": "hkma_reporting",
-                    "description": "HKMA suspicious transaction reporting",
-                    "enabled": True,
-                }
-            ],
-            "SG": [
-                {
-                    "rule_id": "SG_001",
-                    "rule_type": "mas_reporting",
-                    "description": "MAS suspicious transaction reporting",
-                    "enabled": True,
-                }
-            ],
-            "CH": [
-                {
-                    "rule_id": "CH_001",
-                    "rule_type": "finma_reporting",
-                    "description": "FINMA suspicious transaction reporting",
-                    "enabled": True,
-                }
-            ],
-        }
-
-        return jurisdiction_map.get(jurisdiction.upper(), [])
-
-
 # Global service instance
 rules_service = RulesService()
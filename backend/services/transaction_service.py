@@ -4,11 +4,24 @@ Transaction service for querying payment history from CSV.
 Implements OR logic with case-insensitive search and deduplication.
 """
 
+import asyncio
 import logging
+import os
+import random
+import threading
 import time
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
+import numpy as np
 import pandas as pd
+from pydantic import TypeAdapter, ValidationError
+
+try:
+    import pyarrow  # noqa: F401  (enables the multithreaded pyarrow CSV parser)
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
 
 try:
     # Try backend-prefixed imports first (running from parent directory)
@@ -27,6 +40,108 @@ logger = logging.getLogger(__name__)
 
 DEFAULT_TRANSACTIONS_CSV = Path(__file__).resolve().parents[2] / "transactions_mock_1000_for_participants.csv"
 
+# Columns matched case-insensitively by query()
+SEARCH_COLUMNS = ("originator_name", "originator_account", "beneficiary_name", "beneficiary_account")
+
+_NO_ROWS = np.empty(0, dtype=np.intp)
+
+DATETIME_COLUMNS = ['booking_datetime', 'suspicion_determined_datetime', 'str_filed_datetime']
+
+# Code-like columns with a handful of distinct values, stored as categoricals: far less
+# memory, and every row's record dict shares one str object per distinct value
+LOW_CARDINALITY_COLUMNS = [
+    'booking_jurisdiction', 'regulator', 'currency', 'channel', 'product_type',
+    'originator_country', 'beneficiary_country', 'swift_mt',
+    'ordering_institution_bic', 'beneficiary_institution_bic',
+    'fx_base_ccy', 'fx_quote_ccy', 'fx_counterparty'
+]
+
+
+def _read_table(path: Path) -> pd.DataFrame:
+    """Read the transactions table, picking the reader from the file extension.
+
+    Parquet and Feather files (see scripts/convert_transactions_to_parquet.py)
+    keep column types, so they skip CSV text parsing; reading them needs pyarrow,
+    which also backs the multithreaded CSV parser when installed.
+    """
+    suffix = path.suffix.lower()
+    if suffix == ".parquet":
+        return pd.read_parquet(path)
+    if suffix in (".feather", ".arrow"):
+        return pd.read_feather(path, memory_map=True)
+    # Read CSV with explicit datetime parsing
+    if PYARROW_AVAILABLE:
+        return pd.read_csv(path, parse_dates=DATETIME_COLUMNS, engine="pyarrow")
+    return pd.read_csv(path, parse_dates=DATETIME_COLUMNS)
+
+
+def _read_through_parquet_cache(csv_path: Path) -> pd.DataFrame:
+    """Read the CSV via a sibling Parquet copy, (re)writing the copy when it is missing or stale.
+
+    The copy is written to a temporary file and renamed into place, so concurrent
+    workers never read a partial file. A read-only data directory just means every
+    load parses the CSV.
+    """
+    cache_path = csv_path.with_suffix(".parquet")
+    try:
+        if cache_path.stat().st_mtime_ns >= csv_path.stat().st_mtime_ns:
+            return pd.read_parquet(cache_path, memory_map=True)
+    except FileNotFoundError:
+        pass
+
+    df = _read_table(csv_path)
+    tmp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+    try:
+        df.to_parquet(tmp_path, compression="zstd", index=False)
+        os.replace(tmp_path, cache_path)
+    except OSError as exc:
+        logger.warning("Could not write Parquet cache %s (error=%s)", cache_path, exc)
+        tmp_path.unlink(missing_ok=True)
+    return df
+
+
+@lru_cache(maxsize=256)
+def _parse_booking_datetime(value: str) -> np.datetime64 | None:
+    """Parse a booking_datetime filter value (cached, since dashboards repeat them).
+
+    Returns None for timezone-aware values: the column is naive, so they never match.
+    """
+    target = pd.to_datetime(value)
+    if target.tzinfo is not None:
+        return None
+    return target.to_datetime64()
+
+
+def _frame_records(frame: pd.DataFrame) -> list[dict]:
+    """Convert DataFrame rows to dicts in one vectorized pass, with missing values as None."""
+    values = frame.to_numpy(dtype=object)
+    values[frame.isna().to_numpy()] = None
+    columns = frame.columns.tolist()
+    return [dict(zip(columns, row)) for row in values.tolist()]
+
+
+# Validates a whole result set in one call instead of one model_validate per row
+_TRANSACTION_LIST = TypeAdapter(list[TransactionRecord])
+
+
+def _validate_records(records: list[dict]) -> list[TransactionRecord]:
+    """Build TransactionRecords from row dicts, skipping (and logging) rows that fail validation."""
+    try:
+        return _TRANSACTION_LIST.validate_python(records)
+    except ValidationError:
+        pass
+
+    # Some row is invalid: redo row by row so the valid ones are kept
+    transactions = []
+    for record_dict in records:
+        try:
+            # No need to handle datetime parsing here since it's done in _load_csv
+            transactions.append(TransactionRecord.model_validate(record_dict))
+        except Exception as e:
+            logger.warning(f"Failed to parse transaction {record_dict.get('transaction_id')}: {e}")
+            logger.debug(f"Row data: {record_dict}")  # Add debug logging
+    return transactions
+
 
 class TransactionService:
     """Service for querying transaction data from CSV file."""
@@ -40,38 +155,63 @@ class TransactionService:
         """
         self.csv_path = csv_path or settings.transactions_csv_path
         self._df: pd.DataFrame | None = None
+        # Per SEARCH_COLUMNS column: lowercased value -> row positions in _df, built once at load
+        self._search_index: dict[str, dict[str, np.ndarray]] = {}
+        # Row-major view of _df built once at load, so lookups never go back through pandas:
+        # one dict per row (missing values as None), plus the columns query() dedups and ranges on
+        self._records: list[dict] = []
+        self._transaction_ids: np.ndarray = _NO_ROWS
+        self._booking_datetimes: np.ndarray = _NO_ROWS
+        # When transaction_id is unique across the dataset, query() can skip deduplication
+        self._unique_transaction_ids = False
+        # Serializes the first load so concurrent callers don't each parse the file
+        self._load_lock = threading.Lock()
+
+    async def load(self) -> pd.DataFrame:
+        """Load the transactions file in a worker thread so the event loop isn't blocked by parsing."""
+        if self._df is not None:
+            return self._df
+        return await asyncio.to_thread(self._load_csv)
 
     def _load_csv(self) -> pd.DataFrame:
-        """Load CSV file into pandas DataFrame (cached)."""
-        if self._df is None:
-            csv_file = Path(self.csv_path)
-            if not csv_file.exists():
-                raise FileNotFoundError(f"CSV file not found: {self.csv_path}")
-
-            logger.info(f"Loading CSV file: {self.csv_path}")
-            
-            # Read CSV with explicit datetime parsing
-            self._df = pd.read_csv(
-                csv_file,
-                parse_dates=['booking_datetime', 'suspicion_determined_datetime', 'str_filed_datetime']
-            )
+        """Load the transactions file (CSV, Parquet or Feather) into a pandas DataFrame (cached)."""
+        if self._df is not None:
+            return self._df
 
-            # Replace NaN values with None for optional string fields
-            string_columns = [
-                'swift_mt', 'ordering_institution_bic', 
-                'beneficiary_institution_bic', 'swift_f70_purpose',
-                'swift_f71_charges', 'fx_base_ccy', 'fx_quote_ccy',
-                'fx_counterparty', 'suitability_result'
-            ]
-            self._df[string_columns] = self._df[string_columns].replace({pd.NA: None, pd.NaT: None})
+        with self._load_lock:
+            if self._df is None:
+                self._load_locked()
+        return self._df
 
-            # Handle numeric nullable fields
-            numeric_columns = ['fx_applied_rate', 'fx_market_rate', 'fx_spread_bps']
-            self._df[numeric_columns] = self._df[numeric_columns].replace({pd.NA: None, pd.NaT: None})
+    def _load_locked(self) -> None:
+        """Parse the file and build the search index. Caller must hold ``_load_lock``."""
+        csv_file = Path(self.csv_path)
+        if not csv_file.exists():
+            raise FileNotFoundError(f"CSV file not found: {self.csv_path}")
 
-            logger.info(f"Loaded {len(self._df)} transactions from CSV")
+        logger.info(f"Loading CSV file: {self.csv_path}")
 
-        return self._df
+        if settings.transactions_parquet_cache and PYARROW_AVAILABLE and csv_file.suffix.lower() == ".csv":
+            df = _read_through_parquet_cache(csv_file)
+        else:
+            df = _read_table(csv_file)
+
+        df[LOW_CARDINALITY_COLUMNS] = df[LOW_CARDINALITY_COLUMNS].astype("category")
+
+        search_index = {}
+        for column in SEARCH_COLUMNS:
+            lowered = df[column].str.lower()
+            search_index[column] = lowered.groupby(lowered, sort=False).indices
+
+        # Publish the index and records before the frame: readers check _df without taking the lock
+        self._search_index = search_index
+        self._records = _frame_records(df)
+        self._transaction_ids = df["transaction_id"].to_numpy()
+        self._booking_datetimes = df["booking_datetime"].to_numpy()
+        self._unique_transaction_ids = df["transaction_id"].is_unique
+        self._df = df
+
+        logger.info(f"Loaded {len(df)} transactions from CSV")
 
     def query(self, params: QueryParameters) -> PaymentHistory:
         """
@@ -98,37 +238,22 @@ class TransactionService:
         # Load CSV data
         df = self._load_csv()
 
-        # Build OR filters (case-insensitive)
-        filters = []
-
-        if params.originator_name:
-            filters.append(
-                df["originator_name"].str.lower() == params.originator_name.lower()
-            )
-            logger.debug(f"Filter: originator_name={params.originator_name}")
-
-        if params.originator_account:
-            filters.append(
-                df["originator_account"].str.lower() == params.originator_account.lower()
-            )
-            logger.debug(f"Filter: originator_account={params.originator_account}")
+        search_index = self._search_index
 
-        if params.beneficiary_name:
-            filters.append(
-                df["beneficiary_name"].str.lower() == params.beneficiary_name.lower()
-            )
-            logger.debug(f"Filter: beneficiary_name={params.beneficiary_name}")
+        # Build OR filters (case-insensitive) as arrays of matching row positions
+        filters = []
 
-        if params.beneficiary_account:
-            filters.append(
-                df["beneficiary_account"].str.lower() == params.beneficiary_account.lower()
-            )
-            logger.debug(f"Filter: beneficiary_account={params.beneficiary_account}")
+        for column in SEARCH_COLUMNS:
+            value = getattr(params, column)
+            if value:
+                filters.append(search_index[column].get(value.lower(), _NO_ROWS))
+                logger.debug(f"Filter: {column}={value}")
 
         if params.booking_datetime:
             try:
-                target_dt = pd.to_datetime(params.booking_datetime)
-                filters.append(df["booking_datetime"] == target_dt)
+                target_dt = _parse_booking_datetime(params.booking_datetime)
+                # datetime64 equality on the raw column array: a vectorized integer compare
+                filters.append(_NO_ROWS if target_dt is None else np.flatnonzero(self._booking_datetimes == target_dt))
                 logger.debug(f"Filter: booking_datetime={target_dt}")
             except Exception as exc:
                 logger.warning(
@@ -138,39 +263,34 @@ class TransactionService:
                 )
 
         if not filters:
-            combined_filter = df.index == df.index  # all True
+            positions = np.arange(len(df))  # all rows
         else:
-            combined_filter = filters[0]
-            for f in filters[1:]:
-                combined_filter = combined_filter | f
+            # Sorted union keeps rows in file order, as a boolean mask would
+            positions = np.unique(np.concatenate(filters))
 
-        # Apply filter and deduplicate by transaction_id
-        result_df = df[combined_filter].drop_duplicates(subset=["transaction_id"])
+        # Deduplicate by transaction_id, keeping the first row of each
+        if not self._unique_transaction_ids:
+            first_positions: dict = {}
+            for position, transaction_id in zip(positions.tolist(), self._transaction_ids[positions].tolist()):
+                first_positions.setdefault(transaction_id, position)
+            positions = np.fromiter(first_positions.values(), dtype=np.intp, count=len(first_positions))
 
         # Convert to TransactionRecord objects
-        transactions = []
-        for _, row in result_df.iterrows():
-            try:
-                # Convert row to dict and clean None values
-                record_dict = {
-                    k: (None if pd.isna(v) else v) 
-                    for k, v in row.to_dict().items()
-                }
-                
-                # No need to handle datetime parsing here since it's done in _load_csv
-                transaction = TransactionRecord(**record_dict)
-                transactions.append(transaction)
-            except Exception as e:
-                logger.warning(f"Failed to parse transaction {row.get('transaction_id')}: {e}")
-                logger.debug(f"Row data: {record_dict}")  # Add debug logging
-                continue
-
-        # Calculate date range
-        if transactions:
+        records = self._records
+        transactions = _validate_records([records[position] for position in positions.tolist()])
+
+        # Calculate date range (on the column, unless rows were skipped above)
+        if not transactions:
+            date_range = (None, None)
+        elif len(transactions) == len(positions):
+            booking_datetimes = self._booking_datetimes[positions]
+            date_range = (
+                pd.Timestamp(booking_datetimes.min()).to_pydatetime(),
+                pd.Timestamp(booking_datetimes.max()).to_pydatetime(),
+            )
+        else:
             dates = [t.booking_datetime for t in transactions]
             date_range = (min(dates), max(dates))
-        else:
-            date_range = (None, None)
 
         # Create PaymentHistory
         payment_history = PaymentHistory(
@@ -198,21 +318,12 @@ class TransactionService:
         Raises:
             ValueError: If no transactions available
         """
-        df = self._load_csv()
-
-        if df.empty:
-            raise ValueError("No transactions available in dataset")
+        self._load_csv()
+        if not self._records:
+            raise ValueError("Transaction dataset is empty")
 
         # Get a random row
-        random_row = df.sample(n=1).iloc[0]
-
-        # Convert to dict and clean None values
-        record_dict = {
-            k: (None if pd.isna(v) else v)
-            for k, v in random_row.to_dict().items()
-        }
-
-        return TransactionRecord(**record_dict)
+        return TransactionRecord.model_validate(random.choice(self._records))
 
     def get_transactions_by_account(
         self, account: str, limit: int = 10
@@ -227,44 +338,17 @@ class TransactionService:
         Returns:
             List of TransactionRecord objects
         """
-        df = self._load_csv()
+        self._load_csv()
+        account_lower = account.lower()
 
         # Search both originator and beneficiary accounts
-        mask = (
-            (df["originator_account"].str.lower() == account.lower()) |
-            (df["beneficiary_account"].str.lower() == account.lower())
+        positions = np.union1d(
+            self._search_index["originator_account"].get(account_lower, _NO_ROWS),
+            self._search_index["beneficiary_account"].get(account_lower, _NO_ROWS),
         )
 
-        result_df = df[mask].head(limit)
-
-        transactions = []
-        for _, row in result_df.iterrows():
-            try:
-                record_dict = {
-                    k: (None if pd.isna(v) else v)
-                    for k, v in row.to_dict().items()
-                }
-                transactions.append(TransactionRecord(**record_dict))
-            except Exception as e:
-                logger.warning(f"Failed to parse transaction: {e}")
-                continue
-
-        return transactions
-
-    def get_random_transaction(self) -> TransactionRecord:
-        """Retrieve a single random transaction from the dataset."""
-        df = self._load_csv()
-        if df.empty:
-            raise ValueError("Transaction dataset is empty")
-
-        row = df.sample(n=1).iloc[0]
-        record_dict = {
-            k: (None if pd.isna(v) else v)
-            for k, v in row.to_dict().items()
-        }
-
-        transaction = TransactionRecord(**record_dict)
-        return transaction
+        records = self._records
+        return _validate_records([records[position] for position in positions[:limit].tolist()])
 
 
 # Global service instance
@@ -3,10 +3,11 @@
 from __future__ import annotations
 
 from datetime import datetime, timezone
+from functools import lru_cache
 from typing import Any, Dict
 
 from fastapi import Depends, FastAPI, HTTPException
-from fastapi.responses import JSONResponse, PlainTextResponse
+from fastapi.responses import ORJSONResponse, PlainTextResponse
 from pydantic import BaseModel, Field
 
 from ..core.config import Settings, load_settings
@@ -28,17 +29,36 @@ def get_settings() -> Settings:
     return load_settings()
 
 
-def get_report_generator(settings: Settings = Depends(get_settings)) -> ReportGenerator:
-    return ReportGenerator(settings=settings)
+# Cached for the process: neither holds per-request state, and the report
+# generator's Groq client keeps its connection pool across requests. Settings
+# stay with load_settings(), whose own cache honours force_reload.
+@lru_cache(maxsize=1)
+def get_report_generator() -> ReportGenerator:
+    return ReportGenerator(settings=get_settings())
 
 
-def get_storage(settings: Settings = Depends(get_settings)) -> Storage:
-    return Storage(settings)
+@lru_cache(maxsize=1)
+def get_storage() -> Storage:
+    return Storage(get_settings())
 
 
 def create_app() -> FastAPI:
     configure_logging()
-    app = FastAPI(title="AML Triage Service", version="0.1.0")
+    app = FastAPI(
+        title="AML Triage Service",
+        version="0.1.0",
+        default_response_class=ORJSONResponse,
+    )
+
+    @app.on_event("startup")
+    async def preload_settings() -> None:
+        # Parse the YAML config before the first request rather than during it
+        load_settings()
+
+    @app.on_event("shutdown")
+    async def close_report_generator() -> None:
+        if get_report_generator.cache_info().currsize:
+            await get_report_generator().groq_client.close()
 
     @app.post("/triage/plan", response_class=PlainTextResponse)
     async def create_plan(
@@ -60,7 +80,7 @@ def create_app() -> FastAPI:
     async def submit_feedback(
         request: FeedbackRequest,
         storage: Storage = Depends(get_storage),
-    ) -> JSONResponse:
+    ) -> Dict[str, Any]:
         record = FeedbackRecord(
             plan_id=request.plan_id,
             label=request.label,
@@ -70,7 +90,7 @@ def create_app() -> FastAPI:
             created_at=datetime.now(timezone.utc),
         )
         storage.record_feedback(record)
-        return JSONResponse({"status": "accepted", "stored_at": record.created_at.isoformat()})
+        return {"status": "accepted", "stored_at": record.created_at.isoformat()}
 
     @app.get("/healthz")
     async def healthz(settings: Settings = Depends(get_settings)) -> Dict[str, Any]:
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import os
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, Dict, Optional
 
@@ -62,15 +63,31 @@ class SettingsError(RuntimeError):
     """Raised when configuration cannot be loaded."""
 
 
+# libyaml's C loader when PyYAML was built with it; same safe subset as safe_load
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+@lru_cache(maxsize=8)
+def _parse_yaml_file(path: str, mtime_ns: int, size: int) -> Dict[str, Any]:
+    """Parse a YAML config file; the stat fields in the key invalidate it on change.
+
+    Callers must not mutate the returned dict (or its nested values).
+    """
+    with open(path, "r", encoding="utf-8") as handle:
+        return yaml.load(handle, Loader=_YAML_LOADER) or {}
+
+
 def _load_yaml_config() -> Dict[str, Any]:
     config_path = os.getenv("APP_CONFIG", "backend/src/AML_triage/config/app.yaml")
     path = Path(config_path)
 
-    if not path.exists():
-        raise SettingsError(f"APP_CONFIG path not found: {path}")
+    try:
+        stat = path.stat()
+    except OSError:
+        raise SettingsError(f"APP_CONFIG path not found: {path}") from None
 
-    with path.open("r", encoding="utf-8") as handle:
-        data = yaml.safe_load(handle) or {}
+    # Shallow copy: overrides below replace top-level keys and never mutate nested values
+    data = dict(_parse_yaml_file(str(path), stat.st_mtime_ns, stat.st_size))
 
     # Allow environment overrides for path values.
     paths: Dict[str, Any] = data.get("paths", {})
@@ -95,17 +112,17 @@ def _load_yaml_config() -> Dict[str, Any]:
         data["offline_mode"] = os.environ["OFFLINE_MODE"].lower() in {"1", "true", "yes"}
 
     if "MODEL_ID" in os.environ:
-        llm: Dict[str, Any] = data.get("llm", {})
+        llm: Dict[str, Any] = dict(data.get("llm", {}))
         llm["model_id"] = os.environ["MODEL_ID"]
         data["llm"] = llm
 
     if "LLM_TEMPERATURE" in os.environ:
-        llm = data.get("llm", {})
+        llm = dict(data.get("llm", {}))
         llm["temperature"] = float(os.environ["LLM_TEMPERATURE"])
         data["llm"] = llm
 
     if "LLM_MAX_TOKENS" in os.environ:
-        llm = data.get("llm", {})
+        llm = dict(data.get("llm", {}))
         llm["max_output_tokens"] = int(os.environ["LLM_MAX_TOKENS"])
         data["llm"] = llm
 
@@ -9,6 +9,7 @@ from pathlib import Path
 from typing import Any, Dict
 
 import httpx
+import orjson
 
 from .config import Settings, load_settings
 
@@ -89,9 +90,9 @@ class GroqClient:
             json=payload,
         )
         response.raise_for_status()
-        data = response.json()
+        data = orjson.loads(response.content)
         content = data["choices"][0]["message"]["content"]
-        obj = json.loads(content)
+        obj = orjson.loads(content)
 
         rationale = obj.get("rationale", "Groq completion produced no rationale")
         confidence = float(obj.get("confidence", 0.8))
@@ -136,7 +137,7 @@ class GroqClient:
             json=payload,
         )
         response.raise_for_status()
-        data = response.json()
+        data = orjson.loads(response.content)
         content = data["choices"][0]["message"]["content"]
 
         cassette_path = self.fixtures_dir / "reports" / f"{cache_key}.txt"
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import hashlib
+import json
 from typing import Any, Dict, List, Tuple
 
 from jsonschema import Draft202012Validator, ValidationError
@@ -62,8 +63,6 @@ def validate_screening_result(
 def hash_payload(payload: Dict[str, Any]) -> str:
     """Stable SHA256 hash of a JSON-like dict for deduplication."""
 
-    import json
-
     canonical = json.dumps(payload, sort_keys=True, separators=(",", ":")).encode("utf-8")
     return hashlib.sha256(canonical).hexdigest()
 
@@ -4,8 +4,8 @@ Feature: 003-langgraph-rule-extraction
 """
 
 import asyncio
-import json
 from typing import Any
+import orjson
 import structlog
 from groq import AsyncGroq
 from tenacity import (
@@ -151,7 +151,7 @@ class GroqClient:
             Tuple of (parsed_json_dict, metadata_dict)
 
         Raises:
-            json.JSONDecodeError: If response is not valid JSON
+            orjson.JSONDecodeError: If response is not valid JSON
         """
         messages = [
             {"role": "system", "content": system_prompt},
@@ -169,7 +169,7 @@ class GroqClient:
         )
 
         try:
-            parsed_json = json.loads(response_text)
+            parsed_json = orjson.loads(response_text)
 
             # Optional schema validation
             if json_schema:
@@ -178,7 +178,7 @@ class GroqClient:
 
             return parsed_json, metadata
 
-        except json.JSONDecodeError as e:
+        except orjson.JSONDecodeError as e:
             logger.error("Failed to parse JSON response", error=str(e), response=response_text[:500])
             # Return empty result with error metadata
             return {
@@ -242,12 +242,12 @@ OUTPUT:
             elif "```" in json_part:
                 json_part = json_part.split("```")[1].split("```")[0].strip()
 
-            parsed_json = json.loads(json_part)
+            parsed_json = orjson.loads(json_part)
             parsed_json["_reasoning"] = reasoning  # Attach reasoning to result
 
             return parsed_json, metadata
 
-        except (json.JSONDecodeError, IndexError) as e:
+        except (orjson.JSONDecodeError, IndexError) as e:
             logger.error("Failed to parse CoT response", error=str(e))
             return {
                 "error": "Invalid CoT response",
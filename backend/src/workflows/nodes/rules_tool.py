@@ -3,6 +3,7 @@ Rules Tool Node - Normalizes, deduplicates, and persists compliance rules.
 Feature: 003-langgraph-rule-extraction
 """
 
+import json
 import structlog
 from datetime import datetime
 from typing import Any
@@ -284,8 +285,6 @@ def _calculate_rule_similarity(rule_data_1: dict, rule_data_2: dict) -> float:
     Returns:
         Similarity score 0.0-1.0
     """
-    import json
-
     str1 = json.dumps(rule_data_1, sort_keys=True)
     str2 = json.dumps(rule_data_2, sort_keys=True)
 
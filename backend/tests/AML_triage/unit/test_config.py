@@ -31,3 +31,33 @@ def test_missing_config_raises(monkeypatch):
     monkeypatch.setenv("APP_CONFIG", "missing.yaml")
     with pytest.raises(SettingsError):
         load_settings(force_reload=True)
+
+
+def test_reload_reuses_parse_until_file_changes(monkeypatch, tmp_path):
+    config_file = tmp_path / "app.yaml"
+    config_file.write_text(
+        """
+schema_version: v2
+llm:
+  temperature: 0.2
+paths:
+  logs_dir: {logs}
+""".format(logs=tmp_path / "logs"),
+        encoding="utf-8",
+    )
+    monkeypatch.setenv("APP_CONFIG", str(config_file))
+    monkeypatch.setenv("LLM_TEMPERATURE", "0.5")
+
+    first = load_settings(force_reload=True)
+    monkeypatch.delenv("LLM_TEMPERATURE")
+    second = load_settings(force_reload=True)
+
+    # The env override applied to the first load must not leak into the cached parse
+    assert first.llm.temperature == 0.5
+    assert second.llm.temperature == 0.2
+
+    config_file.write_text(config_file.read_text(encoding="utf-8").replace("v2", "v3"), encoding="utf-8")
+    stat = config_file.stat()
+    os.utime(config_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    assert load_settings(force_reload=True).schema_version == "v3"
@@ -0,0 +1,31 @@
+from backend.services.alert_service import AlertService
+
+
+def test_generate_investigation_steps_maps_rules_and_patterns():
+    service = AlertService()
+
+    steps = service._generate_investigation_steps(
+        verdict="fail",
+        assigned_team="compliance",
+        triggered_rules=[
+            {"rule_type": "sanctions_screening"},
+            {"rule_type": "unknown_rule"},
+            {"rule_type": "high_risk_jurisdiction"},
+            {"rule_type": "transaction_amount_threshold"},
+        ],
+        detected_patterns=[
+            {"pattern_type": "structuring"},
+            {},
+        ],
+    )
+
+    assert steps == [
+        "Analyze transaction patterns and history",
+        "Review AML risk indicators",
+        "Assess customer due diligence documentation",
+        "Perform enhanced sanctions screening",
+        "Review country risk assessment",
+        "Investigate potential structuring scheme",
+        "Escalate to senior compliance officer if unresolved",
+    ]
+
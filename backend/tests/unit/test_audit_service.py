@@ -0,0 +1,154 @@
+import pytest
+from uuid import uuid4
+
+from backend.core.config import settings
+from backend.core.observability import audit_background_write_failures_total
+from backend.services.audit_service import AuditService
+
+
+class _FakeRedis:
+    """In-memory stand-in for the redis.asyncio calls AuditService makes (no expiry)."""
+
+    def __init__(self):
+        self.values = {}
+
+    async def get(self, key):
+        return self.values.get(key)
+
+    async def set(self, key, value, ex=None, nx=False):
+        if nx and key in self.values:
+            return None
+        self.values[key] = value
+        return True
+
+    async def delete(self, key):
+        self.values.pop(key, None)
+
+
+def _service_with_dedup():
+    service = AuditService()
+    service._redis = _FakeRedis()
+    return service
+
+
+def _decision_kwargs(trace_id, action="payment_analysis"):
+    return {
+        "trace_id": trace_id,
+        "payment_id": uuid4(),
+        "action": action,
+        "verdict": "suspicious",
+        "assigned_team": "compliance",
+        "risk_score": 55.0,
+        "decision_rationale": "Velocity anomaly",
+        "triggered_rules_count": 1,
+        "detected_patterns_count": 1,
+        "analysis_duration_ms": 120,
+        "llm_model": "test-model",
+    }
+
+
+@pytest.mark.asyncio
+async def test_log_analysis_decision_deduplicates_within_window():
+    service = _service_with_dedup()
+    trace_id = uuid4()
+
+    first = await service.log_analysis_decision(**_decision_kwargs(trace_id))
+    second = await service.log_analysis_decision(**_decision_kwargs(trace_id))
+    other_action = await service.log_analysis_decision(
+        **_decision_kwargs(trace_id, action="verdict_calculated")
+    )
+
+    assert first == second
+    assert other_action != first
+
+
+@pytest.mark.asyncio
+async def test_log_alert_action_keys_on_every_field():
+    service = _service_with_dedup()
+    trace_id, alert_id = uuid4(), uuid4()
+    transition = (trace_id, alert_id, "status_updated", "pending -> in_progress")
+
+    first = await service.log_alert_action(*transition, actor="alice")
+    repeat = await service.log_alert_action(*transition, actor="alice")
+    other_actor = await service.log_alert_action(*transition, actor="bob")
+    with_notes = await service.log_alert_action(*transition, investigation_notes="Called client", actor="alice")
+    next_step = await service.log_alert_action(trace_id, alert_id, "status_updated", "in_progress -> resolved")
+
+    assert first == repeat
+    assert len({first, other_actor, with_notes, next_step}) == 4
+
+
+@pytest.mark.asyncio
+async def test_failed_alert_action_write_is_not_deduplicated():
+    service = _service_with_dedup()
+    written = []
+
+    async def flaky_write(audit_id, *args):
+        if not written:
+            written.append(None)
+            raise ConnectionError("database unavailable")
+        written.append(audit_id)
+
+    service._write_alert_action = flaky_write
+    trace_id, alert_id = uuid4(), uuid4()
+
+    with pytest.raises(ConnectionError):
+        await service.log_alert_action(trace_id, alert_id, "status_updated", "pending -> resolved")
+    audit_id = await service.log_alert_action(trace_id, alert_id, "status_updated", "pending -> resolved")
+
+    assert written == [None, audit_id]
+
+
+@pytest.mark.asyncio
+async def test_dedup_is_off_without_redis(monkeypatch):
+    monkeypatch.setattr(settings, "redis_url", "")
+    service = AuditService()
+    trace_id = uuid4()
+
+    first = await service.log_analysis_decision(**_decision_kwargs(trace_id))
+    second = await service.log_analysis_decision(**_decision_kwargs(trace_id))
+
+    assert first != second
+
+
+@pytest.mark.asyncio
+async def test_log_alert_action_nowait_returns_id_before_write():
+    service = _service_with_dedup()
+    written = []
+
+    async def record_write(audit_id, *args):
+        written.append(audit_id)
+
+    service._write_alert_action = record_write
+    trace_id, alert_id = uuid4(), uuid4()
+
+    audit_id = await service.log_alert_action_nowait(trace_id, alert_id, "status_updated", "pending -> resolved")
+    assert written == []
+
+    await service.drain_background_writes()
+    assert written == [audit_id]
+    assert await service.log_alert_action(
+        trace_id, alert_id, "status_updated", "pending -> resolved"
+    ) == audit_id
+
+
+@pytest.mark.asyncio
+async def test_log_alert_action_nowait_releases_failed_write():
+    service = _service_with_dedup()
+
+    async def failing_write(audit_id, *args):
+        raise ConnectionError("database unavailable")
+
+    service._write_alert_action = failing_write
+    failures = audit_background_write_failures_total.labels(action="status_updated")
+    failures_before = failures._value.get()
+    trace_id, alert_id = uuid4(), uuid4()
+
+    lost_id = await service.log_alert_action_nowait(trace_id, alert_id, "status_updated", "pending -> resolved")
+    await service.drain_background_writes()
+
+    assert failures._value.get() == failures_before + 1
+    assert service._redis.values == {}
+    retry_id = await service.log_alert_action_nowait(trace_id, alert_id, "status_updated", "pending -> resolved")
+    await service.drain_background_writes()
+    assert retry_id != lost_id
@@ -0,0 +1,286 @@
+import io
+import json
+import random
+import sys
+import threading
+from types import ModuleType, SimpleNamespace
+
+import imagehash
+import numpy as np
+import pytest
+from PIL import Image
+
+from backend.models.document import ReverseImageSearchResult
+from backend.services import authenticity_service
+from backend.services.authenticity_service import (
+    AuthenticityService,
+    _ela_stats,
+    _hamming_distances,
+    _hamming_matches,
+    _luma_std,
+    _phash,
+    _vision_upload_bytes,
+)
+
+
+def test_hamming_distances_matches_bit_count():
+    rng = random.Random(7)
+    hashes = [rng.getrandbits(64) for _ in range(256)]
+    query = rng.getrandbits(64)
+
+    distances = _hamming_distances(np.array(hashes, dtype=np.uint64), query)
+
+    assert [int(d) for d in distances] == [bin(h ^ query).count("1") for h in hashes]
+
+
+def test_check_duplicates_finds_corpus_image(tmp_path):
+    service = AuthenticityService(corpus_dir=str(tmp_path))
+    image = Image.effect_noise((64, 64), 50)
+    service.add_to_corpus("known.png", image)
+
+    result = service.check_duplicates(service.compute_phash(image))
+
+    assert [d["file"] for d in result.duplicates_found] == ["known.png"]
+    assert result.duplicates_found[0]["hamming_distance"] == 0
+    assert result.similarity_scores == [1.0]
+
+    reloaded = AuthenticityService(corpus_dir=str(tmp_path))
+    assert reloaded.check_duplicates(service.compute_phash(image)).duplicates_found
+
+
+def test_legacy_json_corpus_is_imported(tmp_path):
+    image = Image.effect_noise((64, 64), 50)
+    phash_value = AuthenticityService(corpus_dir=str(tmp_path / "scratch")).compute_phash(image)
+    (tmp_path / "phash_db.json").write_text(json.dumps({"legacy.png": phash_value}))
+
+    service = AuthenticityService(corpus_dir=str(tmp_path))
+
+    assert not (tmp_path / "phash_db.json").exists()
+    result = service.check_duplicates(phash_value)
+    assert result.duplicates_found == [
+        {"file": "legacy.png", "hash": phash_value, "hamming_distance": 0}
+    ]
+
+
+def test_compute_phash_memoizes_by_content_hash(tmp_path, monkeypatch):
+    image = Image.effect_noise((64, 64), 50)
+    content_sha = b"\x01" * 32
+    service = AuthenticityService(corpus_dir=str(tmp_path))
+    expected = service.compute_phash(image, content_sha)
+
+    def fail_phash(_image):
+        raise AssertionError("pHash should come from the memo")
+
+    monkeypatch.setattr("backend.services.authenticity_service._phash", fail_phash)
+
+    assert service.compute_phash(image, content_sha) == expected
+    assert AuthenticityService(corpus_dir=str(tmp_path)).compute_phash(image, content_sha) == expected
+
+
+@pytest.mark.parametrize("shape", [(40, 50, 3), (12, 7, 3), (40, 50, 3)])
+def test_ela_stats_matches_float_reference(shape):
+    rng = np.random.default_rng(3)
+    original = rng.integers(0, 256, shape, dtype=np.uint8)
+    resaved = rng.integers(0, 256, shape, dtype=np.uint8)
+    diff = np.abs(original.astype(np.float64) - resaved)
+
+    mean, variance = _ela_stats(original, resaved)
+
+    assert mean == pytest.approx(diff.mean())
+    assert variance == pytest.approx(diff.var())
+
+
+def test_ela_scratch_pool_stays_bounded():
+    shape = (20, 20, 3)
+    original = np.zeros(shape, dtype=np.uint8)
+    barrier = threading.Barrier(8)
+
+    def worker():
+        barrier.wait()
+        for _ in range(5):
+            _ela_stats(original, original)
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(authenticity_service._scratch_pool) <= authenticity_service._SCRATCH_POOL_SIZE
+
+
+def _jpeg_with_exif(**tags):
+    exif = Image.Exif()
+    for tag, value in tags.items():
+        exif[int(tag)] = value
+    buffer = io.BytesIO()
+    Image.new("RGB", (32, 32)).save(buffer, "JPEG", exif=exif.tobytes())
+    buffer.seek(0)
+    return Image.open(buffer)
+
+
+def test_check_exif_reads_ifd0_fields(tmp_path):
+    service = AuthenticityService(corpus_dir=str(tmp_path))
+    image = _jpeg_with_exif(**{
+        str(0x010F): "Canon",
+        str(0x0131): "Adobe Photoshop 24",
+        str(0x0132): "2099:01:01 00:00:00",
+    })
+
+    exif = service.check_exif(image)
+
+    assert exif.present
+    assert exif.camera_make == "Canon"
+    assert exif.software == "Adobe Photoshop 24"
+    assert "Future date in EXIF" in exif.anomalies
+    assert any("Photoshop" in anomaly for anomaly in exif.anomalies)
+
+
+def test_check_exif_without_exif_block(tmp_path):
+    service = AuthenticityService(corpus_dir=str(tmp_path))
+
+    assert not service.check_exif(Image.new("RGB", (32, 32))).present
+
+
+def test_luma_std_matches_gray_std_for_neutral_pixels():
+    rng = np.random.default_rng(1)
+    gray = rng.integers(0, 256, size=(24, 24), dtype=np.uint8)
+    rgb = np.repeat(gray[..., None], 3, axis=2)
+
+    assert _luma_std(rgb) == pytest.approx(float(gray.std()))
+
+
+def test_check_authenticity_runs_reverse_search_off_thread(tmp_path, monkeypatch):
+    service = AuthenticityService(corpus_dir=str(tmp_path))
+    search_threads = []
+    searched_images = []
+    result = ReverseImageSearchResult(
+        exact_matches=[], partial_matches=[], total_matches=0, authenticity_risk="Low"
+    )
+
+    def fake_reverse_search(image):
+        search_threads.append(threading.current_thread())
+        searched_images.append(image)
+        return result
+
+    monkeypatch.setattr(service, "reverse_image_search", fake_reverse_search)
+
+    image = Image.new("RGB", (32, 32), "white")
+    check = service.check_authenticity(image)
+
+    assert check.reverse_search == result
+    assert search_threads and search_threads[0] is not threading.current_thread()
+    # The worker must not share the image the local checks save from
+    assert searched_images[0] is not image
+    assert searched_images[0].tobytes() == image.tobytes()
+
+
+def test_phash_matches_imagehash():
+    rng = np.random.default_rng(3)
+    for _ in range(10):
+        pixels = rng.integers(0, 256, size=(48, 64, 3), dtype=np.uint8)
+        image = Image.fromarray(pixels).resize((256, 192))
+
+        assert f"{_phash(image):016x}" == str(imagehash.phash(image))
+
+
+def test_reverse_image_search_uploads_jpeg(tmp_path, monkeypatch):
+    uploads = []
+
+    class FakeClient:
+        def web_detection(self, image):
+            uploads.append(image.content)
+            web_detection = SimpleNamespace(
+                full_matching_images=[SimpleNamespace(url="https://example.com/a.jpg")],
+                partial_matching_images=[],
+                pages_with_matching_images=[],
+            )
+            return SimpleNamespace(error=SimpleNamespace(message=""), web_detection=web_detection)
+
+    vision = SimpleNamespace(
+        ImageAnnotatorClient=FakeClient,
+        Image=lambda content: SimpleNamespace(content=content),
+    )
+    google = ModuleType("google")
+    google_cloud = ModuleType("google.cloud")
+    google_cloud.vision = vision
+    google.cloud = google_cloud
+    monkeypatch.setitem(sys.modules, "google", google)
+    monkeypatch.setitem(sys.modules, "google.cloud", google_cloud)
+    monkeypatch.setitem(sys.modules, "google.cloud.vision", vision)
+
+    service = AuthenticityService(corpus_dir=str(tmp_path))
+
+    result = service.reverse_image_search(Image.new("RGBA", (16, 16)))
+
+    assert Image.open(io.BytesIO(uploads[0])).format == "JPEG"
+    assert result.total_matches == 1
+    assert result.exact_matches[0].url == "https://example.com/a.jpg"
+
+
+def test_vision_upload_bytes_downscales_large_images():
+    upload = Image.open(io.BytesIO(_vision_upload_bytes(Image.new("RGBA", (4000, 3000)))))
+
+    assert upload.format == "JPEG"
+    assert upload.size == (1024, 768)
+
+
+def test_hamming_matches_across_shards(monkeypatch):
+    monkeypatch.setattr("backend.services.authenticity_service.HAMMING_SCAN_CHUNK", 100)
+    rng = np.random.default_rng(5)
+    hashes = rng.integers(0, 2**63, size=1050, dtype=np.int64).view(np.uint64)
+    query = int(hashes[10])
+    hashes[[17, 420, 1049]] = np.uint64(query ^ 0b101)
+
+    indices, distances = _hamming_matches(hashes, query, threshold=2)
+
+    assert indices.tolist() == [10, 17, 420, 1049]
+    assert distances.tolist() == [0, 2, 2, 2]
+
+
+def test_corpus_hashes_persist_in_mapped_array(tmp_path):
+    service = AuthenticityService(corpus_dir=str(tmp_path))
+    first = Image.effect_noise((64, 64), 40)
+    second = Image.linear_gradient("L")
+    service.add_to_corpus("first.png", first)
+    service.add_to_corpus("second.png", second)
+    service.add_to_corpus("first.png", second)
+
+    reloaded = AuthenticityService(corpus_dir=str(tmp_path))
+    result = reloaded.check_duplicates(reloaded.compute_phash(second), threshold=0)
+
+    assert isinstance(reloaded._hash_arr, np.memmap)
+    assert (tmp_path / "phash.u64").stat().st_size == 16
+    assert [dup["file"] for dup in result.duplicates_found] == ["first.png", "second.png"]
+
+
+def test_hash_array_rebuilds_after_interrupted_update(tmp_path):
+    service = AuthenticityService(corpus_dir=str(tmp_path))
+    target = Image.linear_gradient("L")
+    service.add_to_corpus("a.png", target)
+    # Simulate a crash between the slot write and the commit of an update
+    (tmp_path / "phash.u64.dirty").touch()
+    with open(tmp_path / "phash.u64", "r+b") as f:
+        f.write(np.uint64(0).tobytes())
+
+    reloaded = AuthenticityService(corpus_dir=str(tmp_path))
+    result = reloaded.check_duplicates(reloaded.compute_phash(target), threshold=0)
+
+    assert [dup["file"] for dup in result.duplicates_found] == ["a.png"]
+    assert not (tmp_path / "phash.u64.dirty").exists()
+
+
+def test_hash_array_rebuilds_after_rowid_gaps(tmp_path):
+    service = AuthenticityService(corpus_dir=str(tmp_path))
+    for name in ("a.png", "b.png", "c.png"):
+        service.add_to_corpus(name, Image.effect_noise((32, 32), 30))
+    with service._conn:
+        service._conn.execute("DELETE FROM phash WHERE file = 'a.png'")
+    target = Image.linear_gradient("L")
+    service.add_to_corpus("d.png", target)
+
+    reloaded = AuthenticityService(corpus_dir=str(tmp_path))
+    result = reloaded.check_duplicates(reloaded.compute_phash(target), threshold=0)
+
+    assert len(reloaded._hash_arr) == 3
+    assert [dup["file"] for dup in result.duplicates_found] == ["d.png"]
@@ -0,0 +1,38 @@
+import asyncio
+import sys
+import types
+
+import pytest
+
+from backend.services import db_pool
+
+
+@pytest.mark.asyncio
+async def test_get_pool_creates_pool_once(monkeypatch):
+    created = []
+
+    class FakePool:
+        closed = False
+
+        async def close(self):
+            self.closed = True
+
+    async def create_pool(**kwargs):
+        created.append(kwargs)
+        await asyncio.sleep(0)
+        return FakePool()
+
+    monkeypatch.setitem(sys.modules, "asyncpg", types.SimpleNamespace(create_pool=create_pool))
+    monkeypatch.setattr(db_pool, "_pool", None)
+    monkeypatch.setattr(db_pool, "_pool_lock", None)
+
+    pools = await asyncio.gather(*(db_pool.get_pool() for _ in range(5)))
+
+    assert len(created) == 1
+    assert all(pool is pools[0] for pool in pools)
+    assert created[0]["max_size"] == db_pool.settings.database_pool_size
+
+    await db_pool.close_pool()
+
+    assert pools[0].closed
+    assert db_pool._pool is None
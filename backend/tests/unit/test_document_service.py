@@ -0,0 +1,165 @@
+import os
+from pathlib import Path
+
+from backend.services import document_service as document_service_module
+from backend.services.document_service import DocumentService
+
+TEMPLATES_DIR = Path(__file__).resolve().parents[2] / "templates" / "document_schemas"
+
+
+def test_find_missing_sections_matches_partial_headers():
+    service = DocumentService(templates_dir=str(TEMPLATES_DIR))
+    required = service._lower_required_sections(
+        {"required_headers": ["Executive Summary", "Findings", "Recommendations"]}
+    )
+
+    missing = service._find_missing_sections(["EXECUTIVE SUMMARY OVERVIEW", "Finding"], required)
+
+    assert missing == ["Recommendations"]
+
+
+def test_find_missing_sections_without_headers():
+    service = DocumentService(templates_dir=str(TEMPLATES_DIR))
+    required = service._lower_required_sections({"required_sections": ["Scope"]})
+
+    assert service._find_missing_sections([], required) == ["Scope"]
+
+
+def test_analyze_format_uses_cached_required_sections():
+    service = DocumentService(templates_dir=str(TEMPLATES_DIR))
+    template = service.load_template("contract", "msa")
+    required = template["required_headers"]
+
+    result = service.analyze_format("DEFINITIONS\nsome body text", "contract", "msa")
+
+    assert "Definitions" not in result.missing_sections
+    assert result.missing_sections == [r for r in required if r != "Definitions"]
+
+
+def test_templates_reload_when_yaml_changes(tmp_path):
+    template_path = tmp_path / "memo.yaml"
+    template_path.write_text("short:\n  required_headers: [Purpose]\n")
+    service = DocumentService(templates_dir=str(tmp_path))
+
+    assert service.list_subtypes("memo") == ["short"]
+    assert service.load_template("memo", "short")["required_headers"] == ["Purpose"]
+
+    template_path.write_text("long:\n  required_headers: [Background]\n")
+    os.utime(template_path, (1, 1))
+
+    assert service.list_subtypes("memo") == ["long"]
+    assert service.load_template("memo", "long")["required_headers"] == ["Background"]
+    assert "memo:short" not in service._template_cache
+
+
+def test_check_spelling_matches_spell_checker():
+    service = DocumentService(templates_dir=str(TEMPLATES_DIR))
+    text = "The agreemnt is signed by the partys on the date inf below the the"
+
+    error_rate, misspelled = service._check_spelling(text)
+
+    words = text.lower().split()
+    expected = service.spell_checker.unknown(words)
+    assert set(misspelled) == expected == {"agreemnt", "partys"}
+    assert error_rate == len(expected) / len(words)
+
+
+def test_find_headers_matches_line_rules():
+    service = DocumentService(templates_dir=str(TEMPLATES_DIR))
+    text = "\n".join([
+        "  EXECUTIVE SUMMARY  ",
+        "Scope of Work:",
+        "Payment Terms",
+        "",
+        "this is an ordinary body sentence that runs on well past fifty characters",
+        "A LONG SHOUTED LINE THAT KEEPS GOING WELL BEYOND FIFTY CHARACTERS 2024",
+        "A long Title Case line that is far too long to be a header at all:",
+        "12345",
+        "Notes::  \r",
+        "\tÉTUDE DE CAS",
+    ])
+
+    assert service._find_headers(text) == [
+        "EXECUTIVE SUMMARY",
+        "Scope of Work",
+        "Payment Terms",
+        "A LONG SHOUTED LINE THAT KEEPS GOING WELL BEYOND FIFTY CHARACTERS 2024",
+        "12345",
+        "Notes",
+        "ÉTUDE DE CAS",
+    ]
+
+
+def _minimal_pdf(page_texts):
+    """Build a PDF with one Helvetica text line per page (None for a blank page)."""
+    objects = ["<< /Type /Catalog /Pages 2 0 R >>", None, "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for text in page_texts:
+        stream = f"BT /F1 12 Tf 72 720 Td ({text}) Tj ET" if text else ""
+        objects.append(f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream")
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {len(objects)} 0 R >>"
+        )
+        kids.append(f"{len(objects)} 0 R")
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {len(kids)} >>"
+
+    out = b"%PDF-1.4\n"
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += f"{number} 0 obj\n{body}\nendobj\n".encode()
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    out += "".join(f"{offset:010d} 00000 n \n" for offset in offsets).encode()
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+    return out
+
+
+def test_extract_from_pdf_reads_text_layer_and_ocrs_blank_pages(monkeypatch):
+    service = DocumentService(templates_dir=str(TEMPLATES_DIR))
+    ocr_calls = []
+
+    def fake_ocr(content, page_index):
+        ocr_calls.append(page_index)
+        return "SCANNED PAGE"
+
+    monkeypatch.setattr("backend.services.document_service._ocr_pdf_page", fake_ocr)
+
+    text = service._extract_from_pdf(_minimal_pdf(["MASTER SERVICES AGREEMENT", None]))
+
+    assert text == "MASTER SERVICES AGREEMENT\n\nSCANNED PAGE"
+    assert ocr_calls == [1]
+
+
+def test_extract_from_pdf_sends_workers_a_file_path_not_the_bytes(monkeypatch):
+    service = DocumentService(templates_dir=str(TEMPLATES_DIR))
+    sources = []
+
+    class InlinePool:
+        def map(self, fn, *iterables):
+            for source, page_index in zip(*iterables):
+                sources.append(source)
+                with open(source, "rb") as handle:
+                    assert handle.read(5) == b"%PDF-"
+                yield f"SCANNED {page_index}"
+
+    monkeypatch.setattr(document_service_module, "_get_ocr_pool", InlinePool)
+
+    text = service._extract_from_pdf(_minimal_pdf(["COVER", None, None]))
+
+    assert text == "COVER\n\nSCANNED 1\n\nSCANNED 2"
+    assert len(sources) == 2 and sources[0] == sources[1]
+    assert isinstance(sources[0], str) and not os.path.exists(sources[0])
+
+
+def test_ocr_pool_is_shared_and_shut_down():
+    try:
+        pool = document_service_module._get_ocr_pool()
+        assert document_service_module._get_ocr_pool() is pool
+        # Worker starts from the forkserver and can import the OCR task
+        assert pool.submit(document_service_module._ocr_pdf_page, b"not a pdf", 0).result(timeout=60) == ""
+    finally:
+        document_service_module.shutdown_ocr_pool()
+
+    assert document_service_module._ocr_pool is None
@@ -0,0 +1,38 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from backend.services.history_service import HistoryService, PaymentHistoryBatch
+
+NOW = datetime(2025, 3, 1, 12, 0, tzinfo=timezone.utc)
+
+
+def _row(transaction_id, days_ago, originator="ACC-1", beneficiary="ACC-2", currency="USD"):
+    return {
+        "transaction_id": transaction_id,
+        "originator_account": originator,
+        "beneficiary_account": beneficiary,
+        "amount": 100.0,
+        "currency": currency,
+        "transaction_date": NOW - timedelta(days=days_ago),
+    }
+
+
+def test_from_records_builds_sorted_columns():
+    batch = PaymentHistoryBatch.from_records([
+        _row("t2", 1, originator="ACC-2", beneficiary="ACC-3", currency="EUR"),
+        _row("t1", 4),
+    ])
+
+    assert len(batch) == 2
+    assert batch.transaction_ids.tolist() == ["t1", "t2"]
+    assert batch.accounts[batch.originator_codes].tolist() == ["ACC-1", "ACC-2"]
+    assert batch.accounts[batch.beneficiary_codes].tolist() == ["ACC-2", "ACC-3"]
+    assert batch.currencies[batch.currency_codes].tolist() == ["USD", "EUR"]
+
+
+@pytest.mark.asyncio
+async def test_velocity_metrics_without_history():
+    metrics = await HistoryService().get_velocity_metrics("ACC-1")
+
+    assert metrics == {"mean_frequency": 0, "std_frequency": 0, "recent_frequency": 0}
@@ -0,0 +1,142 @@
+import asyncio
+from types import SimpleNamespace
+
+import httpx
+import orjson
+import pytest
+from groq import APIStatusError
+
+from backend.services.llm_client import GroqClient
+
+
+@pytest.mark.asyncio
+async def test_groq_client_reuses_async_client_per_loop():
+    client = GroqClient(api_key="test-key")
+
+    sdk_client = client._get_client()
+    http_client = sdk_client._client
+
+    assert client._get_client() is sdk_client
+    assert sdk_client.max_retries == 0
+
+    await client.aclose()
+    assert http_client.is_closed
+    assert client.client is None
+
+
+def test_groq_client_closes_client_replaced_on_loop_change():
+    client = GroqClient(api_key="test-key")
+
+    async def first_loop():
+        return client._get_client()._client
+
+    async def second_loop():
+        sdk_client = client._get_client()
+        await asyncio.gather(*client._closing)
+        await client.aclose()
+        return sdk_client
+
+    stale_http_client = asyncio.run(first_loop())
+    fresh_sdk_client = asyncio.run(second_loop())
+
+    assert stale_http_client.is_closed
+    assert fresh_sdk_client._client is not stale_http_client
+
+
+def _completion(content):
+    message = SimpleNamespace(content=content)
+    return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+
+def _stub_sdk_client(client, create):
+    client.client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+    client._client_loop = asyncio.get_running_loop()
+    client._in_flight = asyncio.Semaphore(client.max_in_flight)
+
+
+@pytest.mark.asyncio
+async def test_analyze_transactions_parses_json_content():
+    client = GroqClient(api_key="test-key")
+
+    async def create(**kwargs):
+        return _completion('{"verdict": "suspicious", "risk_score": 72.5}')
+
+    _stub_sdk_client(client, create)
+
+    result = await client.analyze_transactions([{"amount": 1}], "prompt")
+
+    assert result == {"verdict": "suspicious", "risk_score": 72.5}
+
+
+def _status_error(status_code):
+    request = httpx.Request("POST", "https://api.groq.com/openai/v1/chat/completions")
+    response = httpx.Response(status_code, request=request)
+    return APIStatusError(f"status {status_code}", response=response, body=None)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("status_code, expected_calls", [(400, 1), (401, 1), (429, 3), (503, 3)])
+async def test_analyze_transactions_retries_only_transient_statuses(monkeypatch, status_code, expected_calls):
+    client = GroqClient(api_key="test-key")
+    client.initial_retry_delay = 0
+    calls = []
+
+    async def create(**kwargs):
+        calls.append(kwargs)
+        raise _status_error(status_code)
+
+    _stub_sdk_client(client, create)
+
+    with pytest.raises(APIStatusError):
+        await client.analyze_transactions([], "prompt")
+
+    assert len(calls) == expected_calls
+
+
+@pytest.mark.asyncio
+async def test_analyze_transactions_batch_bounds_in_flight_requests():
+    client = GroqClient(api_key="test-key")
+    client.max_in_flight = 2
+    in_flight = 0
+    peak = 0
+
+    async def create(**kwargs):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return _completion(orjson.dumps({"prompt": kwargs["messages"][1]["content"]}).decode())
+
+    _stub_sdk_client(client, create)
+
+    results = await client.analyze_transactions_batch([([{"amount": i}], f"prompt-{i}") for i in range(5)])
+
+    assert [r["prompt"] for r in results] == [f"prompt-{i}" for i in range(5)]
+    assert peak == 2
+
+
+@pytest.mark.asyncio
+async def test_analyze_transactions_reuses_identical_requests():
+    client = GroqClient(api_key="test-key")
+    calls = []
+
+    async def create(**kwargs):
+        calls.append(kwargs)
+        await asyncio.sleep(0)
+        return _completion('{"verdict": "pass"}')
+
+    _stub_sdk_client(client, create)
+    transactions = [{"amount": 10, "currency": "SGD"}]
+
+    concurrent = await asyncio.gather(*(client.analyze_transactions(transactions, "prompt") for _ in range(3)))
+    cached = await client.analyze_transactions([{"currency": "SGD", "amount": 10}], "prompt")
+
+    assert len(calls) == 1
+    assert concurrent == [cached] * 3
+    assert concurrent[0] is not concurrent[1]
+
+    await client.analyze_transactions(transactions, "prompt", use_cache=False)
+    await client.analyze_transactions(transactions, "other prompt")
+
+    assert len(calls) == 3
@@ -0,0 +1,142 @@
+import random
+
+from backend.models.document import (
+    AuthenticityCheck,
+    ELAResult,
+    ExifData,
+    FormatAnalysisResult,
+    RiskJustification,
+)
+from backend.services.risk_scoring_service import RiskScoringService
+
+
+def _format_result(**overrides):
+    fields = {
+        "word_count": 500,
+        "spell_error_rate": 0.0,
+        "double_space_count": 0,
+        "tab_count": 0,
+        "missing_sections": [],
+        "section_coverage": 1.0,
+    }
+    fields.update(overrides)
+    return FormatAnalysisResult(**fields)
+
+
+def test_calculate_format_risk_applies_template_thresholds():
+    service = RiskScoringService()
+    template = {
+        "spelling_error_rate_max": 0.02,
+        "spacing_rules": {"max_tabs": 10},
+        "risk_overrides": {"missing_section": 2},
+    }
+    result = _format_result(
+        spell_error_rate=0.04,
+        double_space_count=12,
+        tab_count=22,
+        missing_sections=["Scope", "Term"],
+        section_coverage=0.5,
+    )
+
+    score, justifications = service.calculate_format_risk(result, template)
+
+    # spelling 10*3 + double spaces 2*2 + tabs 2*2 + coverage 5*4 + overrides 2*2
+    assert score == 62.0
+    assert [j.severity for j in justifications] == [10, 2, 2, 5]
+
+
+def test_template_config_is_compiled_once_per_template():
+    service = RiskScoringService()
+    template = {"spelling_error_rate_max": 0.1}
+
+    first = service._template_config(template)
+
+    assert service._template_config(template) is first
+    assert service._template_config({"spelling_error_rate_max": 0.1}) is not first
+    assert first.max_tabs == 20 and first.missing_section_severity is None
+
+
+def test_calculate_format_risk_batch_matches_scalar_path():
+    rng = random.Random(11)
+    service = RiskScoringService()
+    template = {
+        "spelling_error_rate_max": 0.03,
+        "spacing_rules": {"max_tabs": 15},
+        "risk_overrides": {"missing_section": 4},
+    }
+    sections = ["Scope", "Term", "Fees", "Liability"]
+    results = [
+        _format_result(
+            spell_error_rate=rng.choice([0.0, 0.01, 0.03, 0.031, 0.07, 0.5]),
+            double_space_count=rng.randint(0, 40),
+            tab_count=rng.randint(0, 60),
+            missing_sections=sections[:rng.randint(0, 4)],
+            section_coverage=rng.choice([1.0, 0.75, 0.7, 0.69, 0.3, 0.0]),
+        )
+        for _ in range(200)
+    ]
+
+    batch = service.calculate_format_risk_batch(results, template)
+
+    assert batch == [service.calculate_format_risk(result, template) for result in results]
+    assert service.calculate_format_risk_batch([], template) == []
+
+
+def test_aggregate_risk_score_keeps_most_severe_justifications_in_order():
+    service = RiskScoringService()
+    format_justifications = [
+        RiskJustification(category="format", severity=severity, reason=f"format-{i}")
+        for i, severity in enumerate([3, 7, 3, 1])
+    ]
+    authenticity_justifications = [
+        RiskJustification(category="authenticity", severity=severity, reason=f"auth-{i}")
+        for i, severity in enumerate([7, 9])
+    ]
+
+    full = service.aggregate_risk_score(
+        40.0, format_justifications, 20.0, authenticity_justifications, top_k=None
+    )
+    top = service.aggregate_risk_score(
+        40.0, format_justifications, 20.0, authenticity_justifications, top_k=3
+    )
+
+    assert [j.reason for j in full.justifications] == [
+        "auth-1", "format-1", "auth-0", "format-0", "format-2", "format-3"
+    ]
+    assert top.justifications == full.justifications[:3]
+    assert full.overall_score == top.overall_score == 32.0
+
+
+def test_score_document_matches_separate_scoring_steps():
+    service = RiskScoringService()
+    template = {"spelling_error_rate_max": 0.05, "risk_overrides": {"missing_section": 2}}
+    format_result = _format_result(
+        spell_error_rate=0.2, double_space_count=12, section_coverage=0.5, missing_sections=["Summary"]
+    )
+    auth_check = AuthenticityCheck(
+        applicable=True,
+        exif=ExifData(present=False),
+        ela=ELAResult(mean_score=12.0, variance=40.0, anomaly_detected=True, confidence=0.7),
+    )
+
+    format_risk, format_justifications = service.calculate_format_risk(format_result, template)
+    auth_risk, auth_justifications = service.calculate_authenticity_risk(auth_check)
+    expected = service.aggregate_risk_score(format_risk, format_justifications, auth_risk, auth_justifications)
+
+    assert service.score_document(format_result, auth_check, template) == expected
+
+
+def test_empty_template_uses_default_thresholds():
+    service = RiskScoringService()
+    format_result = _format_result(spell_error_rate=0.1, tab_count=31, section_coverage=0.65)
+
+    assert service.calculate_format_risk(format_result, {}) == service.calculate_format_risk(
+        format_result, {"spelling_error_rate_max": 0.05, "spacing_rules": {"max_tabs": 20}}
+    )
+
+
+def test_calculate_authenticity_risk_not_applicable_returns_empty_tuple():
+    service = RiskScoringService()
+
+    assert service.calculate_authenticity_risk(None) == (0.0, ())
+    assert service.calculate_authenticity_risk(AuthenticityCheck(applicable=False)) == (0.0, ())
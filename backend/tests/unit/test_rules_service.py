@@ -0,0 +1,237 @@
+import asyncio
+import logging
+import os
+import random
+from uuid import uuid4
+
+import httpx
+import pytest
+
+from backend.services import rules_service as rules_service_module
+from backend.services.rules_service import ComplianceRule, RulesService
+
+
+def _supabase_rows():
+    return [
+        {
+            "id": "33333333-3333-3333-3333-333333333333",
+            "rule_type": "velocity",
+            "jurisdiction": "hk",
+            "regulator": "HKMA",
+            "description": "Velocity limit",
+            "rule_data": {"violation_severity": "high"},
+        }
+    ]
+
+
+@pytest.mark.asyncio
+async def test_fetch_rules_from_supabase_reuses_pooled_client():
+    service = RulesService()
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        return httpx.Response(200, json=_supabase_rows())
+
+    service._http = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    service._http_loop = asyncio.get_running_loop()
+    http_client = service._http
+
+    first = await service._fetch_rules_from_supabase()
+    second = await service._fetch_rules_from_supabase()
+
+    assert len(requests) == 2
+    assert requests[0].url.params["select"] == "id,rule_type,jurisdiction,regulator,description,rule_data"
+    assert service._get_http() is http_client
+    assert [rule.jurisdiction for rule in first + second] == ["HK", "HK"]
+    assert first[0].severity == "high"
+    assert first[0].description == "Velocity limit"
+
+    await service.aclose()
+    assert http_client.is_closed
+    assert service._http is None
+
+
+def test_get_http_closes_client_replaced_on_loop_change():
+    service = RulesService()
+
+    async def first_loop():
+        return service._get_http()
+
+    async def second_loop():
+        http_client = service._get_http()
+        await asyncio.gather(*service._closing)
+        await service.aclose()
+        return http_client
+
+    stale_http_client = asyncio.run(first_loop())
+    fresh_http_client = asyncio.run(second_loop())
+
+    assert stale_http_client.is_closed
+    assert fresh_http_client is not stale_http_client
+
+
+def test_load_rules_from_file_skips_inactive_unvalidated_and_expired(tmp_path, monkeypatch):
+    rules_path = tmp_path / "rules.json"
+    rules_path.write_text(
+        """[
+            {"rule_id": "11111111-1111-1111-1111-111111111111", "rule_type": "threshold", "jurisdiction": "sg"},
+            {"rule_id": "22222222-2222-2222-2222-222222222222", "rule_type": "velocity", "is_active": false},
+            {"rule_id": "33333333-3333-3333-3333-333333333333", "rule_type": "pep", "validation_status": "pending"},
+            {"rule_id": "44444444-4444-4444-4444-444444444444", "rule_type": "edd", "expiry_date": "2000-01-01T00:00:00Z"}
+        ]""",
+        encoding="utf-8",
+    )
+    service = RulesService()
+    monkeypatch.setattr(service, "_resolve_rules_path", lambda: rules_path)
+
+    rules = service._load_rules_from_file()
+
+    assert [(rule.rule_type, rule.jurisdiction) for rule in rules] == [("threshold", "SG")]
+
+
+@pytest.mark.asyncio
+async def test_load_rules_from_source_reparses_only_when_file_changes(tmp_path, monkeypatch):
+    rules_path = tmp_path / "rules.json"
+    rules_path.write_text(
+        '[{"rule_id": "11111111-1111-1111-1111-111111111111", "rule_type": "threshold"}]',
+        encoding="utf-8",
+    )
+    service = RulesService()
+    service._cache_ttl_seconds = 0
+    monkeypatch.setattr(service, "_resolve_rules_path", lambda: rules_path)
+    parses = []
+    load_rules_from_file = service._load_rules_from_file
+
+    def counting_load():
+        parses.append(1)
+        return load_rules_from_file()
+
+    monkeypatch.setattr(service, "_load_rules_from_file", counting_load)
+
+    first = await service._load_rules_from_source()
+    second = await service._load_rules_from_source()
+
+    assert second is first
+    assert len(parses) == 1
+
+    rules_path.write_text(
+        '[{"rule_id": "22222222-2222-2222-2222-222222222222", "rule_type": "velocity"}]',
+        encoding="utf-8",
+    )
+    stat = rules_path.stat()
+    os.utime(rules_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    third = await service._load_rules_from_source()
+
+    assert len(parses) == 2
+    assert [rule.rule_type for rule in third] == ["velocity"]
+
+
+@pytest.mark.asyncio
+async def test_get_active_rules_matches_linear_filter():
+    service = RulesService()
+    rng = random.Random(7)
+    rules = [
+        ComplianceRule(
+            rule_id=uuid4(),
+            rule_type=f"rule_{i}",
+            jurisdiction=rng.choice([None, "*", "sg", "HK", "CH"]),
+            regulator=rng.choice([None, "MAS", "hkma", "FINMA"]),
+            severity="low",
+            description="",
+            rule_data={},
+        )
+        for i in range(60)
+    ]
+
+    async def load():
+        return rules
+
+    service._index_rules(rules)
+    service._load_rules_from_source = load
+
+    for jurisdiction in [None, "sg", "HK", "CH", "US"]:
+        for regulator in [None, "mas", "HKMA", "FINMA"]:
+            expected = [
+                rule
+                for rule in rules
+                if (jurisdiction is None or rule.applies_globally or rule.jurisdiction == jurisdiction.upper())
+                and (regulator is None or not rule.regulator or rule.regulator.upper() == regulator.upper())
+            ]
+            assert await service.get_active_rules(jurisdiction, regulator) == expected
+
+
+def test_compliance_rule_normalizes_jurisdiction_and_regulator():
+    rule = ComplianceRule(
+        rule_id=uuid4(),
+        rule_type="velocity",
+        jurisdiction="sg",
+        regulator="mas",
+        severity="low",
+        description="",
+        rule_data={},
+    )
+    blank = ComplianceRule(
+        rule_id=uuid4(),
+        rule_type="velocity",
+        jurisdiction="",
+        regulator="",
+        severity="low",
+        description="",
+        rule_data={},
+    )
+
+    assert (rule.jurisdiction, rule.regulator) == ("SG", "MAS")
+    assert (blank.jurisdiction, blank.regulator) == (None, None)
+
+
+@pytest.mark.asyncio
+async def test_evaluate_payment_against_rules_does_not_consume_iterable(caplog):
+    service = RulesService()
+    consumed = []
+
+    def rules():
+        consumed.append(True)
+        yield from ()
+
+    with caplog.at_level(logging.DEBUG, logger=service.logger.name):
+        assert await service.evaluate_payment_against_rules({}, rules()) == []
+
+    assert consumed == []
+
+
+def test_rule_ids_and_path_are_reused_across_reloads():
+    service = RulesService()
+    row = _supabase_rows()[0]
+
+    first = service._parse_rule_record(dict(row))
+    second = service._parse_rule_record(dict(row))
+
+    assert first.rule_id is second.rule_id
+    assert service._resolve_rules_path() is service._resolve_rules_path()
+
+
+def test_large_rules_file_is_stream_parsed(tmp_path, monkeypatch):
+    pytest.importorskip("ijson")
+    rules_path = tmp_path / "rules.json"
+    rules_path.write_text(
+        """[
+            {"rule_id": "11111111-1111-1111-1111-111111111111", "rule_type": "threshold",
+             "rule_data": {"threshold": 1500.5}},
+            {"rule_id": "22222222-2222-2222-2222-222222222222", "rule_type": "velocity", "is_active": false}
+        ]""",
+        encoding="utf-8",
+    )
+    service = RulesService()
+    monkeypatch.setattr(service, "_resolve_rules_path", lambda: rules_path)
+    monkeypatch.setattr(rules_service_module, "RULES_STREAM_THRESHOLD_BYTES", 0)
+    streamed = []
+    stream_rules_file = service._stream_rules_file
+    monkeypatch.setattr(service, "_stream_rules_file", lambda path: streamed.append(path) or stream_rules_file(path))
+
+    rules = service._load_rules_from_file()
+
+    assert streamed == [rules_path]
+    assert [(rule.rule_type, rule.rule_data) for rule in rules] == [("threshold", {"threshold": 1500.5})]
+    assert type(rules[0].rule_data["threshold"]) is float
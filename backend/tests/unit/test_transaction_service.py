@@ -0,0 +1,143 @@
+import asyncio
+import os
+
+import pandas as pd
+import pytest
+
+from backend.core.config import settings
+from backend.models.query_params import QueryParameters
+from backend.services import transaction_service as transaction_service_module
+from backend.services.transaction_service import TransactionService
+
+
+@pytest.fixture
+def sample_service(tmp_path):
+    frame = pd.read_csv(settings.transactions_csv_path, nrows=40)
+    # Repeat a row so the query has to deduplicate by transaction_id
+    frame = pd.concat([frame, frame.iloc[[0]]], ignore_index=True)
+    csv_path = tmp_path / "transactions.csv"
+    frame.to_csv(csv_path, index=False)
+    return TransactionService(str(csv_path)), frame
+
+
+def test_query_matches_any_filter_case_insensitively(sample_service):
+    service, frame = sample_service
+    first = frame.iloc[0]
+    second = frame.iloc[5]
+
+    history = service.query(
+        QueryParameters(
+            originator_name=first["originator_name"].upper(),
+            beneficiary_account=second["beneficiary_account"].lower(),
+        )
+    )
+
+    mask = (frame["originator_name"].str.lower() == first["originator_name"].lower()) | (
+        frame["beneficiary_account"].str.lower() == second["beneficiary_account"].lower()
+    )
+    expected_ids = list(dict.fromkeys(frame.loc[mask, "transaction_id"]))
+
+    assert [t.transaction_id for t in history.transactions] == expected_ids
+    assert history.total_count == len(expected_ids)
+    assert history.date_range == (
+        min(t.booking_datetime for t in history.transactions),
+        max(t.booking_datetime for t in history.transactions),
+    )
+
+
+def test_query_maps_missing_values_to_none(sample_service):
+    service, frame = sample_service
+    row = frame[frame["swift_mt"].isna()].iloc[0]
+
+    history = service.query(QueryParameters(originator_account=row["originator_account"]))
+
+    record = next(t for t in history.transactions if t.transaction_id == row["transaction_id"])
+    assert record.swift_mt is None
+
+
+def test_csv_engines_produce_identical_records(sample_service, monkeypatch):
+    service, frame = sample_service
+    params = QueryParameters(originator_name=frame.iloc[0]["originator_name"])
+    expected = service.query(params).transactions
+
+    monkeypatch.setattr(transaction_service_module, "PYARROW_AVAILABLE", False)
+    fallback = TransactionService(service.csv_path).query(params).transactions
+
+    assert fallback == expected
+
+
+@pytest.mark.asyncio
+async def test_concurrent_loads_parse_file_once(sample_service, monkeypatch):
+    service, _ = sample_service
+    reads = []
+    read_table = transaction_service_module._read_table
+
+    def counting_read_table(path):
+        reads.append(path)
+        return read_table(path)
+
+    monkeypatch.setattr(transaction_service_module, "_read_table", counting_read_table)
+
+    frames = await asyncio.gather(*(service.load() for _ in range(8)))
+
+    assert len(reads) == 1
+    assert all(frame is frames[0] for frame in frames)
+
+
+def test_parquet_cache_is_written_then_reused(sample_service, monkeypatch):
+    pytest.importorskip("pyarrow")
+    service, frame = sample_service
+    monkeypatch.setattr(settings, "transactions_parquet_cache", True)
+    params = QueryParameters(originator_name=frame.iloc[0]["originator_name"])
+    cache_path = service.csv_path.replace(".csv", ".parquet")
+
+    expected = service.query(params)
+
+    reads = []
+    read_csv = pd.read_csv
+    monkeypatch.setattr(pd, "read_csv", lambda *args, **kwargs: reads.append(args) or read_csv(*args, **kwargs))
+    cached = TransactionService(service.csv_path).query(params)
+
+    assert os.path.exists(cache_path)
+    assert reads == []
+    assert cached.transactions == expected.transactions
+    assert cached.date_range == expected.date_range
+
+
+def test_invalid_rows_are_skipped_and_valid_ones_kept(sample_service):
+    service, _ = sample_service
+    service._load_csv()
+    good, other = service._records[0], service._records[1]
+    bad = {**good, "amount": "not-a-number"}
+
+    transactions = transaction_service_module._validate_records([good, bad, other])
+
+    assert [t.transaction_id for t in transactions] == [good["transaction_id"], other["transaction_id"]]
+
+
+def test_row_matching_several_filters_is_returned_once(tmp_path):
+    frame = pd.read_csv(settings.transactions_csv_path, nrows=40)
+    csv_path = tmp_path / "unique.csv"
+    frame.to_csv(csv_path, index=False)
+    service = TransactionService(str(csv_path))
+    row = frame.iloc[3]
+
+    history = service.query(
+        QueryParameters(originator_name=row["originator_name"], originator_account=row["originator_account"])
+    )
+
+    assert service._unique_transaction_ids
+    ids = [t.transaction_id for t in history.transactions]
+    assert ids.count(row["transaction_id"]) == 1
+    assert len(ids) == len(set(ids))
+
+
+def test_booking_datetime_filter_matches_exact_naive_timestamps(sample_service):
+    service, frame = sample_service
+    row = frame.iloc[7]
+
+    history = service.query(QueryParameters(booking_datetime=row["booking_datetime"]))
+    aware = service.query(QueryParameters(booking_datetime=row["booking_datetime"] + "Z"))
+
+    assert [t.transaction_id for t in history.transactions] == [row["transaction_id"]]
+    assert aware.is_empty